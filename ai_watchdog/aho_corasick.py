@@ -0,0 +1,150 @@
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Below this many patterns a str.find() pass per pattern beats walking the
+# automaton in Python, because each find() runs at C speed.
+FIND_PATTERN_LIMIT = 200
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def fold_with_positions(text: str, fold: Callable[[str], str]) -> Tuple[str, Optional[List[int]]]:
+    """
+    Fold the text and, when folding changes its length, map every folded
+    character back to the index of the original character it came from.
+
+    Returns:
+        tuple: (folded, positions) where positions is None if folding kept the length.
+    """
+    folded = fold(text)
+    if len(folded) == len(text):
+        return folded, None
+
+    pieces = []
+    positions = []
+    for i, ch in enumerate(text):
+        f = fold(ch)
+        pieces.append(f)
+        positions.extend([i] * len(f))
+    return "".join(pieces), positions
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher.
+
+    Builds an Aho-Corasick automaton over the (lowercased or casefolded)
+    patterns once, then reports every occurrence of every pattern in a single
+    pass over the text. Offsets always refer to the original, unfolded text.
+
+    Args:
+        patterns (List[str]): Substrings to look for. Empty strings are ignored.
+        casefold (bool): Use Unicode casefolding instead of lower() for
+            case-insensitive matching (e.g. "straße" matches "STRASSE").
+    """
+
+    def __init__(self, patterns: List[str], casefold: bool = False):
+        self.patterns = list(patterns)
+        self.casefold = casefold
+        self._fold = str.casefold if casefold else str.lower
+
+        folded = [self._fold(p) for p in self.patterns]
+        self._folded = [(i, p) for i, p in enumerate(folded) if p]
+        self._lengths = [len(p) for p in folded]
+
+        # --- Trie ---
+        goto = [{}]
+        out = [[]]
+        for index, pattern in self._folded:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)
+
+        # --- Failure links (BFS) ---
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(o) for o in out]
+
+    def _iter_folded_matches(self, folded: str) -> Iterator[Tuple[int, int, int]]:
+        if len(self._folded) <= FIND_PATTERN_LIMIT:
+            for index, pattern in self._folded:
+                start = folded.find(pattern)
+                while start != -1:
+                    yield index, start, start + len(pattern)
+                    start = folded.find(pattern, start + 1)
+            return
+
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for index in out[state]:
+                    yield index, end - lengths[index], end
+
+    def iter_matches(
+        self,
+        text: str,
+        whole_word: bool = False,
+        folded: Optional[Tuple[str, Optional[List[int]]]] = None,
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (pattern_index, start, end) for every occurrence in text.
+
+        Args:
+            text (str): Text to search.
+            whole_word (bool): Only report matches that are not glued to a
+                neighbouring letter, digit or underscore.
+            folded (tuple, optional): The text already folded the way this
+                automaton folds, as fold_with_positions() returns it.
+        """
+        folded, positions = folded or fold_with_positions(text, self._fold)
+
+        for index, start, end in self._iter_folded_matches(folded):
+            if positions is not None:
+                start, end = positions[start], positions[end - 1] + 1
+
+            if whole_word and not self._on_word_boundaries(text, start, end):
+                continue
+            yield index, start, end
+
+    @staticmethod
+    def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+            return False
+        if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+            return False
+        return True
+
+
+@lru_cache(maxsize=64)
+def get_automaton(patterns: Tuple[str, ...], casefold: bool = False) -> AhoCorasick:
+    """
+    Return a cached automaton for a distinct pattern list.
+    """
+    return AhoCorasick(list(patterns), casefold=casefold)
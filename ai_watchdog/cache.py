@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with LRU eviction and per-entry expiry.
+
+    Args:
+        max_size (int): Maximum number of entries; the least recently used
+            entry is evicted first.
+        ttl (float, optional): Default lifetime of an entry in seconds.
+            Entries never expire when not given.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key, or default if missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        """
+        Store value under key. ttl overrides the cache's default lifetime.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Persistent cache stored in a SQLite file, safe to share between threads
+    and worker processes. Values must be JSON-serializable.
+
+    Args:
+        path (str): Database file; created if missing.
+        ttl (float, optional): Default lifetime of an entry in seconds.
+        max_size (int, optional): Maximum number of entries. The size is
+            checked every max_size / EVICT_FRACTION writes, so the table can
+            briefly exceed it by that many entries; expired and least
+            recently used entries are then evicted in one batch. Unbounded
+            when not given.
+    """
+
+    # Share of max_size written between two size checks, and evicted below
+    # max_size per check, so eviction runs once per batch of writes
+    EVICT_FRACTION = 16
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self._evict_batch = max(1, max_size // self.EVICT_FRACTION) if max_size is not None else None
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            # Lets eviction find the least recently used entries without sorting the table
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return default
+            if self.max_size is not None:
+                self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            if self.max_size is not None:
+                self._writes += 1
+                if self._writes >= self._evict_batch:
+                    self._writes = 0
+                    self._evict(now)
+
+    def _evict(self, now):
+        """
+        Drop expired entries and, if the table is still over max_size, the
+        least recently used ones down to max_size minus one batch.
+        """
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self.max_size:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_size + self._evict_batch,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+# Bump to invalidate persisted verdicts when their format changes
+CACHE_KEY_VERSION = 1
+
+# Defaults of the in-memory verdict cache created by `cache=True`
+VERDICT_CACHE_SIZE = 4096
+VERDICT_CACHE_TTL = 3600
+
+# Entry limit of the SQLite verdict cache created from a path; a file cache
+# outlives the process, so it holds more than the in-memory one
+PERSISTENT_CACHE_SIZE = 100_000
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Hash any JSON-serializable parts into a fixed-length cache key.
+    """
+    payload = json.dumps([CACHE_KEY_VERSION, *parts], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def resolve_cache(cache):
+    """
+    Turn the `cache` option of a watchdog into a cache object.
+
+    Args:
+        cache: None or False to disable caching, True for an in-memory
+            TTLCache, a path (str) for a SQLiteCache of at most
+            PERSISTENT_CACHE_SIZE entries, or any object with
+            get(key) and set(key, value) methods.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return TTLCache(max_size=VERDICT_CACHE_SIZE, ttl=VERDICT_CACHE_TTL)
+    if isinstance(cache, (str, os.PathLike)):
+        return SQLiteCache(os.fspath(cache), ttl=VERDICT_CACHE_TTL, max_size=PERSISTENT_CACHE_SIZE)
+    if not (callable(getattr(cache, "get", None)) and callable(getattr(cache, "set", None))):
+        raise TypeError("cache must be a bool, a path or an object with get() and set() methods")
+    return cache
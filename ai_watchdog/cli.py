@@ -0,0 +1,423 @@
+"""
+Command line interface.
+
+    ai-watchdog scan records.jsonl --config scanners.json --output results.jsonl
+    ai-watchdog scan audit.csv --config scanners.json --type output --output results.jsonl --resume
+
+`scan` streams a JSONL or CSV file record by record, so memory stays flat
+on very large inputs. Logic scanners run in a pool of worker processes, LLM
+scanners run in the main process through the provider batch path with
+bounded concurrency. Results are appended to the output as JSONL in input
+order, one line per record:
+
+    {"index": 0, "id": "...", "result": {...unified scan result...}}
+
+With --resume, records already in the output file are skipped and new
+results are appended. A partly written last line is dropped first.
+"""
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import process_pool
+from .core import InputWatchdog, OutputWatchdog
+from .exceptions import ScannerImportError, WatchdogError
+from .scan_plan import validate_scanner_config
+
+WATCHDOGS = {"input": InputWatchdog, "output": OutputWatchdog}
+
+# Records scanned together as one batch
+DEFAULT_CHUNK_SIZE = 64
+
+# LLM calls in flight at once
+DEFAULT_LLM_CONCURRENCY = 8
+
+# Seconds between two progress lines
+DEFAULT_PROGRESS_EVERY = 2.0
+
+
+# --- Input and output files ---
+
+def read_scanner_config(path):
+    """
+    Load a scanner config file: a JSON list of scanner configs, or an object
+    with the list under "scanners".
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    if isinstance(config, dict):
+        config = config.get("scanners")
+    if not isinstance(config, list):
+        raise ValueError(f"{path}: expected a list of scanner configs")
+    return config
+
+
+def iter_records(path, input_format=None):
+    """
+    Stream the records of a JSONL or CSV file as (index, record) pairs.
+
+    JSONL records are decoded lazily: a line that is not a JSON object is
+    yielded as the raw string so it can be reported per record. Blank lines
+    are skipped without taking an index.
+    """
+    input_format = input_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            csv.field_size_limit(2 ** 31 - 1)
+            yield from enumerate(csv.DictReader(f))
+        else:
+            index = 0
+            for line in f:
+                if line.strip():
+                    yield index, line
+                    index += 1
+
+
+def _decode(record):
+    if isinstance(record, dict):
+        return record
+    try:
+        value = json.loads(record)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(value, dict):
+        raise ValueError("Record is not a JSON object")
+    return value
+
+
+def completed_records(output_path):
+    """
+    Count the complete result lines of an earlier run and cut off a line
+    that was only partly written when the run was interrupted.
+    """
+    if not os.path.exists(output_path):
+        return 0
+
+    count = 0
+    complete_bytes = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            complete_bytes += len(line)
+            if line.strip():
+                count += 1
+    if complete_bytes < os.path.getsize(output_path):
+        with open(output_path, "rb+") as f:
+            f.truncate(complete_bytes)
+    return count
+
+
+def split_scanner_config(scanner_config, scan_type):
+    """
+    Split a scanner config into its logic-based and LLM-based scanners.
+
+    Returns:
+        tuple: (logic_config, llm_config)
+    """
+    logic_config = []
+    llm_config = []
+    for config in validate_scanner_config(scanner_config, scan_type):
+        name = config["name"]
+        try:
+            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+        except Exception as e:
+            raise ScannerImportError(name, e)
+        if getattr(module, "DEFAULT_MODE", "llm").lower() == "logic":
+            logic_config.append(config)
+        else:
+            llm_config.append(config)
+    return logic_config, llm_config
+
+
+def _error_result(error):
+    # Same shape as the per-item error results of the batch API: fail closed
+    return {
+        "overall_result": False,
+        "failed_scanners": [],
+        "error": {"type": type(error).__name__, "message": getattr(error, "message", str(error))},
+    }
+
+
+def combine_results(parts):
+    """
+    Merge the unified results of the logic-only and LLM-only scans of one text.
+    """
+    merged = {}
+    failed = []
+    error = None
+    for part in parts:
+        for key, value in part.items():
+            if key == "error":
+                error = error or value
+            elif key not in ("overall_result", "failed_scanners"):
+                merged[key] = value
+        failed.extend(part.get("failed_scanners", []))
+    merged["overall_result"] = all(part["overall_result"] for part in parts)
+    merged["failed_scanners"] = failed
+    if error is not None:
+        merged["error"] = error
+    return merged
+
+
+# --- Scanning ---
+
+class _Chunk:
+    __slots__ = ("indexes", "ids", "results", "texts", "logic", "llm")
+
+    def __init__(self):
+        self.indexes = []
+        self.ids = []
+        self.results = []   # final result, or None while the text is being scanned
+        self.texts = []     # texts to scan, for the slots whose result is None
+        self.logic = None   # future of the logic-only results
+        self.llm = None     # future of the LLM-only results
+
+
+class BulkScanner:
+    """
+    Scans a stream of records chunk by chunk.
+
+    Up to 2 x workers chunks are in flight at once: their logic scanners run
+    in the process pool while one LLM batch at a time runs with at most
+    llm_concurrency calls in flight. Finished chunks are written in order.
+
+    Args:
+        watchdog: InputWatchdog or OutputWatchdog that owns the LLM client.
+        scanner_config (list): Scanner configurations.
+        text_field (str): Record field holding the text to scan.
+        id_field (str, optional): Record field copied to the output as "id".
+        workers (int): Logic scanner processes. 0 runs logic scanners in-process.
+        llm_concurrency (int): LLM calls in flight at once.
+        chunk_size (int): Records per batch.
+    """
+
+    def __init__(
+        self,
+        watchdog,
+        scanner_config,
+        text_field="text",
+        id_field=None,
+        workers=None,
+        llm_concurrency=DEFAULT_LLM_CONCURRENCY,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        self.watchdog = watchdog
+        self.text_field = text_field
+        self.id_field = id_field
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.llm_concurrency = llm_concurrency
+        self.chunk_size = max(1, chunk_size)
+
+        self.logic_config, self.llm_config = split_scanner_config(scanner_config, watchdog.SCAN_TYPE)
+        if self.llm_config and watchdog.llm is None:
+            names = ", ".join(c["name"] for c in self.llm_config)
+            raise ValueError(f"LLM scanners configured ({names}) but no --provider/--model given")
+        self.llm_plan = watchdog.compile(self.llm_config) if self.llm_config else None
+        self.local_plan = watchdog.compile(self.logic_config) if self.logic_config else None
+
+        self.scanned = 0
+        self.failed = 0
+        self.errors = 0
+
+    def run(self, records, out, progress=None):
+        """
+        Scan every record and write one JSONL line per record to out.
+
+        Args:
+            records (iterable): (index, record) pairs, e.g. from iter_records().
+            out: Text file the results are appended to.
+            progress (callable, optional): Called with the scanner after every chunk.
+        """
+        if self.workers > 0:
+            # Workers of the managed pool warm up exactly the scanners of this run
+            process_pool.configure(max_workers=self.workers, warm_up=self.logic_config)
+            logic_executor = None
+        else:
+            logic_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watchdog-cli-logic")
+        # One LLM batch at a time, so at most llm_concurrency calls are in flight
+        llm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watchdog-cli-llm")
+        max_inflight = max(2, 2 * self.workers)
+
+        inflight = deque()
+        try:
+            records = iter(records)
+            while True:
+                batch = list(itertools.islice(records, self.chunk_size))
+                if batch:
+                    inflight.append(self._submit(batch, logic_executor, llm_executor))
+                while inflight and (len(inflight) >= max_inflight or not batch):
+                    self._write(inflight.popleft(), out)
+                    if progress is not None:
+                        progress(self)
+                if not batch:
+                    break
+        except BaseException:
+            for chunk in inflight:
+                for future in (chunk.logic, chunk.llm):
+                    if future is not None:
+                        future.cancel()
+            raise
+        finally:
+            llm_executor.shutdown(cancel_futures=True)
+            if logic_executor is not None:
+                logic_executor.shutdown(cancel_futures=True)
+            else:
+                process_pool.shutdown()
+
+    def _submit(self, batch, logic_executor, llm_executor):
+        chunk = _Chunk()
+        for index, record in batch:
+            chunk.indexes.append(index)
+            try:
+                record = _decode(record)
+            except ValueError as e:
+                chunk.ids.append(None)
+                chunk.results.append(_error_result(e))
+                continue
+
+            chunk.ids.append(record.get(self.id_field) if self.id_field else None)
+            text = record.get(self.text_field)
+            if not isinstance(text, str):
+                chunk.results.append(_error_result(ValueError(f"Record has no text in field '{self.text_field}'")))
+                continue
+            chunk.results.append(None)
+            chunk.texts.append(text)
+
+        if chunk.texts:
+            if self.logic_config:
+                if logic_executor is None:
+                    chunk.logic = process_pool.submit_many(chunk.texts, self.logic_config)
+                else:
+                    chunk.logic = logic_executor.submit(self.watchdog.scan_many, chunk.texts, self.local_plan)
+            if self.llm_plan is not None:
+                chunk.llm = llm_executor.submit(
+                    self.watchdog.scan_many, chunk.texts, self.llm_plan, self.llm_concurrency
+                )
+        return chunk
+
+    def _write(self, chunk, out):
+        parts = [future.result() for future in (chunk.logic, chunk.llm) if future is not None]
+        scanned = iter(zip(*parts)) if parts else iter(())
+
+        for index, record_id, result in zip(chunk.indexes, chunk.ids, chunk.results):
+            if result is None:
+                text_parts = next(scanned)
+                result = text_parts[0] if len(text_parts) == 1 else combine_results(text_parts)
+            line = {"index": index}
+            if self.id_field:
+                line["id"] = record_id
+            line["result"] = result
+            out.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+
+            self.scanned += 1
+            if "error" in result:
+                self.errors += 1
+            elif not result["overall_result"]:
+                self.failed += 1
+        out.flush()
+
+
+class _Progress:
+    def __init__(self, every, skipped):
+        self.every = every
+        self.skipped = skipped
+        self.started = time.perf_counter()
+        self.last = self.started
+
+    def __call__(self, scanner, final=False):
+        now = time.perf_counter()
+        if not final and now - self.last < self.every:
+            return
+        self.last = now
+        elapsed = now - self.started
+        rate = scanner.scanned / elapsed if elapsed else 0.0
+        prefix = "done:" if final else "progress:"
+        resumed = f", {self.skipped} resumed" if self.skipped else ""
+        print(
+            f"[Watchdog] {prefix} {scanner.scanned} records scanned{resumed} "
+            f"({scanner.failed} failed, {scanner.errors} errors) in {elapsed:.1f}s, {rate:.1f} records/s",
+            file=sys.stderr,
+        )
+
+
+def scan_command(args):
+    scanner_config = read_scanner_config(args.config)
+    api_key = args.api_key or os.environ.get("AI_WATCHDOG_API_KEY")
+    watchdog = WATCHDOGS[args.type](args.provider, args.model, api_key, cache=args.cache)
+
+    scanner = BulkScanner(
+        watchdog,
+        scanner_config,
+        text_field=args.text_field,
+        id_field=args.id_field,
+        workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        chunk_size=args.chunk_size,
+    )
+
+    skipped = completed_records(args.output) if args.resume else 0
+    records = iter_records(args.input, args.format)
+    if skipped:
+        records = itertools.islice(records, skipped, None)
+        print(f"[Watchdog] Resuming after {skipped} records already in {args.output}", file=sys.stderr)
+
+    progress = _Progress(args.progress_every, skipped)
+    with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+        try:
+            scanner.run(records, out, progress)
+        except KeyboardInterrupt:
+            progress(scanner, final=True)
+            print("[Watchdog] Interrupted; rerun with --resume to continue", file=sys.stderr)
+            return 130
+    progress(scanner, final=True)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ai-watchdog", description="AI Watchdog command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="Scan every record of a JSONL or CSV file")
+    scan.add_argument("input", help="JSONL or CSV file of records")
+    scan.add_argument("--config", required=True, help="JSON file with the scanner configs")
+    scan.add_argument("--output", required=True, help="JSONL file the results are written to")
+    scan.add_argument("--type", choices=sorted(WATCHDOGS), default="input", help="Scan as input or output text")
+    scan.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    scan.add_argument("--text-field", default="text", help="Record field holding the text (default: text)")
+    scan.add_argument("--id-field", help="Record field copied to each result as \"id\"")
+    scan.add_argument("--provider", help="LLM provider, needed for LLM scanners")
+    scan.add_argument("--model", help="LLM model name")
+    scan.add_argument("--api-key", help="Provider API key (default: $AI_WATCHDOG_API_KEY)")
+    scan.add_argument("--cache", help="SQLite file for the verdict cache")
+    scan.add_argument("--workers", type=int, help="Logic scanner processes (default: CPU count, 0: in-process)")
+    scan.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY,
+                      help=f"LLM calls in flight at once (default: {DEFAULT_LLM_CONCURRENCY})")
+    scan.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                      help=f"Records per batch (default: {DEFAULT_CHUNK_SIZE})")
+    scan.add_argument("--resume", action="store_true", help="Skip records already in --output and append")
+    scan.add_argument("--progress-every", type=float, default=DEFAULT_PROGRESS_EVERY,
+                      help="Seconds between progress lines")
+    scan.set_defaults(handler=scan_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, WatchdogError) as e:
+        message = e.message if isinstance(e, WatchdogError) else str(e)
+        print(f"ai-watchdog: error: {message}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
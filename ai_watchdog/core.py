@@ -1,141 +1,834 @@
 from .llm_factory import create_llm
-from .pydantic_model_builder import build_dynamic_super_model
-from pydantic import create_model
-from .prompt_builder import build_super_prompt
+from .cache import resolve_cache
+from .long_text import LongTextMode
+from .instrumentation import ScanMetrics
+from .text_view import TextView
+from .scan_result import ScanResult, RESULT_FORMATS
+from . import process_pool
+from .streaming import (
+        OutputStream,
+        STREAM_OVERLAP,
+        STREAM_SCAN_EVERY,
+        STREAM_CHECKPOINT_CHARS,
+    )
+from .scan_plan import (
+        ScanPlan,
+        scanner_costs,
+        validate_scanner_config,
+        get_separate_output_model,
+        build_separate_prompt,
+    )
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from collections import OrderedDict
+from contextlib import nullcontext
+import asyncio
 import importlib
+import json
+import os
+import threading
+import time
 from .exceptions import (
         ScanExecutionError,
-        ScannerImportError,
         LogicScanError,
     )
 
-def validate_scanner_config(scanner_config, allowed_type: str):
+# Upper bound on LLM round-trips in flight across all scans in this process
+MAX_LLM_WORKERS = 16
+
+# Threads running logic scanners whose execution hint is "thread"
+MAX_LOGIC_WORKERS = os.cpu_count() or 1
+
+# Number of compiled scan plans each watchdog keeps
+PLAN_CACHE_SIZE = 128
+
+_llm_executor = None
+_llm_executor_lock = threading.Lock()
+_logic_executor = None
+
+
+def _get_llm_executor():
+    """
+    Return the process-wide thread pool used to run LLM calls concurrently.
+    The pool is created lazily on first use and shared by every watchdog.
+    """
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(
+                    max_workers=MAX_LLM_WORKERS,
+                    thread_name_prefix="watchdog-llm",
+                )
+    return _llm_executor
+
+def _get_logic_executor():
     """
-    Validate and filter scanners based on allowed type ('input' or 'output').
+    Return the process-wide thread pool for logic scanners with the "thread" hint.
+    """
+    global _logic_executor
+    if _logic_executor is None:
+        with _llm_executor_lock:
+            if _logic_executor is None:
+                _logic_executor = ThreadPoolExecutor(
+                    max_workers=MAX_LOGIC_WORKERS,
+                    thread_name_prefix="watchdog-logic",
+                )
+    return _logic_executor
 
-    Args:
-        scanner_config (list): List of scanner configurations.
-        allowed_type (str): 'input' or 'output'
+def _as_plan(llm, scanner_config):
+    """
+    Return scanner_config unchanged if it is already a ScanPlan, otherwise compile it.
+    """
+    if isinstance(scanner_config, ScanPlan):
+        return scanner_config
+    return ScanPlan(llm, scanner_config)
 
-    Returns:
-        list: Filtered and valid scanner configurations.
+def _run_logic_scanner(text, config, logic_fn, metrics=None, text_view=None):
+    """
+    Run a single logic-based scanner and return its Pydantic result model.
+    Any failure is wrapped in a LogicScanError. text_view is passed on to
+    scanners that accept the shared TextView (see _text_view_for()).
     """
-    valid_configs = []
-    skipped = []
+    name = config["name"]
+    try:
+        params = config.get("params", {})
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        if text_view is not None:
+            logic_result_model = logic_fn(text, text_view=text_view, **params)
+        else:
+            logic_result_model = logic_fn(text, **params)
+        elapsed = time.perf_counter() - started
+        scanner_costs.record(name, elapsed)
+        if metrics is not None:
+            metrics.record("scanner", name, elapsed, time.thread_time() - cpu_started)
 
-    for config in scanner_config:
-        name = config.get("name")
-        if not name:
-            continue
+        if not hasattr(logic_result_model, "model_dump"):
+            raise TypeError(f"Logic scanner '{name}' must return a Pydantic model")
 
-        try:
-            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
-            scanner_types = getattr(module, "SCANNER_TYPE", ["input", "output"])
+        return logic_result_model
+    except Exception as e:
+        raise LogicScanError(name, e)
+
+def _shared_text_view(plan, text):
+    """
+    Build the TextView shared by the logic scanners of one scan, or return
+    None when no scanner of the plan takes one. Its values are computed on
+    first use (see text_view.py).
+    """
+    return TextView(text) if plan.text_view_scanners else None
+
+def _text_view_for(plan, name, text_view):
+    return text_view if name in plan.text_view_scanners else None
+
+def _executions(plan):
+    """
+    Execution mode of each logic scanner of a plan for this scan. A scanner
+    that only defaults to "process" runs on a thread until the process pool
+    is configured (see process_pool.py), and inside a pool worker every
+    "process" scanner runs inline.
+    """
+    if "process" not in plan.logic_execution.values():
+        return plan.logic_execution
+
+    in_worker = process_pool.in_worker()
+    enabled = process_pool.is_enabled()
+    executions = {}
+    for name, mode in plan.logic_execution.items():
+        if mode == "process":
+            if in_worker:
+                mode = "inline"
+            elif not enabled and name not in plan.explicit_execution:
+                mode = "thread"
+        executions[name] = mode
+    return executions
+
+def _submit_offloaded(config, texts):
+    return process_pool.submit(config["name"], texts, config.get("params", {})), time.perf_counter()
+
+def _offloaded_results(name, future, started, count, metrics=None):
+    """
+    Wait for a scanner running in the process pool and return its result
+    dicts, one per text. Results stay dicts: they are merged as they are.
+    """
+    try:
+        results = future.result()
+    except Exception as e:
+        raise LogicScanError(name, e)
+    elapsed = time.perf_counter() - started
+    scanner_costs.record(name, elapsed / max(1, count))
+    if metrics is not None:
+        metrics.record("scanner", name, elapsed)
+    return results
 
-            if allowed_type.lower() in [t.lower() for t in scanner_types]:
-                valid_configs.append(config)
+async def _aoffloaded_result(name, future, started, metrics=None):
+    try:
+        results = await asyncio.wrap_future(future)
+    except Exception as e:
+        raise LogicScanError(name, e)
+    elapsed = time.perf_counter() - started
+    scanner_costs.record(name, elapsed)
+    if metrics is not None:
+        metrics.record("scanner", name, elapsed)
+    return results[0]
+
+def _run_logic_step(text, config, logic_fn, execution, metrics=None, text_view=None):
+    """
+    Run one logic scanner on the calling thread, or in the process pool and wait for it.
+    """
+    if execution == "process":
+        future, started = _submit_offloaded(config, [text])
+        return _offloaded_results(config["name"], future, started, 1, metrics)[0]
+    return _run_logic_scanner(text, config, logic_fn, metrics, text_view)
+
+def _run_logic_steps(text, plan, metrics=None):
+    """
+    Run every logic scanner of a plan on one text. "process" and "thread"
+    scanners are started first, then the inline ones run on the calling
+    thread while the others proceed. Scanners in this process share one
+    TextView of the text.
+
+    Returns:
+        dict: Scanner name to result model (or result dict from the process pool), in plan order.
+    """
+    executions = _executions(plan)
+    view = _shared_text_view(plan, text)
+    pending = {}
+    for config, logic_fn in plan.logic_steps:
+        name = config["name"]
+        if executions[name] == "process":
+            pending[name] = _submit_offloaded(config, [text])
+        elif executions[name] == "thread":
+            future = _get_logic_executor().submit(
+                _run_logic_scanner, text, config, logic_fn, metrics, _text_view_for(plan, name, view)
+            )
+            pending[name] = (future, None)
+
+    results = {}
+    try:
+        for config, logic_fn in plan.logic_steps:
+            name = config["name"]
+            if name not in pending:
+                results[name] = _run_logic_scanner(text, config, logic_fn, metrics, _text_view_for(plan, name, view))
+        for name, (future, started) in pending.items():
+            if started is None:
+                results[name] = future.result()
             else:
-                skipped.append(name)
-        except Exception as e:
-            raise ScannerImportError(name, e)
+                results[name] = _offloaded_results(name, future, started, 1, metrics)[0]
+    except Exception:
+        for future, _ in pending.values():
+            future.cancel()
+        raise
+    return {c["name"]: results[c["name"]] for c in plan.logic_scanners}
+
+async def _arun_logic_steps(text, plan, metrics=None):
+    """
+    Async counterpart of _run_logic_steps(): "process" scanners are awaited
+    from the process pool, the others run on the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    executions = _executions(plan)
+    view = _shared_text_view(plan, text)
+    awaitables = []
+    for config, logic_fn in plan.logic_steps:
+        name = config["name"]
+        if executions[name] == "process":
+            future, started = _submit_offloaded(config, [text])
+            awaitables.append(_aoffloaded_result(name, future, started, metrics))
+        else:
+            awaitables.append(loop.run_in_executor(
+                None, _run_logic_scanner, text, config, logic_fn, metrics, _text_view_for(plan, name, view)
+            ))
+    models = await asyncio.gather(*awaitables)
+    return {config["name"]: model for config, model in zip(plan.logic_scanners, models)}
+
+def _run_logic_batch(texts, logic_steps, batch_fns=None, fail_fast=False, executions=None, text_view_scanners=()):
+    """
+    Run every logic-based scanner over a batch of texts. Scanners that define
+    run_logic_based_batch_scan (see batch_fns) score the whole batch in one call.
+    "process" scanners (see executions) get the whole batch as one job in the
+    process pool; without fail_fast those jobs all start up front.
+    The per-text scanners named in text_view_scanners share one TextView per text.
+    With fail_fast, a text that failed a scanner is not passed to the next ones.
+
+    Returns:
+        tuple: (results, errors) where results[i] maps scanner name to result
+        model for texts[i] and errors[i] is the first error for that text, or None.
+    """
+    results = [{} for _ in texts]
+    errors = [None] * len(texts)
+    decided = [False] * len(texts)
+    views = [None] * len(texts)
+    batch_fns = batch_fns or {}
+    executions = executions or {}
+
+    offloaded = {}
+    if not fail_fast:
+        for config, _ in logic_steps:
+            if executions.get(config["name"]) == "process":
+                offloaded[config["name"]] = _submit_offloaded(config, texts)
+
+    for config, logic_fn in logic_steps:
+        name = config["name"]
+        active = [i for i in range(len(texts)) if errors[i] is None and not decided[i]]
+        if not active:
+            break
+
+        batch_fn = batch_fns.get(name)
+        if executions.get(name) == "process":
+            # Started up front for every text, or now for the texts still undecided
+            indexes = range(len(texts)) if name in offloaded else active
+            future, started = offloaded.pop(name, None) or _submit_offloaded(config, [texts[i] for i in active])
+            try:
+                dumps = _offloaded_results(name, future, started, len(indexes))
+                if len(dumps) != len(indexes):
+                    raise ValueError(f"Logic scanner '{name}' returned {len(dumps)} results for {len(indexes)} texts")
+                by_index = dict(zip(indexes, dumps))
+                for i in active:
+                    results[i][name] = by_index[i]
+            except Exception as e:
+                error = e if isinstance(e, LogicScanError) else LogicScanError(name, e)
+                for i in active:
+                    errors[i] = error
+        elif batch_fn is not None:
+            try:
+                started = time.perf_counter()
+                models = batch_fn([texts[i] for i in active], **config.get("params", {}))
+                scanner_costs.record(name, (time.perf_counter() - started) / len(active))
+                if len(models) != len(active):
+                    raise ValueError(f"Logic scanner '{name}' returned {len(models)} results for {len(active)} texts")
+                for i, model in zip(active, models):
+                    results[i][name] = model
+            except Exception as e:
+                error = LogicScanError(name, e)
+                for i in active:
+                    errors[i] = error
+        else:
+            for i in active:
+                view = None
+                if name in text_view_scanners:
+                    view = views[i] = views[i] or TextView(texts[i])
+                try:
+                    results[i][name] = _run_logic_scanner(texts[i], config, logic_fn, text_view=view)
+                except LogicScanError as e:
+                    errors[i] = e
+
+        if fail_fast:
+            for i in active:
+                if name in results[i] and _failed_scanner(name, results[i][name]):
+                    decided[i] = True
+
+    return results, errors
+
+def _first_logic_failure(logic_results):
+    return next((name for name, model in logic_results.items() if _failed_scanner(name, model)), None)
+
+def _check_separate_result(name, result_model):
+    if not hasattr(result_model, "model_dump"):
+        raise TypeError(f"Scanner '{name}' must return a Pydantic model")
+    return result_model
+
+def _invoke_separate(structured_model, name, prompt):
+    return _check_separate_result(name, structured_model.invoke(prompt))
+
+async def _ainvoke_separate(structured_model, name, prompt):
+    return _check_separate_result(name, await structured_model.ainvoke(prompt))
+
+def _new_cache_stats(cache):
+    return {"hits": 0, "misses": 0} if cache is not None else None
+
+def _cache_lookup(cache, key, stats):
+    """
+    Return the cached verdict dict for key, or None, counting the hit or miss.
+    """
+    value = cache.get(key)
+    stats["hits" if value is not None else "misses"] += 1
+    return value
+
+def _cache_store(cache, key, result_model):
+    if not isinstance(result_model, dict):
+        result_model = result_model.model_dump(mode="json")
+    cache.set(key, result_model)
+
+async def _off_loop(loop, cache, fn, *args):
+    """
+    Run a helper that reads or writes the verdict cache off the event loop.
+    Cache backends block (SQLiteCache waits up to its timeout on a locked
+    database), so only calls without a cache stay on the loop.
+    """
+    if cache is None:
+        return fn(*args)
+    return await loop.run_in_executor(None, fn, *args)
+
+def _as_dict(result):
+    """
+    Dump a result model; verdicts served from the cache are already dicts.
+    """
+    return result if isinstance(result, dict) else result.model_dump()
+
+def _merge_results(logic_results, llm_result_model, separate_results, cache_stats=None, skipped=None):
+    """
+    Merge logic, combined-LLM and separate-LLM results into one ScanResult.
+
+    The scanner results are kept as the models the scanners returned and
+    only dumped when the result is turned into a dict or accessed (see
+    scan_result.py). The combined super prompt model is split into its
+    per-scanner models. Logic results from the process pool and LLM results
+    served from the verdict cache are already plain dicts. skipped maps
+    scanners that fail_fast mode did not run to their placeholder result.
+    """
+    results = dict(logic_results)
+
+    if isinstance(llm_result_model, dict):
+        results.update(llm_result_model)
+    elif llm_result_model:
+        for name in type(llm_result_model).model_fields:
+            results[name] = getattr(llm_result_model, name)
+
+    results.update(separate_results)
 
     if skipped:
-        print(f"[Watchdog] Skipped scanners (not valid for {allowed_type}): {', '.join(skipped)}")
+        results.update(skipped)
 
-    return valid_configs
+    extra = {}
+    if skipped is not None:
+        extra["skipped_scanners"] = list(skipped)
+    if cache_stats is not None:
+        extra["cache"] = cache_stats
+    return ScanResult(results, extra=extra)
 
-def run(llm, text, scanner_config):
-    llm_scanners = []
-    logic_scanners = []
-    separate_llm_scanners = []  # <-- New list for special cases
+def _error_result(error):
+    """
+    Build the per-item result reported by the batch API when a text could not be scanned.
+    The item fails closed so a broken scan is never mistaken for a pass.
+    """
+    return ScanResult({}, False, {
+        "error": {
+            "type": type(error).__name__,
+            "message": getattr(error, "message", str(error)),
+        },
+    })
 
-    # --- Step 1: Categorize scanners ---
-    for config in scanner_config:
-        name = config.get("name")
-        if not name:
-            continue
+def _check_result_format(result_format):
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result format '{result_format}'; expected one of {RESULT_FORMATS}")
 
-        try:
-            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
-            mode = getattr(module, "DEFAULT_MODE", "llm").lower()
-            if mode == "logic":
-                logic_scanners.append(config)
-            elif mode == "llm" and name in ["relevance_detection"]:
-                separate_llm_scanners.append(config)
-            else:
-                llm_scanners.append(config)
-        except Exception as e:
-            raise ScannerImportError(name, e)
+def _deliver(result, result_format):
+    """
+    Return a ScanResult in the requested format: the unified dict by default.
+    """
+    return result if result_format == "object" else result.to_dict()
 
-    logic_results = {}
+def _run_logic_cascade(text, plan, metrics=None):
+    """
+    Run the logic scanners one by one, cheapest first, stopping at the first failure.
 
-    # --- Step 2: Run logic-based scanners ---
-    for config in logic_scanners:
+    Returns:
+        tuple: (logic_results, failed_by) where failed_by is the name of the
+        scanner that failed, or None if every scanner passed.
+    """
+    logic_results = {}
+    executions = _executions(plan)
+    view = _shared_text_view(plan, text)
+    for config, logic_fn in plan.cascade_logic_steps():
         name = config["name"]
-        try:
-            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
-            logic_fn = getattr(module, "run_logic_based_scan", None)
-            if not callable(logic_fn):
-                raise AttributeError(f"Scanner '{name}' missing run_logic_based_scan function")
+        logic_results[name] = _run_logic_step(
+            text, config, logic_fn, executions[name], metrics, _text_view_for(plan, name, view)
+        )
+        if _failed_scanner(name, logic_results[name]):
+            return logic_results, name
+    return logic_results, None
 
-            params = config.get("params", {})
-            logic_result_model = logic_fn(text, **params)
+def _failed_scanner(stage, result):
+    """
+    Return the name of a scanner that failed in a stage result, or None.
+    stage is the scanner name, or None for the combined super prompt result
+    that holds one entry per scanner.
+    """
+    data = _as_dict(result)
+    if stage is not None:
+        return stage if data.get("result") is False else None
+    for name, value in data.items():
+        if isinstance(value, dict) and value.get("result") is False:
+            return name
+    return None
 
-            if not hasattr(logic_result_model, "model_dump"):
-                raise TypeError(f"Logic scanner '{name}' must return a Pydantic model")
+def _stage_scanners(plan, stage):
+    return [c["name"] for c in plan.llm_scanners] if stage is None else [stage]
 
-            logic_results[name] = logic_result_model
-        except Exception as e:
-            raise LogicScanError(name, e)
+def _mark_skipped(skipped, names, failed_by):
+    for name in names:
+        skipped[name] = {
+            "result": None,
+            "skipped": True,
+            "details": f"Skipped: verdict already decided by '{failed_by}'",
+        }
 
-    # --- Step 3: Run LLM-based scanners (combined ones) ---
-    llm_result_model = None
-    if llm_scanners:
-        name_list = [item["name"] for item in llm_scanners]
-        final_model = build_dynamic_super_model(name_list)
-        final_prompt = build_super_prompt(text, llm_scanners)
+def _stage_error(stage, text, error):
+    return ScanExecutionError(text if stage is None else stage, error)
 
-        structured_model = llm.with_structured_output(final_model)
-        try:
-            llm_result_model = structured_model.invoke(final_prompt)
-        except Exception as e:
-            raise ScanExecutionError(text, e)
+def _prepare_llm_stages(plan, text, cache, cache_stats, long_text=None, metrics=None):
+    """
+    Render the prompts of every LLM stage for one text and serve what the
+    cache already knows. With long_text, the combined stage is a
+    WindowedModel that takes the raw text and scans it window by window.
+    With metrics, the stages use the plan's include_raw runnables so that
+    token usage can be recorded.
 
-    # --- Step 4: Run separate LLM scanners (like relevance_detection) ---
+    Returns:
+        tuple: (llm_result_model, separate_results, calls). The first two hold
+        cached verdicts; calls maps each stage still to run (a scanner name,
+        or None for the combined super prompt) to (cache_key, structured_model, prompt).
+    """
+    llm_result_model = None
     separate_results = {}
-    for config in separate_llm_scanners:
+    calls = {}
+
+    if plan.structured_model is not None:
+        windowed = long_text.bind(plan) if long_text is not None else None
+        key = None
+        if cache is not None:
+            key = plan.combined_cache_key(text, windowed.cache_variant() if windowed else None)
+            llm_result_model = _cache_lookup(cache, key, cache_stats)
+        if llm_result_model is None:
+            if windowed is not None:
+                calls[None] = (key, windowed, text)
+            else:
+                structured_model = plan.raw_structured_model() if metrics is not None else plan.structured_model
+                calls[None] = (key, structured_model, plan.build_super_prompt(text))
+
+    for config, module, structured_model in plan.separate_steps:
         name = config["name"]
         try:
-            separate_results[name] = llm_run_separately(llm, text, config)
+            prompt = build_separate_prompt(module, text, config.get("params", {}))
         except Exception as e:
             raise ScanExecutionError(name, e)
+        key = None
+        if cache is not None:
+            key = plan.separate_cache_key(config, prompt)
+            cached = _cache_lookup(cache, key, cache_stats)
+            if cached is not None:
+                separate_results[name] = cached
+                continue
+        if metrics is not None:
+            structured_model = plan.raw_structured_model(name)
+        calls[name] = (key, structured_model, prompt)
 
-    # --- Step 5: Merge all results ---
-    all_fields = {}
-    for name, model in logic_results.items():
-        all_fields[name] = (dict, model.model_dump())
+    return llm_result_model, separate_results, calls
 
-    if llm_result_model:
-        for field_name, field_value in llm_result_model.model_dump().items():
-            all_fields[field_name] = (type(field_value), field_value)
+def _cached_failure(llm_result_model, separate_results):
+    """
+    Return the name of a scanner whose cached LLM verdict already failed, or None.
+    """
+    if llm_result_model is not None:
+        failed_by = _failed_scanner(None, llm_result_model)
+        if failed_by:
+            return failed_by
+    for name, result in separate_results.items():
+        if _failed_scanner(name, result):
+            return name
+    return None
 
-    for name, model in separate_results.items():
-        all_fields[name] = (dict, model.model_dump())
+def _stage_label(stage):
+    return "llm:combined" if stage is None else f"llm:{stage}"
 
-    failed_scanners = [
-        name for name, (_, data) in all_fields.items()
-        if isinstance(data, dict) and data.get("result") is False
-    ]
-    overall_result = len(failed_scanners) == 0
+def _unwrap_raw(stage, output, prompt, metrics):
+    """
+    Record the usage of an include_raw=True output and return its parsed verdict.
+    Windowed long-text stages return the reduced verdict as is.
+    """
+    if not (isinstance(output, dict) and "parsing_error" in output and "raw" in output):
+        return output
+    if output["parsing_error"] is not None:
+        raise output["parsing_error"]
+    metrics.record_llm_call("combined" if stage is None else stage, prompt, output["raw"])
+    if output["parsed"] is None:
+        raise ValueError("The LLM returned no structured output")
+    return output["parsed"]
+
+def _invoke_stage(stage, structured_model, prompt, metrics=None):
+    if metrics is not None:
+        with metrics.measure("stage", _stage_label(stage)):
+            output = structured_model.invoke(prompt)
+        output = _unwrap_raw(stage, output, prompt, metrics)
+        return output if stage is None else _check_separate_result(stage, output)
+    if stage is None:
+        return structured_model.invoke(prompt)
+    return _invoke_separate(structured_model, stage, prompt)
 
-    all_fields["overall_result"] = (bool, overall_result)
-    all_fields["failed_scanners"] = (list[str], failed_scanners)
+async def _ainvoke_stage(stage, structured_model, prompt, metrics=None):
+    if metrics is not None:
+        # CPU time is not attributable to one coroutine, so only wall time is kept
+        with _measure(metrics, _stage_label(stage), cpu=False):
+            output = await structured_model.ainvoke(prompt)
+        output = _unwrap_raw(stage, output, prompt, metrics)
+        return output if stage is None else _check_separate_result(stage, output)
+    if stage is None:
+        return await structured_model.ainvoke(prompt)
+    return await _ainvoke_separate(structured_model, stage, prompt)
 
-    if not all_fields:
-        return {}
+def _new_metrics(instrument, on_metrics):
+    return ScanMetrics() if instrument or on_metrics is not None else None
 
-    UnifiedResult = create_model("UnifiedScanResult", **all_fields)
-    return UnifiedResult(**{k: v[1] for k, v in all_fields.items()}).model_dump()
+def _measure(metrics, stage, cpu=True):
+    return metrics.measure("stage", stage, cpu) if metrics is not None else nullcontext()
+
+def _finish_metrics(unified, metrics, on_metrics):
+    """
+    Add the "timings" and "usage" blocks to a ScanResult and hand them to the callback.
+    """
+    if metrics is None:
+        return unified
+    report = metrics.to_dict()
+    unified.extra.update(report)
+    if on_metrics is not None:
+        try:
+            on_metrics(report)
+        except Exception as e:
+            # A broken metrics sink must not fail the scan itself
+            print(f"[Watchdog] on_metrics callback failed: {e}")
+    return unified
+
+def run(
+    llm,
+    text,
+    scanner_config,
+    cache=None,
+    fail_fast=False,
+    long_text=None,
+    instrument=False,
+    on_metrics=None,
+    result_format="dict",
+):
+    """
+    Scan one text with every configured scanner.
+
+    Args:
+        llm: The LLM instance.
+        text (str): The text to scan.
+        scanner_config (list | ScanPlan): Scanner configurations or a compiled plan.
+        cache (optional): Verdict cache (see ai_watchdog.cache) consulted
+            before every LLM call.
+        fail_fast (bool): Cascade mode. Logic scanners run first, cheapest
+            first by measured cost, and the first failure skips every remaining
+            scanner. The LLM stages then run concurrently and the first one to
+            report a failure cancels the others. Skipped scanners are reported
+            with "skipped": True and listed in "skipped_scanners".
+        long_text (LongTextMode, optional): Scan long texts with the combined
+            scanner model in overlapping token windows and reduce the verdicts.
+        instrument (bool): Add a "timings" block (wall and CPU time of the
+            whole scan, of each stage and of each scanner) and a "usage" block
+            (prompt size and token counts of each LLM call) to the result.
+        on_metrics (callable, optional): Called with {"timings", "usage"}
+            after every scan. Setting it turns instrumentation on.
+        result_format (str): "dict" (default) or "object" for a ScanResult,
+            which dumps scanner results only when they are accessed and
+            serializes itself with to_json() (see scan_result.py).
+
+    Returns:
+        dict | ScanResult: The unified scan result.
+    """
+    _check_result_format(result_format)
+    metrics = _new_metrics(instrument, on_metrics)
+
+    # --- Step 1: Compile (or reuse) the scan plan ---
+    with _measure(metrics, "plan"):
+        plan = _as_plan(llm, scanner_config)
+    cache_stats = _new_cache_stats(cache)
+    skipped = {} if fail_fast else None
+
+    # --- Step 2 (fail_fast): Run the logic scanners first ---
+    logic_results = None
+    if fail_fast:
+        with _measure(metrics, "logic"):
+            logic_results, failed_by = _run_logic_cascade(text, plan, metrics)
+        if failed_by is not None:
+            unfinished = [c["name"] for c in plan.logic_scanners if c["name"] not in logic_results]
+            _mark_skipped(skipped, unfinished + plan.llm_scanner_names, failed_by)
+            result = _merge_results(logic_results, None, {}, cache_stats, skipped)
+            return _deliver(_finish_metrics(result, metrics, on_metrics), result_format)
+
+    # --- Step 3: Start LLM-based scanners in the background ---
+    # The combined call and every separate call are independent of each other
+    # and of the logic scanners, so they run concurrently on the shared pool
+    # while the logic scanners execute on the calling thread. Verdicts found
+    # in the cache skip their round-trip.
+    with _measure(metrics, "prepare"):
+        llm_result_model, separate_results, calls = _prepare_llm_stages(
+            plan, text, cache, cache_stats, long_text, metrics
+        )
+    if fail_fast:
+        failed_by = _cached_failure(llm_result_model, separate_results)
+        if failed_by is not None:
+            _mark_skipped(skipped, [n for stage in calls for n in _stage_scanners(plan, stage)], failed_by)
+            calls = {}
+
+    executor = _get_llm_executor()
+    futures = {
+        executor.submit(_invoke_stage, stage, structured_model, prompt, metrics): stage
+        for stage, (_, structured_model, prompt) in calls.items()
+    }
+
+    try:
+        # --- Step 4: Run logic-based scanners ---
+        if logic_results is None:
+            with _measure(metrics, "logic"):
+                logic_results = _run_logic_steps(text, plan, metrics)
+
+        # --- Step 5: Collect LLM results ---
+        not_done = set(futures)
+        while not_done:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED if fail_fast else ALL_COMPLETED)
+            for future, stage in futures.items():
+                if future not in done:
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    raise _stage_error(stage, text, e)
+                if stage is None:
+                    llm_result_model = result
+                else:
+                    separate_results[stage] = result
+                if cache is not None:
+                    _cache_store(cache, calls[stage][0], result)
+
+                failed_by = _failed_scanner(stage, result) if fail_fast else None
+                if failed_by and not_done:
+                    # The verdict is decided; calls already running finish in the background
+                    for other in not_done:
+                        other.cancel()
+                        _mark_skipped(skipped, _stage_scanners(plan, futures[other]), failed_by)
+                    not_done = set()
+    except Exception:
+        # Don't leave queued LLM calls behind once the scan has failed
+        for future in futures:
+            future.cancel()
+        raise
+
+    # --- Step 6: Merge all results ---
+    result = _merge_results(logic_results, llm_result_model, separate_results, cache_stats, skipped)
+    return _deliver(_finish_metrics(result, metrics, on_metrics), result_format)
+
+async def arun(
+    llm,
+    text,
+    scanner_config,
+    cache=None,
+    fail_fast=False,
+    long_text=None,
+    instrument=False,
+    on_metrics=None,
+    result_format="dict",
+):
+    """
+    Async counterpart of run(). LLM stages are awaited through ainvoke and
+    CPU-bound logic scanners and verdict cache reads and writes are offloaded
+    to the event loop's default executor, so the loop stays free while a scan
+    is in flight. In fail_fast mode the
+    remaining LLM calls are cancelled as soon as one of them fails. With
+    instrumentation, stages awaited on the loop report wall time only.
+    """
+    _check_result_format(result_format)
+    metrics = _new_metrics(instrument, on_metrics)
+
+    # --- Step 1: Compile (or reuse) the scan plan ---
+    with _measure(metrics, "plan"):
+        plan = _as_plan(llm, scanner_config)
+    cache_stats = _new_cache_stats(cache)
+    skipped = {} if fail_fast else None
+    loop = asyncio.get_running_loop()
+
+    # --- Step 2 (fail_fast): Run the logic scanners first ---
+    logic_results = None
+    if fail_fast:
+        with _measure(metrics, "logic", cpu=False):
+            logic_results, failed_by = await loop.run_in_executor(None, _run_logic_cascade, text, plan, metrics)
+        if failed_by is not None:
+            unfinished = [c["name"] for c in plan.logic_scanners if c["name"] not in logic_results]
+            _mark_skipped(skipped, unfinished + plan.llm_scanner_names, failed_by)
+            result = _merge_results(logic_results, None, {}, cache_stats, skipped)
+            return _deliver(_finish_metrics(result, metrics, on_metrics), result_format)
+
+    # --- Step 3: Start LLM-based scanners as tasks ---
+    with _measure(metrics, "prepare", cpu=False):
+        llm_result_model, separate_results, calls = await _off_loop(
+            loop, cache, _prepare_llm_stages, plan, text, cache, cache_stats, long_text, metrics
+        )
+    if fail_fast:
+        failed_by = _cached_failure(llm_result_model, separate_results)
+        if failed_by is not None:
+            _mark_skipped(skipped, [n for stage in calls for n in _stage_scanners(plan, stage)], failed_by)
+            calls = {}
+
+    tasks = {
+        asyncio.ensure_future(_ainvoke_stage(stage, structured_model, prompt, metrics)): stage
+        for stage, (_, structured_model, prompt) in calls.items()
+    }
+
+    try:
+        # --- Step 4: Run logic-based scanners off the event loop ---
+        if logic_results is None:
+            with _measure(metrics, "logic", cpu=False):
+                logic_results = await _arun_logic_steps(text, plan, metrics)
+
+        # --- Step 5: Collect LLM results ---
+        not_done = set(tasks)
+        while not_done:
+            done, not_done = await asyncio.wait(
+                not_done,
+                return_when=asyncio.FIRST_COMPLETED if fail_fast else asyncio.ALL_COMPLETED,
+            )
+            for task, stage in tasks.items():
+                if task not in done:
+                    continue
+                try:
+                    result = task.result()
+                except Exception as e:
+                    raise _stage_error(stage, text, e)
+                if stage is None:
+                    llm_result_model = result
+                else:
+                    separate_results[stage] = result
+                if cache is not None:
+                    await loop.run_in_executor(None, _cache_store, cache, calls[stage][0], result)
+
+                failed_by = _failed_scanner(stage, result) if fail_fast else None
+                if failed_by and not_done:
+                    for other in not_done:
+                        other.cancel()
+                        _mark_skipped(skipped, _stage_scanners(plan, tasks[other]), failed_by)
+                    await asyncio.gather(*not_done, return_exceptions=True)
+                    not_done = set()
+    except BaseException:
+        # Cancel in-flight LLM calls once the scan has failed or been cancelled
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    # --- Step 6: Merge all results ---
+    result = _merge_results(logic_results, llm_result_model, separate_results, cache_stats, skipped)
+    return _deliver(_finish_metrics(result, metrics, on_metrics), result_format)
+
+def _build_separate_call(llm, text, scanner_config):
+    """
+    Build the structured runnable and prompt for a scanner that runs outside
+    the combined super prompt.
+
+    Returns:
+        tuple: (structured_model, final_prompt)
+    """
+    name = scanner_config["name"]
+
+    # Dynamically import the scanner module
+    module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+    model = get_separate_output_model(module)
+
+    final_prompt = build_separate_prompt(module, text, scanner_config.get("params", {}))
+
+    structured_model = llm.with_structured_output(model)
+    return structured_model, final_prompt
 
 def llm_run_separately(llm, text, scanner_config):
     """
@@ -150,55 +843,422 @@ def llm_run_separately(llm, text, scanner_config):
     Returns:
         A Pydantic model instance (result of the LLM call).
     """
-    name = scanner_config["name"]
-    params = scanner_config.get("params", {})
+    structured_model, final_prompt = _build_separate_call(llm, text, scanner_config)
 
-    # Dynamically import the scanner module
-    module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+    # Run the structured LLM scan
+    return _invoke_separate(structured_model, scanner_config["name"], final_prompt)
 
-    # Get the OutputModel
-    model = getattr(module, "OUTPUT_MODEL", None)
-    if model is None:
-        raise AttributeError(f"Scanner '{name}' missing OUTPUT_MODEL class")
+async def allm_run_separately(llm, text, scanner_config):
+    """
+    Async counterpart of llm_run_separately() built on ainvoke.
+    """
+    structured_model, final_prompt = _build_separate_call(llm, text, scanner_config)
 
-    # Get the instruction text builder
-    get_instr = getattr(module, "get_instruction_text", None)
-    if not callable(get_instr):
-        raise AttributeError(f"Scanner '{name}' missing get_instruction_text() function")
+    # Run the structured LLM scan
+    return await _ainvoke_separate(structured_model, scanner_config["name"], final_prompt)
 
-    # Build instruction using text + params (if the function accepts them)
-    try:
-        # Attempt to call with both text and params — if it doesn’t accept them, fallback gracefully
-        instruction = get_instr(text, **params)
-    except TypeError:
-        # For backward compatibility (if function doesn’t take arguments)
-        instruction = get_instr()
+# Stands in for the LLM output of a text that fail_fast mode did not send
+_SKIPPED = object()
 
-    # Construct final prompt
-    final_prompt = f"{instruction.strip()}\n\n{text}"
+def _prepare_batch(plan, texts, cache=None, decided=None, long_text=None):
+    """
+    Render every LLM prompt of a batch from a compiled plan and look up
+    cached verdicts. Texts flagged in decided (fail_fast mode) are not sent
+    to the LLM at all.
 
-    # Run the structured LLM scan
-    structured_model = llm.with_structured_output(model)
-    result_model = structured_model.invoke(final_prompt)
+    Returns:
+        tuple: (stages, cache_stats). stages holds one
+        (name, structured_model, prompts, keys, prefilled) tuple per LLM call,
+        with name None for the combined super prompt. prefilled[i] is the
+        cached verdict or the prompt-building error for texts[i], or None when
+        texts[i] still needs the call (_SKIPPED for decided texts). cache_stats holds per-text hit/miss
+        counters, or is None without a cache.
+    """
+    prompt_errors = [None] * len(texts)
+    stages = []
 
-    if not hasattr(result_model, "model_dump"):
-        raise TypeError(f"Scanner '{name}' must return a Pydantic model")
+    if plan.structured_model is not None:
+        if long_text is not None:
+            # The windowed model renders the window prompts itself from the raw texts
+            windowed = long_text.bind(plan)
+            keys = None
+            if cache is not None:
+                keys = [plan.combined_cache_key(text, windowed.cache_variant()) for text in texts]
+            stages.append((None, windowed, list(texts), keys))
+        else:
+            prompts = [plan.build_super_prompt(text) for text in texts]
+            keys = [plan.combined_cache_key(text) for text in texts] if cache is not None else None
+            stages.append((None, plan.structured_model, prompts, keys))
 
-    return result_model
+    for config, module, structured_model in plan.separate_steps:
+        name = config["name"]
+        params = config.get("params", {})
+        prompts = []
+        for i, text in enumerate(texts):
+            try:
+                prompts.append(build_separate_prompt(module, text, params))
+            except Exception as e:
+                prompt_errors[i] = prompt_errors[i] or ScanExecutionError(name, e)
+                prompts.append(None)
+        keys = None
+        if cache is not None:
+            keys = [plan.separate_cache_key(config, p) if p is not None else None for p in prompts]
+        stages.append((name, structured_model, prompts, keys))
 
-class InputWatchdog:
-    def __init__(self, provider=None, model=None, api_key=None):
-        self.llm = create_llm(provider, model, api_key)
+    cache_stats = [_new_cache_stats(cache) for _ in texts] if cache is not None else None
+    prepared = []
+    for name, structured_model, prompts, keys in stages:
+        prefilled = []
+        for i in range(len(texts)):
+            if prompt_errors[i] is not None:
+                prefilled.append(prompt_errors[i])
+            elif decided is not None and decided[i]:
+                prefilled.append(_SKIPPED)
+            elif cache is not None:
+                prefilled.append(_cache_lookup(cache, keys[i], cache_stats[i]))
+            else:
+                prefilled.append(None)
+        prepared.append((name, structured_model, prompts, keys, prefilled))
 
-    def scan(self, text, scanner_config):
-        valid_configs = validate_scanner_config(scanner_config, "input")
-        return run(self.llm, text, valid_configs)
-        
+    return prepared, cache_stats
+
+def _batch_config(max_concurrency):
+    return {"max_concurrency": max_concurrency} if max_concurrency else None
 
-class OutputWatchdog:
-    def __init__(self, provider=None, model=None, api_key=None):
+def _pending_prompts(prompts, prefilled):
+    """
+    Prompts that still need an LLM call: texts that neither failed already
+    nor were served from the cache.
+    """
+    return [p for p, filled in zip(prompts, prefilled) if filled is None]
+
+def _restore_outputs(outputs, prefilled):
+    """
+    Re-align batch outputs with the full list of texts after _pending_prompts.
+    """
+    outputs = iter(outputs)
+    return [filled if filled is not None else next(outputs) for filled in prefilled]
+
+def _stage_batch(stage, config):
+    _, structured_model, prompts, _, prefilled = stage
+    pending = _pending_prompts(prompts, prefilled)
+    if not pending:
+        return []
+    return structured_model.batch(pending, config, return_exceptions=True)
+
+async def _astage_batch(stage, config):
+    _, structured_model, prompts, _, prefilled = stage
+    pending = _pending_prompts(prompts, prefilled)
+    if not pending:
+        return []
+    return await structured_model.abatch(pending, config, return_exceptions=True)
+
+def _finish_stage(stage, outputs, cache):
+    """
+    Re-align a stage's batch outputs and cache the freshly computed verdicts.
+
+    Returns:
+        tuple: (name, outputs) with one output per text.
+    """
+    name, _, _, keys, prefilled = stage
+    outputs = _restore_outputs(outputs, prefilled)
+    if cache is not None:
+        for key, filled, output in zip(keys, prefilled, outputs):
+            if filled is None and not isinstance(output, Exception):
+                _cache_store(cache, key, output)
+    return name, outputs
+
+def _collect_batch(plan, texts, logic_batch, stage_outputs, cache_stats=None, fail_fast=False):
+    """
+    Merge per-stage batch outputs into one result per text, keeping input order.
+    Exceptions returned by a stage turn into a per-item error result.
+    """
+    logic_results, logic_errors = logic_batch
+    results = []
+    for i, text in enumerate(texts):
+        try:
+            if logic_errors[i] is not None:
+                raise logic_errors[i]
+
+            skipped = None
+            if fail_fast:
+                skipped = {}
+                failed_by = _first_logic_failure(logic_results[i])
+                unfinished = [c["name"] for c in plan.logic_scanners if c["name"] not in logic_results[i]]
+                _mark_skipped(skipped, unfinished, failed_by)
+
+            llm_result_model = None
+            separate_results = {}
+            for name, outputs in stage_outputs:
+                output = outputs[i]
+                if output is _SKIPPED:
+                    _mark_skipped(skipped, _stage_scanners(plan, name), failed_by)
+                    continue
+                if isinstance(output, ScanExecutionError):
+                    raise output
+                if isinstance(output, Exception):
+                    raise ScanExecutionError(text if name is None else name, output)
+
+                if name is None:
+                    llm_result_model = output
+                elif isinstance(output, dict):
+                    separate_results[name] = output
+                else:
+                    try:
+                        separate_results[name] = _check_separate_result(name, output)
+                    except TypeError as e:
+                        raise ScanExecutionError(name, e)
+
+            stats = cache_stats[i] if cache_stats is not None else None
+            results.append(_merge_results(logic_results[i], llm_result_model, separate_results, stats, skipped))
+        except Exception as e:
+            results.append(_error_result(e))
+    return results
+
+def run_many(
+    llm,
+    texts,
+    scanner_config,
+    max_concurrency=None,
+    cache=None,
+    fail_fast=False,
+    long_text=None,
+    result_format="dict",
+):
+    """
+    Scan a batch of texts with the same scanner config.
+
+    The config is compiled once, logic scanners are fanned out over the whole
+    batch and the LLM prompts go through the provider batch path
+    (Runnable.batch). Results come back in input order; a text that fails to
+    scan yields an error result instead of failing the whole batch.
+
+    Args:
+        llm: The LLM instance.
+        texts (list): Texts to scan.
+        scanner_config (list | ScanPlan): Scanner configurations or a compiled plan.
+        max_concurrency (int, optional): Maximum LLM calls in flight at once.
+        cache (optional): Verdict cache (see ai_watchdog.cache) consulted
+            before every LLM call.
+        fail_fast (bool): Cascade mode (see run()). The logic scanners run
+            over the batch first and texts they already failed are left out
+            of the LLM batches.
+        long_text (LongTextMode, optional): Window long texts (see run()).
+        result_format (str): "dict" (default) or "object" (see run()).
+
+    Returns:
+        list: One unified result per text.
+    """
+    _check_result_format(result_format)
+    texts = list(texts)
+    if not texts:
+        return []
+
+    plan = _as_plan(llm, scanner_config)
+    config = _batch_config(max_concurrency)
+    executor = _get_llm_executor()
+
+    if fail_fast:
+        logic_batch = _run_logic_batch(
+            texts, plan.cascade_logic_steps(), plan.logic_batch_fns, True, _executions(plan),
+            plan.text_view_scanners
+        )
+        decided = [_first_logic_failure(r) is not None for r in logic_batch[0]]
+        stages, cache_stats = _prepare_batch(plan, texts, cache, decided, long_text)
+        futures = [executor.submit(_stage_batch, stage, config) for stage in stages]
+    else:
+        # LLM batches run on the shared pool while the logic scanners run here
+        stages, cache_stats = _prepare_batch(plan, texts, cache, long_text=long_text)
+        futures = [executor.submit(_stage_batch, stage, config) for stage in stages]
+        logic_batch = _run_logic_batch(
+            texts, plan.logic_steps, plan.logic_batch_fns, False, _executions(plan), plan.text_view_scanners
+        )
+
+    stage_outputs = [
+        _finish_stage(stage, future.result(), cache)
+        for stage, future in zip(stages, futures)
+    ]
+
+    results = _collect_batch(plan, texts, logic_batch, stage_outputs, cache_stats, fail_fast)
+    return [_deliver(result, result_format) for result in results]
+
+async def arun_many(
+    llm,
+    texts,
+    scanner_config,
+    max_concurrency=None,
+    cache=None,
+    fail_fast=False,
+    long_text=None,
+    result_format="dict",
+):
+    """
+    Async counterpart of run_many() built on Runnable.abatch.
+    """
+    _check_result_format(result_format)
+    texts = list(texts)
+    if not texts:
+        return []
+
+    plan = _as_plan(llm, scanner_config)
+    config = _batch_config(max_concurrency)
+    loop = asyncio.get_running_loop()
+
+    if fail_fast:
+        logic_batch = await loop.run_in_executor(
+            None, _run_logic_batch, texts, plan.cascade_logic_steps(), plan.logic_batch_fns, True, _executions(plan),
+            plan.text_view_scanners
+        )
+        decided = [_first_logic_failure(r) is not None for r in logic_batch[0]]
+        stages, cache_stats = await _off_loop(loop, cache, _prepare_batch, plan, texts, cache, decided, long_text)
+        output_lists = await asyncio.gather(*(_astage_batch(stage, config) for stage in stages))
+    else:
+        stages, cache_stats = await _off_loop(loop, cache, _prepare_batch, plan, texts, cache, None, long_text)
+        logic_batch, *output_lists = await asyncio.gather(
+            loop.run_in_executor(
+                None, _run_logic_batch, texts, plan.logic_steps, plan.logic_batch_fns, False, _executions(plan),
+                plan.text_view_scanners
+            ),
+            *(_astage_batch(stage, config) for stage in stages),
+        )
+
+    stage_outputs = [
+        await _off_loop(loop, cache, _finish_stage, stage, outputs, cache)
+        for stage, outputs in zip(stages, output_lists)
+    ]
+
+    results = _collect_batch(plan, texts, logic_batch, stage_outputs, cache_stats, fail_fast)
+    return [_deliver(result, result_format) for result in results]
+
+def _config_key(scanner_config):
+    """
+    Build a hashable cache key for a scanner config.
+    """
+    return json.dumps(scanner_config, sort_keys=True, default=repr)
+
+class _Watchdog:
+    """
+    Shared implementation of InputWatchdog and OutputWatchdog.
+
+    Every scan method accepts either a scanner config list or a ScanPlan from
+    compile(). Config lists are compiled once and the plan is cached per
+    watchdog, so repeated scans with the same config skip validation,
+    imports and model building.
+
+    Args:
+        provider (str, optional): LLM provider name.
+        model (str, optional): Model name.
+        api_key (str, optional): Provider API key.
+        cache (optional): Opt-in verdict cache for the LLM stages. True keeps
+            verdicts in memory, a path stores them in a SQLite file shared
+            across processes, and any object with get()/set() is used as is.
+            Results then carry a "cache" entry with hit and miss counts.
+        fail_fast (bool): Scan in cascade mode (see run()): cheap logic
+            scanners first, and stop as soon as the verdict is decided.
+        long_text (LongTextMode | bool, optional): Scan long texts in
+            overlapping token windows with the combined scanner model. True
+            uses the LongTextMode defaults.
+        instrument (bool): Add "timings" and "usage" blocks to the results
+            of scan() and ascan() (see run()).
+        on_metrics (callable, optional): Called with the timings and usage
+            of every scan() and ascan(); turns instrumentation on.
+        result_format (str): "dict" (default) for unified result dicts, or
+            "object" for ScanResult objects with a to_json() fast path (see run()).
+    """
+
+    SCAN_TYPE = None
+
+    def __init__(
+        self,
+        provider=None,
+        model=None,
+        api_key=None,
+        cache=None,
+        fail_fast=False,
+        long_text=None,
+        instrument=False,
+        on_metrics=None,
+        result_format="dict",
+    ):
+        _check_result_format(result_format)
         self.llm = create_llm(provider, model, api_key)
+        self.cache = resolve_cache(cache)
+        self.fail_fast = fail_fast
+        self.long_text = LongTextMode() if long_text is True else (long_text or None)
+        self.instrument = instrument
+        self.on_metrics = on_metrics
+        self.result_format = result_format
+        self._plans = OrderedDict()
+        self._plans_lock = threading.Lock()
+
+    def compile(self, scanner_config):
+        """
+        Compile a scanner config into a reusable ScanPlan for this watchdog.
+        """
+        if isinstance(scanner_config, ScanPlan):
+            return scanner_config
+
+        key = _config_key(scanner_config)
+        with self._plans_lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = ScanPlan(self.llm, scanner_config, self.SCAN_TYPE)
+
+        with self._plans_lock:
+            self._plans[key] = plan
+            while len(self._plans) > PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
 
     def scan(self, text, scanner_config):
-        valid_configs = validate_scanner_config(scanner_config, "output")
-        return run(self.llm, text, valid_configs)
+        return run(
+            self.llm, text, self.compile(scanner_config), self.cache, self.fail_fast, self.long_text,
+            self.instrument, self.on_metrics, self.result_format,
+        )
+
+    async def ascan(self, text, scanner_config):
+        return await arun(
+            self.llm, text, self.compile(scanner_config), self.cache, self.fail_fast, self.long_text,
+            self.instrument, self.on_metrics, self.result_format,
+        )
+
+    def scan_many(self, texts, scanner_config, max_concurrency=None):
+        return run_many(
+            self.llm, texts, self.compile(scanner_config), max_concurrency,
+            self.cache, self.fail_fast, self.long_text, self.result_format,
+        )
+
+    async def ascan_many(self, texts, scanner_config, max_concurrency=None):
+        return await arun_many(
+            self.llm, texts, self.compile(scanner_config), max_concurrency,
+            self.cache, self.fail_fast, self.long_text, self.result_format,
+        )
+
+
+class InputWatchdog(_Watchdog):
+    SCAN_TYPE = "input"
+
+
+class OutputWatchdog(_Watchdog):
+    SCAN_TYPE = "output"
+
+    def stream(
+        self,
+        scanner_config,
+        overlap=STREAM_OVERLAP,
+        scan_every=STREAM_SCAN_EVERY,
+        checkpoint_chars=STREAM_CHECKPOINT_CHARS,
+    ):
+        """
+        Start scanning a streamed response. See OutputStream for usage.
+
+        Only streamable logic scanners (see streaming.is_streamable) can
+        clear text while it streams. If the config has a logic scanner that
+        cannot stream, e.g. a redacting regex_scanner, nothing is forwarded
+        before finish() has scanned the complete response. LLM scanners
+        never hold text back.
+        """
+        return OutputStream(self, scanner_config, overlap, scan_every, checkpoint_chars)
@@ -43,6 +43,16 @@ class ScannerImportError(WatchdogError):
         )
 
 
+class ScannerConfigError(WatchdogError):
+    """Raised when the params of a scanner config do not fit the scanner."""
+
+    def __init__(self, scanner_name: str, error: Exception):
+        super().__init__(
+            f"Invalid params for scanner '{scanner_name}': {error}",
+            context={"scanner": scanner_name, "error": str(error)},
+        )
+
+
 class PromptBuildError(WatchdogError):
     """Raised when building the LLM prompt fails due to misconfiguration or missing data."""
 
@@ -70,3 +80,13 @@ class LogicScanError(WatchdogError):
             f"Logic scan failed for scanner '{scanner_name}': {original_exception}",
             context={"scanner": scanner_name, "error": str(original_exception)}
         )
+
+
+class QueueFullError(WatchdogError):
+    """Raised when a scan queue is at its depth limit and new work must be shed."""
+
+    def __init__(self, depth: int, limit: int):
+        super().__init__(
+            f"Scan queue is full ({depth}/{limit} texts queued)",
+            context={"depth": depth, "limit": limit},
+        )
@@ -0,0 +1,115 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+def extract_token_usage(message):
+    """
+    Read prompt and completion token counts from a LangChain AIMessage.
+
+    Uses the standard usage_metadata when the provider integration fills it
+    and falls back to the provider-specific response_metadata otherwise.
+
+    Returns:
+        dict: input_tokens, output_tokens and total_tokens (None when unknown).
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    total_tokens = usage.get("total_tokens")
+
+    if input_tokens is None and output_tokens is None:
+        metadata = getattr(message, "response_metadata", None) or {}
+        # OpenAI and Hugging Face report "token_usage", Anthropic reports "usage"
+        token_usage = metadata.get("token_usage") or metadata.get("usage") or {}
+        input_tokens = token_usage.get("prompt_tokens", token_usage.get("input_tokens"))
+        output_tokens = token_usage.get("completion_tokens", token_usage.get("output_tokens"))
+        total_tokens = token_usage.get("total_tokens")
+
+    if total_tokens is None and input_tokens is not None and output_tokens is not None:
+        total_tokens = input_tokens + output_tokens
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": total_tokens}
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class ScanMetrics:
+    """
+    Wall-clock and CPU time per stage and per scanner, plus token usage per
+    LLM call, for one scan. Safe to record into from several threads.
+
+    CPU time is the CPU time of the thread that did the work
+    (time.thread_time), so it stays meaningful when stages run concurrently.
+    It is None for work awaited on an event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self.stages = {}
+        self.scanners = {}
+        self.calls = []
+
+    @contextmanager
+    def measure(self, kind, name, cpu=True):
+        """
+        Time the enclosed block as stage or scanner `name` (kind is "stage" or "scanner").
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time() if cpu else None
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start if cpu else None
+            self.record(kind, name, wall, cpu_time)
+
+    def record(self, kind, name, wall, cpu=None):
+        target = self.stages if kind == "stage" else self.scanners
+        with self._lock:
+            target[name] = {"wall_ms": _ms(wall), "cpu_ms": _ms(cpu)}
+
+    def record_llm_call(self, stage, prompt, message):
+        """
+        Record the token usage and prompt size of one LLM call.
+        """
+        entry = {"stage": stage, "prompt_chars": len(prompt)}
+        entry.update(extract_token_usage(message))
+        with self._lock:
+            self.calls.append(entry)
+
+    def to_dict(self):
+        """
+        Build the "timings" and "usage" blocks added to the scan result.
+        """
+        with self._lock:
+            calls = [dict(c) for c in self.calls]
+            stages = dict(self.stages)
+            scanners = dict(self.scanners)
+
+        def total(key):
+            values = [c[key] for c in calls if c[key] is not None]
+            return sum(values) if values else None
+
+        combined = next((c for c in calls if c["stage"] == "combined"), None)
+        return {
+            "timings": {
+                "total": {
+                    "wall_ms": _ms(time.perf_counter() - self._started),
+                    "cpu_ms": _ms(time.process_time() - self._cpu_started),
+                },
+                "stages": stages,
+                "scanners": scanners,
+            },
+            "usage": {
+                "llm_calls": len(calls),
+                "input_tokens": total("input_tokens"),
+                "output_tokens": total("output_tokens"),
+                "total_tokens": total("total_tokens"),
+                "super_prompt_chars": combined["prompt_chars"] if combined else None,
+                "calls": calls,
+            },
+        }
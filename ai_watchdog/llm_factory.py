@@ -1,21 +1,27 @@
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 from .exceptions import LLMCreationError
 
 def create_llm(provider=None, model=None, api_key=None):
+    """
+    Create the chat model of a provider.
+
+    Provider SDKs are imported only when their provider is selected, so
+    importing ai_watchdog does not pay for integrations that are never used.
+    """
     try:
         if provider is None or model is None:
             return None
         provider = provider.lower()
         if provider == "openai":
+            from langchain_openai import ChatOpenAI
             return ChatOpenAI(model_name=model, openai_api_key=api_key, temperature=0)
         elif provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
             return ChatAnthropic(model=model, anthropic_api_key=api_key, temperature=0)
         elif provider == "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI
             return ChatGoogleGenerativeAI(model=model, google_api_key=api_key, temperature=0)
         elif provider == "huggingface":
+            from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
             llm = HuggingFaceEndpoint(
                 repo_id=model,
                 task="text-generation",
@@ -27,3 +33,19 @@ def create_llm(provider=None, model=None, api_key=None):
             raise ValueError(f"Unsupported provider: {provider}")
     except Exception as e:
         raise LLMCreationError(provider, model, str(e))
+
+def get_model_id(llm):
+    """
+    Return a stable identifier for an LLM instance, e.g. "ChatOpenAI:gpt-4o-mini".
+    Used to keep cached verdicts of different models apart.
+    """
+    for attr in ("model_name", "model", "model_id", "repo_id"):
+        value = getattr(llm, attr, None)
+        if isinstance(value, str) and value:
+            return f"{type(llm).__name__}:{value}"
+
+    # ChatHuggingFace keeps the model on the wrapped endpoint
+    inner = getattr(llm, "llm", None)
+    if inner is not None and inner is not llm:
+        return f"{type(llm).__name__}/{get_model_id(inner)}"
+    return type(llm).__name__
@@ -0,0 +1,215 @@
+import importlib
+from typing import List, Optional, Tuple
+from ai_watchdog.scanners.check_token_limit import resolve_encoding
+
+# Window policies for reducing per-window verdicts into one verdict per scanner:
+# "any_fail" fails if any window failed, "majority" if more than half did.
+REDUCE_POLICIES = ("any_fail", "majority")
+
+DEFAULT_REDUCE_POLICY = "any_fail"
+
+
+def get_reduce_policy(config):
+    """
+    Reduce policy of a scanner: the "reduce" key of its config, else the
+    module's REDUCE_POLICY, else any_fail.
+    """
+    policy = config.get("reduce")
+    if policy is None:
+        module = importlib.import_module(f"ai_watchdog.scanners.{config['name']}")
+        policy = getattr(module, "REDUCE_POLICY", DEFAULT_REDUCE_POLICY)
+    if policy not in REDUCE_POLICIES:
+        raise ValueError(f"Unknown reduce policy '{policy}' for scanner '{config['name']}'")
+    return policy
+
+
+def reduce_window_results(windows, outputs, policies):
+    """
+    Reduce the combined-model outputs of every window into one result per scanner.
+
+    Each scanner keeps the fields of its first failing window (or of the first
+    window if none failed), gets its verdict from its reduce policy and lists
+    the character offsets of the failing windows in "failing_windows".
+
+    Args:
+        windows (list): (start, end) character offsets of each window.
+        outputs (list): Combined output model (or dict) of each window.
+        policies (dict): Reduce policy per scanner name.
+
+    Returns:
+        dict: Scanner name to reduced result dict.
+    """
+    dumps = [o if isinstance(o, dict) else o.model_dump() for o in outputs]
+    reduced = {}
+    for name, policy in policies.items():
+        results = [d.get(name) or {} for d in dumps]
+        failing = [i for i, r in enumerate(results) if r.get("result") is False]
+
+        chosen = dict(results[failing[0]] if failing else results[0])
+        if "result" in chosen:
+            if policy == "majority":
+                chosen["result"] = len(failing) * 2 <= len(results)
+            else:
+                chosen["result"] = not failing
+        chosen["failing_windows"] = [
+            {"start": windows[i][0], "end": windows[i][1]} for i in failing
+        ]
+        reduced[name] = chosen
+    return reduced
+
+
+class LongTextMode:
+    """
+    Map-reduce scanning of long texts in the combined super prompt path.
+
+    A text longer than `window_tokens` is split into overlapping,
+    token-bounded windows; every window is scanned with the combined scanner
+    model in parallel (Runnable.batch) and the per-window verdicts are reduced
+    per scanner (see reduce_window_results). Shorter texts are scanned as usual.
+
+    Args:
+        window_tokens (int): Maximum tokens of text per window.
+        overlap_tokens (int): Tokens shared by consecutive windows.
+        encoding (str): tiktoken encoding used to measure windows.
+        model_name (str, optional): Model name to pick the encoding from instead.
+        max_concurrency (int, optional): Maximum windows in flight at once,
+            for one text and for the windows of all texts of a batch scan.
+    """
+
+    def __init__(
+        self,
+        window_tokens: int = 4000,
+        overlap_tokens: int = 200,
+        encoding: str = "cl100k_base",
+        model_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if window_tokens <= 0 or not 0 <= overlap_tokens < window_tokens:
+            raise ValueError("window_tokens must be positive and larger than overlap_tokens")
+        self.window_tokens = window_tokens
+        self.overlap_tokens = overlap_tokens
+        self.encoding = encoding
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+
+    def cache_variant(self):
+        """
+        Settings that change the combined verdict, for the verdict cache key.
+        """
+        return ["windows", self.window_tokens, self.overlap_tokens, self.model_name or self.encoding]
+
+    def windows(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Split text into (start, end) character ranges of at most window_tokens
+        tokens each, consecutive windows sharing overlap_tokens tokens.
+        """
+        # A token is at least one byte long, so short texts need no tokenizing
+        if len(text.encode("utf-8", "surrogatepass")) <= self.window_tokens:
+            return [(0, len(text))]
+
+        enc = resolve_encoding(self.encoding, self.model_name)
+        tokens = enc.encode_ordinary(text)
+        if len(tokens) <= self.window_tokens:
+            return [(0, len(text))]
+
+        _, offsets = enc.decode_with_offsets(tokens)
+        step = self.window_tokens - self.overlap_tokens
+        windows = []
+        for first in range(0, len(tokens), step):
+            last = min(first + self.window_tokens, len(tokens))
+            end = offsets[last] if last < len(tokens) else len(text)
+            windows.append((offsets[first], end))
+            if last == len(tokens):
+                break
+        return windows
+
+    def bind(self, plan):
+        """
+        Wrap the combined structured model of a plan so that it scans raw texts window by window.
+        """
+        return WindowedModel(self, plan)
+
+
+class WindowedModel:
+    """
+    Stand-in for a plan's combined structured model that takes the raw text
+    instead of the rendered prompt and returns the reduced result dict.
+    Provides the invoke/ainvoke/batch/abatch calls core uses.
+    """
+
+    def __init__(self, mode, plan):
+        self.mode = mode
+        self.plan = plan
+        self.policies = {c["name"]: get_reduce_policy(c) for c in plan.llm_scanners}
+
+    def cache_variant(self):
+        return [*self.mode.cache_variant(), self.policies]
+
+    def _config(self, config=None):
+        """
+        Runnable config with the mode's max_concurrency applied; a limit the
+        caller already set is kept if it is the smaller one.
+        """
+        config = dict(config or {})
+        limit = self.mode.max_concurrency
+        if limit:
+            current = config.get("max_concurrency")
+            config["max_concurrency"] = min(current, limit) if current else limit
+        return config or None
+
+    def _split(self, text):
+        windows = self.mode.windows(text)
+        prompts = [self.plan.build_super_prompt(text[start:end]) for start, end in windows]
+        return windows, prompts
+
+    def _reduce(self, windows, outputs):
+        if len(outputs) == 1:
+            return outputs[0]
+        return reduce_window_results(windows, outputs, self.policies)
+
+    def invoke(self, text):
+        windows, prompts = self._split(text)
+        if len(prompts) == 1:
+            return self.plan.structured_model.invoke(prompts[0])
+        outputs = self.plan.structured_model.batch(prompts, self._config())
+        return self._reduce(windows, outputs)
+
+    async def ainvoke(self, text):
+        windows, prompts = self._split(text)
+        if len(prompts) == 1:
+            return await self.plan.structured_model.ainvoke(prompts[0])
+        outputs = await self.plan.structured_model.abatch(prompts, self._config())
+        return self._reduce(windows, outputs)
+
+    def _flatten(self, texts):
+        splits = [self._split(text) for text in texts]
+        prompts = [prompt for _, text_prompts in splits for prompt in text_prompts]
+        return splits, prompts
+
+    def _regroup(self, splits, outputs, return_exceptions):
+        results = []
+        position = 0
+        for windows, prompts in splits:
+            chunk = outputs[position:position + len(prompts)]
+            position += len(prompts)
+            error = next((o for o in chunk if isinstance(o, Exception)), None)
+            if error is not None:
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            else:
+                results.append(self._reduce(windows, chunk))
+        return results
+
+    def batch(self, texts, config=None, return_exceptions=False):
+        """
+        Scan many texts: the windows of every text go out in one batch.
+        """
+        splits, prompts = self._flatten(texts)
+        outputs = self.plan.structured_model.batch(prompts, self._config(config), return_exceptions=True)
+        return self._regroup(splits, outputs, return_exceptions)
+
+    async def abatch(self, texts, config=None, return_exceptions=False):
+        splits, prompts = self._flatten(texts)
+        outputs = await self.plan.structured_model.abatch(prompts, self._config(config), return_exceptions=True)
+        return self._regroup(splits, outputs, return_exceptions)
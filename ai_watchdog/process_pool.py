@@ -0,0 +1,201 @@
+"""
+Managed process pool for CPU-bound logic scanners.
+
+Scanners such as pii_detection or secrets_detection are pure-Python CPU
+work; running them on threads serializes every request on the GIL. Logic
+scanners whose execution hint is "process" (see scan_plan.get_execution)
+run here instead, in worker processes that keep the heavy engines loaded
+between jobs. A worker imports a scanner module and builds its engines on
+the first job that uses it; configure(warm_up=...) loads chosen scanners
+at worker start-up instead (each scanner module's warm_up()).
+
+Every worker holds its own copy of the engines (a spaCy model for
+pii_detection), so offloading is opt-in: scanners that merely default to
+"process" (DEFAULT_EXECUTION) use the pool once configure() has been called
+and run on the logic thread pool until then. A scanner config with an
+explicit "execution": "process" always uses the pool.
+
+Only plain data crosses the process boundary: the scanner name, its params
+and the texts go in, and result dicts (model_dump()) come back. A batch of
+texts is sent to a worker as one job per scanner.
+
+Workers are started with the "forkserver" method where available ("spawn"
+elsewhere), never by forking the scanning process: by then it runs the LLM,
+logic and URL thread pools, and a forked child can deadlock on a lock one of
+those threads held.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import threading
+from typing import List, Optional
+
+# Worker processes of the shared pool
+DEFAULT_MAX_WORKERS = os.cpu_count() or 1
+
+_settings = {"enabled": False, "max_workers": None, "mp_context": None, "warm_up": None}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(max_workers: Optional[int] = None, mp_context=None, warm_up: Optional[List[dict]] = None):
+    """
+    Enable the shared pool for scanners whose DEFAULT_EXECUTION is "process"
+    and set its options. A running pool is shut down and restarted with the
+    new options on next use.
+
+    Args:
+        max_workers (int, optional): Worker processes (default: CPU count).
+        mp_context (optional): multiprocessing context, e.g. multiprocessing.get_context("spawn").
+            Defaults to "forkserver", or "spawn" where forkserver is unavailable.
+        warm_up (list, optional): Scanner configs whose warm_up() runs in every
+            worker at start-up, e.g. the configs that will be scanned. Other
+            scanners are loaded on first use; nothing is warmed up when not given.
+    """
+    global _pool
+    with _pool_lock:
+        _settings.update(enabled=True, max_workers=max_workers, mp_context=mp_context, warm_up=warm_up)
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def is_enabled() -> bool:
+    """
+    True once configure() has been called.
+    """
+    return _settings["enabled"]
+
+
+def _default_context():
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared pool, starting it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=_settings["max_workers"] or DEFAULT_MAX_WORKERS,
+                    mp_context=_settings["mp_context"] or _default_context(),
+                    initializer=_init_worker,
+                    initargs=(_settings["warm_up"],),
+                )
+    return _pool
+
+
+def shutdown(wait: bool = True):
+    """
+    Stop the shared pool. It is started again on next use.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def submit(name: str, texts: List[str], params: Optional[dict] = None):
+    """
+    Run one logic scanner over texts in a worker.
+
+    Returns:
+        Future: Resolves to one result dict per text.
+    """
+    return get_pool().submit(_run_scanner, name, list(texts), params or {})
+
+
+def submit_many(texts: List[str], scanner_config: List[dict]):
+    """
+    Scan texts with a logic-only scanner config in one worker job.
+
+    Returns:
+        Future: Resolves to one unified result dict per text, as run_many() returns.
+    """
+    return get_pool().submit(_scan_many, list(texts), scanner_config)
+
+
+# --- Worker side ---
+
+_modules = {}
+_plans = {}
+_in_worker = False
+
+
+def in_worker() -> bool:
+    """
+    True inside a pool worker, where "process" scanners simply run inline.
+    """
+    return _in_worker
+
+
+def _module(name):
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = importlib.import_module(f"ai_watchdog.scanners.{name}")
+    return module
+
+
+def _init_worker(warm_up):
+    global _in_worker
+    _in_worker = True
+    for config in warm_up or ():
+        try:
+            warm = getattr(_module(config["name"]), "warm_up", None)
+            if callable(warm):
+                accepted = inspect.signature(warm).parameters
+                warm(**{k: v for k, v in config.get("params", {}).items() if k in accepted})
+        except Exception as e:
+            # A failing initializer would break the whole pool; the scan itself reports the error
+            print(f"[Watchdog] Could not warm up scanner '{config['name']}' in worker: {e}")
+
+
+def _run_scanner(name, texts, params):
+    module = _module(name)
+    batch_fn = getattr(module, "run_logic_based_batch_scan", None)
+    if callable(batch_fn):
+        models = batch_fn(texts, **params)
+    else:
+        models = [module.run_logic_based_scan(text, **params) for text in texts]
+    return [model.model_dump() for model in models]
+
+
+def _scan_one(plan, text):
+    from .core import run_many, _error_result
+
+    try:
+        return run_many(None, [text], plan)[0]
+    except Exception as e:
+        return _error_result(e).to_dict()
+
+
+def _scan_many(texts, scanner_config):
+    """
+    Scan a chunk in one run_many() call. When texts of a larger chunk come
+    back as errors (a batch scan function fails for the whole batch), they
+    are scanned again one by one, so a bad text only fails itself.
+    """
+    from .core import run_many
+    from .scan_plan import ScanPlan
+
+    key = json.dumps(scanner_config, sort_keys=True, default=repr)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = ScanPlan(None, scanner_config)
+    try:
+        results = run_many(None, texts, plan)
+    except Exception:
+        results = [None] * len(texts)
+    if len(texts) > 1:
+        for i, result in enumerate(results):
+            if result is None or "error" in result:
+                results[i] = _scan_one(plan, texts[i])
+    return results
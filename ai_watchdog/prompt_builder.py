@@ -13,6 +13,15 @@ def build_super_prompt(text_to_check: str, scanner_configs: List[Dict], scanner_
             "params": {"some_param": ...} # optional
         }
     """
+    return build_instruction_block(scanner_configs, scanner_package) + build_text_section(text_to_check)
+
+
+def build_instruction_block(scanner_configs: List[Dict], scanner_package="ai_watchdog.scanners") -> str:
+    """
+    Build the static part of the super prompt: the intro and every scanner's
+    instructions. It depends only on the scanner configs, so it can be
+    rendered once and reused for every text.
+    """
     scanners = []
     for config in scanner_configs:
         name = config.get("name")
@@ -57,6 +66,11 @@ def build_super_prompt(text_to_check: str, scanner_configs: List[Dict], scanner_
             # Covers missing SCANNER_NAME, or get_instruction_text failure
             raise PromptBuildError(scanner["module"].__name__, e)
 
-    text_section = f"\nText to analyze: \n\"\"\"\n{text_to_check}\n\"\"\"\n"
+    return intro + scanner_instructions
 
-    return intro + scanner_instructions + text_section
+
+def build_text_section(text_to_check: str) -> str:
+    """
+    Build the per-text tail of the super prompt.
+    """
+    return f"\nText to analyze: \n\"\"\"\n{text_to_check}\n\"\"\"\n"
@@ -1,7 +1,11 @@
 import importlib
+from functools import lru_cache
 from pydantic import create_model
 from .exceptions import ScannerImportError
 
+# Number of distinct scanner combinations whose super model is kept alive
+MODEL_CACHE_SIZE = 256
+
 def build_dynamic_super_model(scanner_names: list, scanner_package="ai_watchdog.scanners"):
     """
     Build a dynamic Pydantic super model from a list of scanner names.
@@ -9,7 +13,14 @@ def build_dynamic_super_model(scanner_names: list, scanner_package="ai_watchdog.
     Parameters:
         scanner_names: list of scanner module names as strings, e.g. ["ban_code", "toxicity_detection"]
         scanner_package: the Python package where the scanner modules are located (default: "scanners")
+
+    Models are cached per ordered tuple of scanner names, so the same
+    combination reuses one model class instead of rebuilding its core schema.
     """
+    return _build_cached_super_model(tuple(scanner_names), scanner_package)
+
+@lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _build_cached_super_model(scanner_names: tuple, scanner_package: str):
     fields = {}
 
     for name in scanner_names:
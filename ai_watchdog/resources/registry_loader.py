@@ -1,14 +1,41 @@
 import pkgutil
 import importlib
+from functools import lru_cache
 from presidio_analyzer import AnalyzerEngine, RecognizerRegistry, PatternRecognizer
+from presidio_analyzer.predefined_recognizers import SpacyRecognizer
 
+# Recognizer that reads the entities found by the spaCy NLP engine (PERSON,
+# LOCATION, ...); it is not a PatternRecognizer, so it is added by name
+NLP_RECOGNIZER = SpacyRecognizer.__name__
 
-def load_all_recognizers_from_resources(analyzer: AnalyzerEngine) -> AnalyzerEngine:
+
+def nlp_entities() -> set:
+    """
+    Entity types only the NLP recognizer detects.
+    """
+    return set(SpacyRecognizer.ENTITIES)
+
+
+def load_all_recognizers_from_resources(analyzer: AnalyzerEngine, recognizer_names=None) -> AnalyzerEngine:
     """
     Loads:
     1. Custom recognizers from ai_watchdog.resources.pii_recognizers
     2. All predefined recognizers (including country_specific) from Presidio
+    3. With recognizer_names, the NLP recognizer (SpacyRecognizer) when it is listed
+
+    Args:
+        analyzer (AnalyzerEngine): Engine whose registry receives the recognizers.
+        recognizer_names (iterable, optional): Only load recognizers whose name
+            (or class name) is listed. Loads everything when not given.
+
+    Raises:
+        ValueError: If a listed recognizer name matches no recognizer.
     """
+    wanted = set(recognizer_names) if recognizer_names is not None else None
+
+    def is_wanted(recognizer):
+        return wanted is None or recognizer.name in wanted or type(recognizer).__name__ in wanted
+
     # --- Load custom recognizers from your own package ---
     package = "ai_watchdog.resources.pii_recognizers"
     try:
@@ -17,34 +44,61 @@ def load_all_recognizers_from_resources(analyzer: AnalyzerEngine) -> AnalyzerEng
             module = importlib.import_module(f"{package}.{module_info.name}")
             if hasattr(module, "recognizers"):
                 for recognizer in getattr(module, "recognizers"):
-                    analyzer.registry.add_recognizer(recognizer)
+                    if is_wanted(recognizer):
+                        analyzer.registry.add_recognizer(recognizer)
     except ModuleNotFoundError:
         print(f"Custom recognizer package '{package}' not found. Skipping...")
 
     # --- Load all predefined recognizers from Presidio (recursively) ---
     try:
-        base_pkg = "presidio_analyzer.predefined_recognizers"
-
-        def import_all_recognizers(package_name):
-            pkg = importlib.import_module(package_name)
-            for _, mod_name, is_pkg in pkgutil.iter_modules(pkg.__path__):
-                full_name = f"{package_name}.{mod_name}"
-                if is_pkg:
-                    import_all_recognizers(full_name)
-                else:
-                    module = importlib.import_module(full_name)
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (
-                            isinstance(attr, type)
-                            and issubclass(attr, PatternRecognizer)
-                            and attr.__name__ != "PatternRecognizer"
-                        ):
-                            analyzer.registry.add_recognizer(attr())
-
-        import_all_recognizers(base_pkg)
+        for recognizer_cls in _predefined_recognizer_classes():
+            if wanted is not None and recognizer_cls.__name__ not in wanted:
+                continue
+            analyzer.registry.add_recognizer(recognizer_cls())
 
     except Exception as e:
         print(f"Error loading predefined recognizers: {e}")
 
+    if wanted is not None:
+        # The default registry already holds it; a restricted one only gets it on request
+        if NLP_RECOGNIZER in wanted:
+            analyzer.registry.add_recognizer(SpacyRecognizer(supported_language="en"))
+
+        loaded = set()
+        for recognizer in analyzer.registry.recognizers:
+            loaded.update((recognizer.name, type(recognizer).__name__))
+        unknown = sorted(wanted - loaded)
+        if unknown:
+            raise ValueError(f"Unknown PII recognizers: {', '.join(unknown)}")
+
     return analyzer
+
+
+@lru_cache(maxsize=None)
+def _predefined_recognizer_classes():
+    """
+    Walk presidio_analyzer.predefined_recognizers once and return every
+    PatternRecognizer subclass found, in discovery order.
+    """
+    base_pkg = "presidio_analyzer.predefined_recognizers"
+    found = []
+
+    def import_all_recognizers(package_name):
+        pkg = importlib.import_module(package_name)
+        for _, mod_name, is_pkg in pkgutil.iter_modules(pkg.__path__):
+            full_name = f"{package_name}.{mod_name}"
+            if is_pkg:
+                import_all_recognizers(full_name)
+            else:
+                module = importlib.import_module(full_name)
+                for attr_name in dir(module):
+                    attr = getattr(module, attr_name)
+                    if (
+                        isinstance(attr, type)
+                        and issubclass(attr, PatternRecognizer)
+                        and attr.__name__ != "PatternRecognizer"
+                    ):
+                        found.append(attr)
+
+    import_all_recognizers(base_pkg)
+    return tuple(found)
@@ -0,0 +1,322 @@
+import importlib
+import inspect
+import threading
+from .pydantic_model_builder import build_dynamic_super_model
+from .prompt_builder import build_instruction_block, build_text_section
+from .llm_factory import get_model_id
+from .cache import make_cache_key, text_hash
+from .exceptions import ScannerConfigError, ScannerImportError
+
+# LLM scanners that need their own prompt instead of the combined super prompt
+SEPARATE_LLM_SCANNERS = ["relevance_detection"]
+
+# Weight of the newest measurement in the per-scanner cost averages
+COST_EWMA_ALPHA = 0.2
+
+# Where a logic scanner runs: on the calling thread, on a thread of the
+# shared logic pool, or in the managed process pool (see process_pool.py)
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class ScannerCosts:
+    """
+    Exponentially weighted moving average of the time each scanner takes,
+    shared by every plan in the process. fail_fast mode uses it to run the
+    cheapest scanners first.
+    """
+
+    def __init__(self, alpha: float = COST_EWMA_ALPHA):
+        self.alpha = alpha
+        self._costs = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            previous = self._costs.get(name)
+            if previous is None:
+                self._costs[name] = seconds
+            else:
+                self._costs[name] = previous + self.alpha * (seconds - previous)
+
+    def estimate(self, name: str, default: float = 0.0) -> float:
+        """
+        Average cost of a scanner in seconds. Scanners that were never measured
+        cost `default`, so they run early and get measured.
+        """
+        return self._costs.get(name, default)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._costs)
+
+
+scanner_costs = ScannerCosts()
+
+
+def validate_scanner_config(scanner_config, allowed_type: str):
+    """
+    Validate and filter scanners based on allowed type ('input' or 'output').
+
+    Args:
+        scanner_config (list): List of scanner configurations.
+        allowed_type (str): 'input' or 'output'
+
+    Returns:
+        list: Filtered and valid scanner configurations.
+    """
+    valid_configs = []
+    skipped = []
+
+    for config in scanner_config:
+        name = config.get("name")
+        if not name:
+            continue
+
+        try:
+            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+            scanner_types = getattr(module, "SCANNER_TYPE", ["input", "output"])
+
+            if allowed_type.lower() in [t.lower() for t in scanner_types]:
+                valid_configs.append(config)
+            else:
+                skipped.append(name)
+        except Exception as e:
+            raise ScannerImportError(name, e)
+
+    if skipped:
+        print(f"[Watchdog] Skipped scanners (not valid for {allowed_type}): {', '.join(skipped)}")
+
+    return valid_configs
+
+
+def get_logic_fn(module):
+    """
+    Return the run_logic_based_scan callable of a logic-based scanner module.
+    """
+    logic_fn = getattr(module, "run_logic_based_scan", None)
+    if not callable(logic_fn):
+        raise AttributeError(f"Scanner '{module.SCANNER_NAME}' missing run_logic_based_scan function")
+    return logic_fn
+
+
+def check_logic_params(name, logic_fn, params):
+    """
+    Check that a logic scanner accepts its configured params, so a missing
+    or unknown param fails at compile time instead of in every scan.
+
+    Raises:
+        ScannerConfigError: If the params do not bind to run_logic_based_scan.
+    """
+    if not isinstance(params, dict):
+        raise ScannerConfigError(name, TypeError("params must be a dict"))
+    try:
+        inspect.signature(logic_fn).bind(None, **params)
+    except TypeError as e:
+        raise ScannerConfigError(name, e)
+
+
+def get_separate_output_model(module):
+    """
+    Return the output model of a scanner that runs outside the super prompt,
+    checking that it can build its own instruction text.
+    """
+    name = module.__name__.rsplit(".", 1)[-1]
+
+    # Get the OutputModel
+    model = getattr(module, "OUTPUT_MODEL", None)
+    if model is None:
+        raise AttributeError(f"Scanner '{name}' missing OUTPUT_MODEL class")
+
+    # Get the instruction text builder
+    get_instr = getattr(module, "get_instruction_text", None)
+    if not callable(get_instr):
+        raise AttributeError(f"Scanner '{name}' missing get_instruction_text() function")
+
+    return model
+
+
+def get_execution(config, module):
+    """
+    Execution mode of a logic scanner: the "execution" key of its config,
+    else the module's DEFAULT_EXECUTION, else inline.
+    """
+    execution = config.get("execution") or getattr(module, "DEFAULT_EXECUTION", "inline")
+    if execution not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{execution}'; expected one of {EXECUTION_MODES}")
+    return execution
+
+
+def build_separate_prompt(module, text, params):
+    """
+    Render the standalone prompt of a separately-run scanner for one text.
+    """
+    get_instr = module.get_instruction_text
+
+    # Build instruction using text + params (if the function accepts them)
+    try:
+        # Attempt to call with both text and params — if it doesn’t accept them, fallback gracefully
+        instruction = get_instr(text, **params)
+    except TypeError:
+        # For backward compatibility (if function doesn’t take arguments)
+        instruction = get_instr()
+
+    # Construct final prompt
+    return f"{instruction.strip()}\n\n{text}"
+
+
+class ScanPlan:
+    """
+    A scanner_config compiled once for a given LLM.
+
+    Compiling validates and categorizes the scanners, binds the logic scanner
+    callables, builds the ExpectedLLMOutput model, pre-renders the static
+    instruction block of the super prompt and binds the structured-output
+    runnables. Scanning with a plan does no import or introspection work.
+
+    Args:
+        llm: The LLM instance the runnables are bound to.
+        scanner_config (list): List of scanner configurations.
+        allowed_type (str, optional): 'input' or 'output'. When given, the
+            config is filtered through validate_scanner_config first.
+    """
+
+    def __init__(self, llm, scanner_config, allowed_type=None):
+        if allowed_type is not None:
+            scanner_config = validate_scanner_config(scanner_config, allowed_type)
+
+        self.llm = llm
+        self.model_id = get_model_id(llm)
+        self.allowed_type = allowed_type
+        self.scanner_config = list(scanner_config)
+
+        self.logic_steps = []     # (config, run_logic_based_scan)
+        self.logic_batch_fns = {} # name -> run_logic_based_batch_scan, for scanners that have one
+        self.text_view_scanners = set() # names of logic scanners that take a shared TextView
+        self.logic_execution = {} # name -> execution mode, see get_execution()
+        self.explicit_execution = set() # names whose config sets "execution" itself
+        self.llm_scanners = []    # configs answered by the combined super prompt
+        self.separate_steps = []  # (config, module, structured_model)
+        self._separate_models = {} # name -> output model of a separate step
+        self._raw_models = {}      # stage -> include_raw runnable, see raw_structured_model()
+
+        for config in self.scanner_config:
+            name = config.get("name")
+            if not name:
+                continue
+
+            try:
+                module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+                mode = getattr(module, "DEFAULT_MODE", "llm").lower()
+                if mode == "logic":
+                    logic_fn = get_logic_fn(module)
+                    check_logic_params(name, logic_fn, config.get("params", {}))
+                    self.logic_steps.append((config, logic_fn))
+                    self.logic_execution[name] = get_execution(config, module)
+                    if config.get("execution"):
+                        self.explicit_execution.add(name)
+                    if getattr(module, "ACCEPTS_TEXT_VIEW", False):
+                        self.text_view_scanners.add(name)
+                    batch_fn = getattr(module, "run_logic_based_batch_scan", None)
+                    if callable(batch_fn):
+                        self.logic_batch_fns[name] = batch_fn
+                elif mode == "llm" and name in SEPARATE_LLM_SCANNERS:
+                    model = get_separate_output_model(module)
+                    self._separate_models[name] = model
+                    self.separate_steps.append((config, module, llm.with_structured_output(model)))
+                else:
+                    self.llm_scanners.append(config)
+            except ScannerConfigError:
+                raise
+            except Exception as e:
+                raise ScannerImportError(name, e)
+
+        self.output_model = None
+        self.instruction_block = None
+        self.structured_model = None
+        self.instruction_hash = None
+        if self.llm_scanners:
+            name_list = [item["name"] for item in self.llm_scanners]
+            self.output_model = build_dynamic_super_model(name_list)
+            self.instruction_block = build_instruction_block(self.llm_scanners)
+            self.instruction_hash = text_hash(self.instruction_block)
+            self.structured_model = llm.with_structured_output(self.output_model)
+
+    @property
+    def logic_scanners(self):
+        return [config for config, _ in self.logic_steps]
+
+    @property
+    def separate_llm_scanners(self):
+        return [config for config, _, _ in self.separate_steps]
+
+    @property
+    def llm_scanner_names(self):
+        """
+        Names of every LLM-based scanner, combined and separate.
+        """
+        return [c["name"] for c in self.llm_scanners] + [c["name"] for c in self.separate_llm_scanners]
+
+    def cascade_logic_steps(self):
+        """
+        Logic steps ordered by measured cost, cheapest first.
+        """
+        return sorted(self.logic_steps, key=lambda step: scanner_costs.estimate(step[0]["name"]))
+
+    def raw_structured_model(self, stage=None):
+        """
+        Structured runnable of an LLM stage (a separate scanner name, or None
+        for the combined super prompt) bound with include_raw=True, so the
+        provider message and its token usage come back with the parsed
+        verdict. Built on first use, since only instrumented scans need it.
+        """
+        model = self._raw_models.get(stage)
+        if model is None:
+            schema = self.output_model if stage is None else self._separate_models[stage]
+            model = self.llm.with_structured_output(schema, include_raw=True)
+            self._raw_models[stage] = model
+        return model
+
+    def warm_up(self):
+        """
+        Load the heavy resources of the logic scanners (NLP engines, lexicons,
+        plugin sets) ahead of the first scan by calling each scanner module's
+        warm_up() with the config params it accepts.
+        """
+        for config, _ in self.logic_steps:
+            module = importlib.import_module(f"ai_watchdog.scanners.{config['name']}")
+            warm_up = getattr(module, "warm_up", None)
+            if callable(warm_up):
+                accepted = inspect.signature(warm_up).parameters
+                params = config.get("params", {})
+                warm_up(**{k: v for k, v in params.items() if k in accepted})
+
+    def build_super_prompt(self, text):
+        """
+        Render the combined super prompt for one text from the cached instruction block.
+        """
+        return self.instruction_block + build_text_section(text)
+
+    def combined_cache_key(self, text, variant=None):
+        """
+        Cache key of the combined super prompt verdict for one text: covers the
+        text, the LLM scanners with their params, the instruction text and the
+        model. variant distinguishes other ways of scanning the same text,
+        e.g. long-text windows.
+        """
+        scanners = [[c["name"], c.get("params", {})] for c in self.llm_scanners]
+        return make_cache_key(
+            "combined", self.model_id, scanners, self.instruction_hash, text_hash(text), variant
+        )
+
+    def separate_cache_key(self, config, prompt):
+        """
+        Cache key of a separately-run scanner verdict. The rendered prompt
+        already contains both the instruction text and the scanned text.
+        """
+        return make_cache_key(
+            "separate", self.model_id, config["name"], config.get("params", {}), text_hash(prompt)
+        )
+
+    def __repr__(self):
+        names = [config.get("name") for config in self.scanner_config]
+        return f"ScanPlan(allowed_type={self.allowed_type!r}, scanners={names!r})"
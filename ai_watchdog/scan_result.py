@@ -0,0 +1,126 @@
+"""
+Lightweight scan result objects.
+
+Scans return the unified result dict by default. With result_format="object"
+(see core.run()) they return a ScanResult instead. It holds the scanner
+results as the validated Pydantic models the scanners returned, and dumps
+one only when it is accessed. to_json() serializes straight from the models
+to JSON bytes without building the intermediate dicts. A ScanResult is a
+read-only Mapping with the same keys and values as the dict, and to_dict()
+returns that dict.
+"""
+from collections.abc import Mapping
+from typing import Iterator, List, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json as _model_to_json
+
+# orjson is optional. It is the fastest encoder for plain data but cannot
+# serialize Pydantic models, which pydantic-core encodes without dumping them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shapes a scan can return its result in
+RESULT_FORMATS = ("dict", "object")
+
+
+def _failed(result) -> bool:
+    if isinstance(result, dict):
+        return result.get("result") is False
+    return getattr(result, "result", None) is False
+
+
+class ScanResult(Mapping):
+    """
+    Result of one scan: the per-scanner results, the overall verdict and any
+    extra top-level entries (skipped_scanners, cache, timings, usage, error).
+
+    Args:
+        results (dict): Scanner name to result model, or to result dict for
+            verdicts served from the cache or the process pool.
+        overall_result (bool, optional): Overall verdict. Defaults to True
+            when no scanner failed.
+        extra (dict, optional): Further top-level entries, in output order.
+    """
+
+    __slots__ = ("overall_result", "failed_scanners", "extra", "_results", "_dumped")
+
+    def __init__(self, results: dict, overall_result: Optional[bool] = None, extra: Optional[dict] = None):
+        self._results = results
+        self._dumped = {}
+        self.failed_scanners = [name for name, result in results.items() if _failed(result)]
+        self.overall_result = not self.failed_scanners if overall_result is None else overall_result
+        self.extra = extra if extra is not None else {}
+
+    @property
+    def scanners(self) -> List[str]:
+        """
+        Names of the scanners with a result, in output order.
+        """
+        return list(self._results)
+
+    def scanner_result(self, name: str):
+        """
+        Result of one scanner as returned by the scanner: a Pydantic model, or
+        a dict for verdicts served from the cache or the process pool.
+        """
+        return self._results[name]
+
+    def __getitem__(self, key):
+        if key in self._results:
+            dumped = self._dumped.get(key)
+            if dumped is None:
+                result = self._results[key]
+                dumped = result if isinstance(result, dict) else result.model_dump()
+                self._dumped[key] = dumped
+            return dumped
+        if key == "overall_result":
+            return self.overall_result
+        if key == "failed_scanners":
+            return self.failed_scanners
+        return self.extra[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._results or key in ("overall_result", "failed_scanners") or key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._results
+        yield "overall_result"
+        yield "failed_scanners"
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return len(self._results) + 2 + len(self.extra)
+
+    def to_dict(self) -> dict:
+        """
+        The unified result dict, as scans return it by default.
+        """
+        unified = {name: self[name] for name in self._results}
+        unified["overall_result"] = self.overall_result
+        unified["failed_scanners"] = self.failed_scanners
+        unified.update(self.extra)
+        return unified
+
+    def to_json(self) -> bytes:
+        """
+        Serialize the result to UTF-8 JSON bytes, equal to json.dumps(to_dict()).
+        Scanner results that were never accessed are serialized straight from
+        their models by pydantic-core; results that are plain data throughout
+        go through orjson when it is installed.
+        """
+        payload = {name: self._dumped.get(name, result) for name, result in self._results.items()}
+        payload["overall_result"] = self.overall_result
+        payload["failed_scanners"] = self.failed_scanners
+        payload.update(self.extra)
+        if orjson is not None and not any(isinstance(value, BaseModel) for value in payload.values()):
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return _model_to_json(payload, by_alias=False, fallback=str)
+
+    def __repr__(self):
+        return (
+            f"ScanResult(overall_result={self.overall_result!r}, "
+            f"failed_scanners={self.failed_scanners!r}, scanners={self.scanners!r})"
+        )
@@ -1,26 +1,76 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
+from ai_watchdog.aho_corasick import get_automaton
+
+if TYPE_CHECKING:
+    from ai_watchdog.text_view import TextView
 
 
 # --- Scanner metadata ---
 SCANNER_NAME = "ban_substrings"
 DEFAULT_MODE = "logic"  # can be switched to "llm" if you want LLM-based scanning
 AVAILABLE_MODES = ["logic", "llm"]
+# Can run incrementally over a sliding window of a streamed response (see streaming.py)
+STREAMABLE = True
 SCANNER_TYPE = ["input", "output"]
+# Matches against the folded text of the shared TextView of the scan (see ai_watchdog.text_view)
+ACCEPTS_TEXT_VIEW = True
+
+class BannedMatch(BaseModel):
+    phrase: str = Field(..., description="Banned substring that matched.")
+    start: int = Field(..., description="Start offset of the match in the text.")
+    end: int = Field(..., description="End offset (exclusive) of the match in the text.")
+
 
 class BanSubstringsOutput(BaseModel):
     result: bool = Field(..., description="True if text passes the check, False if it violates the rule.")
     banned_phrases_found: List[str] = Field(default_factory=list, description="List of banned substrings found in text.")
+    matches: List[BannedMatch] = Field(default_factory=list, description="Every occurrence of a banned substring with its offsets.")
 
 
-def run_logic_based_scan(text: str, banned_substrings: List[str]) -> BanSubstringsOutput:
+def run_logic_based_scan(
+    text: str,
+    banned_substrings: List[str],
+    whole_word: bool = False,
+    casefold: bool = False,
+    text_view: Optional["TextView"] = None,
+) -> BanSubstringsOutput:
     """
     Detects whether the input text contains any banned substrings.
     Returns a BanSubstringsOutput Pydantic model.
+
+    All substrings are matched case-insensitively in a single pass with an
+    Aho-Corasick automaton that is built once per distinct list and cached.
+
+    Args:
+        text (str): The text to scan.
+        banned_substrings (List[str]): Substrings that must not appear.
+        whole_word (bool): Only match substrings that are not part of a longer word.
+        casefold (bool): Use Unicode casefolding instead of lower() (e.g. "ß" matches "ss").
+        text_view (TextView, optional): Shared view of the text, whose folded
+            copy is reused instead of folding the text again.
     """
-    found = [s for s in banned_substrings if s.lower() in text.lower()]
+    automaton = get_automaton(tuple(banned_substrings), casefold)
+    folded = None
+    if text_view is not None:
+        folded = text_view.casefolded if casefold else text_view.lowered
+
+    matches = sorted(
+        (start, end, index)
+        for index, start, end in automaton.iter_matches(text, whole_word=whole_word, folded=folded)
+    )
+    matched = {index for _, _, index in matches}
+
+    found = [s for i, s in enumerate(banned_substrings) if i in matched]
     passed = len(found) == 0
-    return BanSubstringsOutput(result=passed, banned_phrases_found=found)
+    return BanSubstringsOutput(
+        result=passed,
+        banned_phrases_found=found,
+        matches=[
+            BannedMatch(phrase=banned_substrings[index], start=start, end=end)
+            for start, end, index in matches
+        ],
+    )
 
 def get_instruction_text(banned_substrings: List[str]) -> str:
     """
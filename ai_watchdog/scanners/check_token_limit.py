@@ -1,56 +1,184 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-import tiktoken
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+from functools import lru_cache
+import re
+
+if TYPE_CHECKING:
+    import tiktoken
+    from ai_watchdog.text_view import TextView
 
 class TokenLimitOutput(BaseModel):
     result: bool = Field(..., description='Returns true if token count is within the allowed limit (passes scanner), false if limit exceeded')
     details: Optional[str] = Field(None, description='Single line explanation')
+    token_count: Optional[int] = Field(None, description='Token count, or a bound when it was not counted exactly (see details)')
 
 SCANNER_NAME = "check_token_limit"
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
 SCANNER_TYPE = ["input"]
 OUTPUT_MODEL = TokenLimitOutput
+# Counts through the shared TextView of the scan (see ai_watchdog.text_view)
+ACCEPTS_TEXT_VIEW = True
+
+# Characters encoded per step when counting long texts
+CHUNK_CHARS = 16384
+
+_WORD_START = re.compile(r" (?=\S)")
+
+
+# tiktoken is imported on first use so that importing the scanner stays cheap
+@lru_cache(maxsize=None)
+def get_encoding(name: str) -> "tiktoken.Encoding":
+    """
+    Return a cached tiktoken encoding by name.
+    """
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+
+@lru_cache(maxsize=None)
+def encoding_for_model(model_name: str) -> "tiktoken.Encoding":
+    """
+    Return a cached tiktoken encoding for a model name.
+    """
+    import tiktoken
+    return tiktoken.encoding_for_model(model_name)
+
+
+@lru_cache(maxsize=None)
+def _max_token_bytes(encoding: "tiktoken.Encoding") -> int:
+    """
+    Length in bytes of the longest token of an encoding.
+    """
+    return max(len(token) for token in encoding.token_byte_values())
+
+
+def resolve_encoding(
+    encoding: Union["tiktoken.Encoding", str, None] = "cl100k_base",
+    model_name: Optional[str] = None,
+) -> "tiktoken.Encoding":
+    """
+    Pick the encoding to count with (priority: provided instance > model_name > encoding name).
+    """
+    if encoding is not None and not isinstance(encoding, str):
+        return encoding
+    if model_name:
+        return encoding_for_model(model_name)
+    return get_encoding(encoding or "cl100k_base")
+
+
+def _next_cut(text: str, start: int, end: int) -> int:
+    """
+    Find where the chunk starting at `start` should end: just before the last
+    space in (start, end) that begins a word. The BPE pre-tokenizer always
+    splits there, so per-chunk token counts add up to the whole-text count.
+    If the window has no such space, the chunk is extended to the next one.
+    """
+    cut = text.rfind(" ", start + 1, end)
+    while cut > start and text[cut + 1].isspace():
+        cut = text.rfind(" ", start + 1, cut)
+    if cut > start:
+        return cut
+
+    match = _WORD_START.search(text, end)
+    return match.start() if match else len(text)
+
+
+def count_tokens_bounded(
+    text: str,
+    encoding: "tiktoken.Encoding",
+    limit: int,
+    utf8_length: Optional[int] = None,
+    exact: bool = False,
+) -> Tuple[int, bool]:
+    """
+    Count tokens only as far as needed to compare the count with `limit`.
+
+    A token is never shorter than one byte nor longer than the encoding's
+    longest token. So the UTF-8 length is an upper bound that accepts short
+    inputs without tokenizing them, and the UTF-8 length divided by the
+    longest token is a lower bound that rejects huge ones. Otherwise the text
+    is encoded in chunks and counting stops once the running total passes
+    the limit.
+
+    Args:
+        utf8_length (int, optional): UTF-8 length of the text, if already known.
+        exact (bool): Tokenize texts within the limit to count them exactly
+            instead of accepting them by their UTF-8 length.
+
+    Returns:
+        tuple: (count, exact). When exact is False, count is a bound: an
+        upper bound if it is within the limit, a lower bound that already
+        exceeds the limit otherwise.
+    """
+    if utf8_length is None:
+        utf8_length = len(text) if text.isascii() else len(text.encode("utf-8"))
+    if utf8_length <= limit and not exact:
+        return utf8_length, False
+    lower_bound = -(-utf8_length // _max_token_bytes(encoding))
+    if lower_bound > limit:
+        return lower_bound, False
+
+    total = 0
+    start = 0
+    while start < len(text):
+        end = start + CHUNK_CHARS
+        cut = _next_cut(text, start, end) if end < len(text) else len(text)
+        total += len(encoding.encode_ordinary(text[start:cut]))
+        if total > limit and cut < len(text):
+            return total, False
+        start = cut
+    return total, True
 
 
 def run_logic_based_scan(
     text: str,
     max_tokens: int = 4096,
-    encoding: Optional[tiktoken.Encoding] = "cl100k_base",
-    model_name: Optional[str] = None
+    encoding: Optional[Union["tiktoken.Encoding", str]] = "cl100k_base",
+    model_name: Optional[str] = None,
+    text_view: Optional["TextView"] = None,
+    exact_count: bool = False,
 ) -> TokenLimitOutput:
     """
     Generic logic-based scanner that checks if the given text exceeds the token limit.
     Uses tiktoken for accurate tokenization. Encoding can be passed directly for efficiency.
-    
+
+    Encodings are cached per name and model. Texts with no more UTF-8 bytes
+    than max_tokens pass without being tokenized, and counting stops as soon
+    as the limit is provably exceeded, so oversized inputs are rejected
+    without being tokenized in full.
+
     Args:
         text (str): The text to analyze.
         max_tokens (int): The maximum allowed token count (default: 4096).
-        encoding (tiktoken.Encoding, optional): Pre-initialized encoding instance. If not provided, one will be created.
-        model_name (str, optional): Model name for selecting tokenizer. Only used if encoding is not provided.
-    
+        encoding (tiktoken.Encoding | str, optional): Pre-initialized encoding instance, or an encoding name.
+        model_name (str, optional): Model name for selecting tokenizer. Only used if no encoding instance is provided.
+        text_view (TextView, optional): Shared view of the text; its token counts are memoized per encoding.
+        exact_count (bool): Always report the exact token count of texts within
+            the limit, at the cost of tokenizing them (default: False).
+
     Returns:
         TokenLimitOutput: Structured output with result and explanation.
     """
-    # Determine encoding (priority: provided > model_name > default)
- 
-    if model_name:
-        encoding = tiktoken.encoding_for_model(model_name)
-    else:
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = resolve_encoding(encoding, model_name)
 
     # Tokenize and count
-    token_count = len(encoding.encode(text))
+    if text_view is not None:
+        token_count, exact = text_view.token_count(encoding, max_tokens, exact_count)
+    else:
+        token_count, exact = count_tokens_bounded(text, encoding, max_tokens, exact=exact_count)
 
     if token_count <= max_tokens:
+        shown = token_count if exact else f"at most {token_count}"
         return TokenLimitOutput(
             result=True,
-            details=f"Token count ({token_count}) is within the allowed limit ({max_tokens})."
+            details=f"Token count ({shown}) is within the allowed limit ({max_tokens}).",
+            token_count=token_count,
         )
     else:
+        shown = token_count if exact else f"at least {token_count}"
         return TokenLimitOutput(
             result=False,
-            details=f"Token count ({token_count}) exceeds the allowed limit ({max_tokens})."
+            details=f"Token count ({shown}) exceeds the allowed limit ({max_tokens}).",
+            token_count=token_count,
         )
-
-print(run_logic_based_scan("Enter your input here ...", max_tokens=4) )
\ No newline at end of file
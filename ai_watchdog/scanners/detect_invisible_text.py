@@ -1,54 +1,98 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Dict
+from collections import Counter
 import unicodedata
 
+if TYPE_CHECKING:
+    from ai_watchdog.text_view import TextView
+
 class InvisibleTextOutput(BaseModel):
     result: bool = Field(..., description='Returns true if no invisible or obfuscated text is detected (passes scanner), false otherwise')
     details: Optional[str] = Field(None, description='Single line explanation')
+    sanitized_text: Optional[str] = Field(None, description='Text with every invisible character removed')
+    category_counts: Dict[str, int] = Field(default_factory=dict, description='Number of invisible characters per Unicode category')
 
 SCANNER_NAME = "detect_invisible_text"
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
-SCANNER_TYPE = ["input"]
+# Can run incrementally over a sliding window of a streamed response (see streaming.py)
+STREAMABLE = True
+SCANNER_TYPE = ["input", "output"]
 OUTPUT_MODEL = InvisibleTextOutput
+# Reads the non-ASCII flag from the shared TextView of the scan (see ai_watchdog.text_view)
+ACCEPTS_TEXT_VIEW = True
+
+BANNED_CATEGORIES = ("Cf", "Co", "Cn")
+
 
+# Up to this many distinct invisible characters are removed with one
+# str.replace() each; more than that with a single str.translate() pass
+REPLACE_LIMIT = 16
 
-def run_logic_based_scan(text: str) -> InvisibleTextOutput:
+
+def _invisible_chars(text: str) -> list:
+    """
+    Return the distinct characters of text in the banned categories. Only
+    the set of distinct characters is classified, so the per-character work
+    is the C-level set() construction.
+    """
+    return [char for char in set(text) if unicodedata.category(char) in BANNED_CATEGORIES]
+
+
+def _strip(text: str, chars: list) -> str:
+    if len(chars) <= REPLACE_LIMIT:
+        for char in chars:
+            text = text.replace(char, "")
+        return text
+    return text.translate(dict.fromkeys(map(ord, chars)))
+
+
+def run_logic_based_scan(text: str, text_view: Optional["TextView"] = None) -> InvisibleTextOutput:
     """
     Detects invisible or non-printable Unicode characters in the given text.
 
+    Runs in linear time: pure-ASCII text is accepted without iterating in
+    Python. Otherwise only the distinct characters of the text are
+    classified, and the invisible ones are stripped with str.replace() or
+    str.translate().
+
     Args:
         text (str): The text to scan.
+        text_view (TextView, optional): Shared view of the text, used for its ASCII check.
 
     Returns:
-        InvisibleTextOutput: Result indicating presence of invisible characters.
+        InvisibleTextOutput: Result indicating presence of invisible characters,
+        the sanitized text and per-category counts.
     """
-    banned_categories = {"Cf", "Co", "Cn"}
-
-    def contains_unicode(t: str) -> bool:
-        return any(ord(char) > 127 for char in t)
-
     # If text has no unicode chars, it's safe
-    if not contains_unicode(text):
+    is_ascii = text_view.is_ascii if text_view is not None else text.isascii()
+    if is_ascii:
         return InvisibleTextOutput(
             result=True,
-            details="No invisible characters detected."
+            details="No invisible characters detected.",
+            sanitized_text=text,
         )
 
-    invisible_chars = []
-    for char in text:
-        if unicodedata.category(char) in banned_categories:
-            invisible_chars.append(char)
-            text = text.replace(char, "")
+    invisible = _invisible_chars(text)
+
+    if invisible:
+        sanitized_text = _strip(text, invisible)
+        removed = len(text) - len(sanitized_text)
+        # Each distinct invisible character is counted with str.count()
+        # rather than by walking the text
+        category_counts = Counter()
+        for char in invisible:
+            category_counts[unicodedata.category(char)] += text.count(char)
 
-    if invisible_chars:
         return InvisibleTextOutput(
             result=False,
-            details=f"Invisible characters found and removed: {len(invisible_chars)}"
+            details=f"Invisible characters found and removed: {removed}",
+            sanitized_text=sanitized_text,
+            category_counts=dict(category_counts),
         )
 
     return InvisibleTextOutput(
         result=True,
-        details="No invisible characters detected."
+        details="No invisible characters detected.",
+        sanitized_text=text,
     )
-
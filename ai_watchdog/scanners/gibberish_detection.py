@@ -11,6 +11,9 @@ AVAILABLE_MODES = ["llm"]
 SCANNER_TYPE = ["input", "output"]
 OUTPUT_MODEL = GibberishDetectionOutput
 
+# A long text fails only if most of its windows read as gibberish (see long_text.py)
+REDUCE_POLICY = "majority"
+
 def get_instruction_text() -> str:
     """
     Build instruction text for the GibberishDetection scanner.
@@ -1,7 +1,11 @@
-from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern
-from presidio_anonymizer import AnonymizerEngine
 from pydantic import BaseModel
-from ai_watchdog.resources.registry_loader import load_all_recognizers_from_resources
+from typing import TYPE_CHECKING, Optional, List
+import threading
+
+if TYPE_CHECKING:
+    from presidio_analyzer import AnalyzerEngine
+    from presidio_analyzer.nlp_engine import NlpEngine
+    from presidio_anonymizer import AnonymizerEngine
 
 
 class PIIDetectionResult(BaseModel):
@@ -11,30 +15,157 @@ class PIIDetectionResult(BaseModel):
     sanitized_text: str | None  # Redacted version of the text (if redact mode)
 
 
-SCANNER_NAME = "secrets_detection"
-SCANNER_TYPE = ["input"]
+SCANNER_NAME = "pii_detection"
+SCANNER_TYPE = ["input", "output"]
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
+# Can run incrementally over a sliding window of a streamed response (see streaming.py)
+STREAMABLE = True
+# Pure-Python CPU work: run in the process pool when it is enabled (see process_pool.py)
+DEFAULT_EXECUTION = "process"
 OUTPUT_MODEL = PIIDetectionResult
 
 
-def run_logic_based_scan(text: str, mode: str = "block") -> PIIDetectionResult:
+# --- Shared engines ---
+# Loading the spaCy pipeline is the expensive part of an AnalyzerEngine, so
+# one NlpEngine is built per process and handed to every analyzer; the
+# analyzers themselves (one per recognizer set) only differ in their
+# registries. All engines are shared by all threads: analyze() and
+# anonymize() do not mutate them. Presidio itself is imported together with
+# the first engine.
+_nlp_engine = None
+_analyzers = {}
+_anonymizer = None
+_engine_lock = threading.RLock()
+
+
+def _recognizer_key(recognizers: Optional[List[str]]):
+    return None if recognizers is None else tuple(sorted(set(recognizers)))
+
+
+def _with_nlp_recognizer(recognizers: Optional[List[str]], entities: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Add the NLP recognizer to a restricted recognizer list when the requested
+    entities (all of them when not given) include one only it detects, such
+    as PERSON or LOCATION.
+    """
+    if recognizers is None:
+        return None
+    from ai_watchdog.resources.registry_loader import NLP_RECOGNIZER, nlp_entities
+
+    if NLP_RECOGNIZER in recognizers or (entities and not set(entities) & nlp_entities()):
+        return recognizers
+    return list(recognizers) + [NLP_RECOGNIZER]
+
+
+def get_nlp_engine() -> "NlpEngine":
+    """
+    Return the process-wide spaCy NlpEngine, loading the model on first use.
+    """
+    global _nlp_engine
+    if _nlp_engine is None:
+        with _engine_lock:
+            if _nlp_engine is None:
+                from presidio_analyzer.nlp_engine import NlpEngineProvider
+                _nlp_engine = NlpEngineProvider().create_engine()
+    return _nlp_engine
+
+
+def get_analyzer(recognizers: Optional[List[str]] = None) -> "AnalyzerEngine":
+    """
+    Return the process-wide AnalyzerEngine, building it on first use.
+
+    Args:
+        recognizers (List[str], optional): Restrict the registry to these
+            recognizer names. All custom and predefined recognizers are loaded
+            when not given. Each distinct set gets its own engine; all
+            engines share the NlpEngine of get_nlp_engine().
+
+    Raises:
+        ValueError: If a recognizer name is not supported.
+
+    Returns:
+        AnalyzerEngine: Shared, fully loaded analyzer.
+    """
+    key = _recognizer_key(recognizers)
+    analyzer = _analyzers.get(key)
+    if analyzer is not None:
+        return analyzer
+
+    with _engine_lock:
+        analyzer = _analyzers.get(key)
+        if analyzer is None:
+            from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+            from ai_watchdog.resources.registry_loader import load_all_recognizers_from_resources
+
+            nlp_engine = get_nlp_engine()
+            if key is None:
+                analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
+            else:
+                registry = RecognizerRegistry(supported_languages=["en"])
+                analyzer = AnalyzerEngine(registry=registry, nlp_engine=nlp_engine)
+            analyzer = load_all_recognizers_from_resources(analyzer, recognizer_names=key)
+            _analyzers[key] = analyzer
+    return analyzer
+
+
+def get_anonymizer() -> "AnonymizerEngine":
+    """
+    Return the process-wide AnonymizerEngine, building it on first use.
+    """
+    global _anonymizer
+    if _anonymizer is None:
+        with _engine_lock:
+            if _anonymizer is None:
+                from presidio_anonymizer import AnonymizerEngine
+                _anonymizer = AnonymizerEngine()
+    return _anonymizer
+
+
+def stream_supported(mode: str = "block", **params) -> bool:
+    """
+    Only block mode can run over windows of a streamed response; redaction
+    needs the whole text.
+    """
+    return mode == "block"
+
+
+def warm_up(recognizers: Optional[List[str]] = None, entities: Optional[List[str]] = None) -> None:
+    """
+    Build the shared engines ahead of the first scan, e.g. at worker start-up.
+
+    Args:
+        recognizers (List[str], optional): Recognizer set to pre-load, as passed to run_logic_based_scan.
+        entities (List[str], optional): Entity types scanned for, as passed to run_logic_based_scan.
+    """
+    get_analyzer(_with_nlp_recognizer(recognizers, entities))
+    get_anonymizer()
+
+
+def run_logic_based_scan(
+    text: str,
+    mode: str = "block",
+    entities: Optional[List[str]] = None,
+    recognizers: Optional[List[str]] = None,
+) -> PIIDetectionResult:
     """
     Run Presidio PII detection with a choice to either block or redact.
 
     Args:
         text (str): Input text to scan.
         mode (str): Either 'block' or 'redact'. Defaults to 'block'.
+        entities (List[str], optional): Entity types to look for, e.g. ["EMAIL_ADDRESS"]. All when not given.
+        recognizers (List[str], optional): Restrict the recognizers loaded into the shared engine.
+            The NLP recognizer (SpacyRecognizer) is added when the entities need it.
 
     Returns:
         PIIDetectionResult: Object containing detection result, details, and optional sanitized text.
     """
 
-    analyzer = AnalyzerEngine()
-    analyzer = load_all_recognizers_from_resources(analyzer)
+    analyzer = get_analyzer(_with_nlp_recognizer(recognizers, entities))
 
     # Analyze
-    results = analyzer.analyze(text=text, entities=[], language="en")
+    results = analyzer.analyze(text=text, entities=entities or [], language="en")
 
     if not results:
         return PIIDetectionResult(
@@ -48,8 +179,7 @@ def run_logic_based_scan(text: str, mode: str = "block") -> PIIDetectionResult:
     pii_entities = [res.entity_type for res in results]
 
     if mode == "redact":
-        anonymizer = AnonymizerEngine()
-        anonymized = anonymizer.anonymize(text=text, analyzer_results=results)
+        anonymized = get_anonymizer().anonymize(text=text, analyzer_results=results)
         return PIIDetectionResult(
             result=True,
             details="PII detected and redacted successfully.",
@@ -63,5 +193,3 @@ def run_logic_based_scan(text: str, mode: str = "block") -> PIIDetectionResult:
             pii_found=pii_entities,
             sanitized_text=None,
         )
-
-
@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ai_watchdog.text_view import TextView
 
 class ReadingTimeOutput(BaseModel):
     result: bool = Field(..., description='Returns true if estimated reading time is within the allowed limit (passes scanner), false if limit exceeded')
@@ -10,12 +13,15 @@ DEFAULT_MODE = "logic"
 SCANNER_TYPE = ["output"]
 AVAILABLE_MODES = ["logic"]
 OUTPUT_MODEL = ReadingTimeOutput
+# Reads the word count from the shared TextView of the scan (see ai_watchdog.text_view)
+ACCEPTS_TEXT_VIEW = True
 
 
 def run_logic_based_scan(
     text: str,
     max_minutes: float = 5.0,
-    words_per_minute: int = 200
+    words_per_minute: int = 200,
+    text_view: Optional["TextView"] = None,
 ) -> ReadingTimeOutput:
     """
     Generic logic-based scanner that checks if the estimated reading time exceeds a given limit.
@@ -24,12 +30,13 @@ def run_logic_based_scan(
         text (str): The text to analyze.
         max_minutes (float): Maximum allowed reading time in minutes (default: 5.0).
         words_per_minute (int): Average reading speed in words per minute (default: 200).
+        text_view (TextView, optional): Shared view of the text, used for its word count.
     
     Returns:
         ReadingTimeOutput: Structured output with result and explanation.
     """
     # Count words
-    word_count = len(text.split())
+    word_count = text_view.word_count if text_view is not None else len(text.split())
 
     # Calculate estimated reading time in minutes
     estimated_time = word_count / words_per_minute
@@ -44,5 +51,3 @@ def run_logic_based_scan(
             result=False,
             details=f"Estimated reading time ({estimated_time:.2f} min) exceeds the allowed limit ({max_minutes} min)."
         )
-
-print(run_logic_based_scan("Enter your input here ...", max_minutes=1) )
\ No newline at end of file
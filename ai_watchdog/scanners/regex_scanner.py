@@ -1,43 +1,202 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
+from functools import lru_cache
+import importlib
 import re
+import time
+
+class RegexMatch(BaseModel):
+    pattern: str = Field(..., description='Pattern that matched')
+    start: int = Field(..., description='Start offset of the match in the text')
+    end: int = Field(..., description='End offset (exclusive) of the match in the text')
 
 class RegexScannerOutput(BaseModel):
-    result: bool = Field(..., description='True if regex pattern matched')
+    result: bool = Field(..., description='False if a blocked pattern matched (or, when not blocking, if no pattern matched)')
     details: Optional[str] = Field(None, description='Explanation of result')
     sanitized_text: Optional[str] = Field(None, description='Text with redacted patterns if applicable')
+    matched_patterns: List[str] = Field(default_factory=list, description='Every pattern that matched')
+    matches: List[RegexMatch] = Field(default_factory=list, description='Every match with its pattern and offsets')
 
 SCANNER_NAME = "regex_scanner"
 SCANNER_TYPE = ["input", "output"]
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
+# Can run incrementally over a sliding window of a streamed response (see streaming.py)
+STREAMABLE = True
 OUTPUT_MODEL = RegexScannerOutput
 
+# Regex engines: "re" (stdlib), "regex" (supports a match timeout) and
+# "re2" (google-re2, linear time, no backtracking)
+ENGINES = ("re", "regex", "re2")
+
+REDACTION = "[REDACTED]"
+
+# Backreferences change meaning once the patterns are renumbered inside one alternation
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=|\\g<")
+
+
+class _CompiledPatterns:
+    """
+    A pattern list compiled once for one engine.
+
+    When possible the patterns are also joined into a single alternation with
+    one named group per pattern. It only returns non-overlapping matches, so
+    it cannot report every match of every pattern, but a text it does not
+    match matches none of the patterns: clean text is decided in one pass and
+    only texts with a match are scanned pattern by pattern. Patterns that
+    cannot be combined (conflicting group names, backreferences, global
+    inline flags) are always scanned one by one.
+    """
+
+    def __init__(self, patterns, engine):
+        self.patterns = list(patterns)
+        self.engine = engine
+        self.module = importlib.import_module(engine)
+        self.combined = None
+        self.singles = None
+
+        if self.patterns and not any(_BACKREFERENCE.search(p) for p in self.patterns):
+            alternation = "|".join(f"(?P<_p{i}>{p})" for i, p in enumerate(self.patterns))
+            try:
+                self.combined = self.module.compile(alternation)
+            except Exception:
+                self.combined = None
+
+        self.singles = [self.module.compile(p) for p in self.patterns]
+
+    @staticmethod
+    def _options(deadline):
+        if deadline is None:
+            return {}
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("regex timeout")
+        return {"timeout": remaining}
+
+    def finditer(self, text, timeout=None):
+        """
+        Yield (pattern_index, start, end) for every match of every pattern,
+        including matches that overlap a match of another pattern. timeout
+        bounds the whole scan.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if self.combined is not None and self.combined.search(text, **self._options(deadline)) is None:
+            return
+
+        for index, compiled in enumerate(self.singles):
+            for match in compiled.finditer(text, **self._options(deadline)):
+                yield index, match.start(), match.end()
+
+
+def redact_spans(text: str, spans) -> str:
+    """
+    Replace the union of the (start, end) spans with REDACTION, so
+    overlapping matches of different patterns become one redaction.
+    """
+    pieces = []
+    position = 0
+    merged_end = -1
+    for start, end in sorted(spans):
+        if end <= start:
+            continue
+        if start < merged_end:
+            merged_end = max(merged_end, end)
+            continue
+        if merged_end >= 0:
+            pieces.append(REDACTION)
+            position = merged_end
+        pieces.append(text[position:start])
+        merged_end = end
+    if merged_end >= 0:
+        pieces.append(REDACTION)
+        position = merged_end
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def stream_supported(is_blocked: bool = True, redact: bool = False, **params) -> bool:
+    """
+    Only a block-list can be decided from a window of a streamed response;
+    allow-lists and redaction need the whole text.
+    """
+    return is_blocked and not redact
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple, engine: str) -> _CompiledPatterns:
+    return _CompiledPatterns(patterns, engine)
+
+
 def run_logic_based_scan(
     text: str,
     patterns: list[str],
     is_blocked: bool = True,
-    redact: bool = False
+    redact: bool = False,
+    engine: str = "re",
+    timeout: Optional[float] = None,
 ):
-    sanitized_text = text
-    for pattern in patterns:
-        if re.search(pattern, text):
-            if redact:
-                sanitized_text = re.sub(pattern, "[REDACTED]", sanitized_text)
-            return RegexScannerOutput(
-                result=True,
-                details=f"Pattern matched: {pattern}",
-                sanitized_text=sanitized_text if redact else None
-            )
-    # no match
+    """
+    Scan text against a list of regex patterns.
+
+    Patterns are compiled once per (pattern list, engine) and cached. Text
+    that matches no pattern is rejected in a single pass over one combined
+    pattern. Otherwise every matching pattern is reported with its spans,
+    also where matches of different patterns overlap, and redaction covers
+    the union of all of them.
+
+    Args:
+        text (str): The text to scan.
+        patterns (list[str]): Regex patterns to look for.
+        is_blocked (bool): If True, a match is a violation. If False, the text
+            must match at least one pattern to pass.
+        redact (bool): Replace every match with "[REDACTED]" and let the text pass.
+        engine (str): "re", "regex" or "re2". "re2" guarantees linear-time matching.
+        timeout (float, optional): Abort matching after this many seconds and
+            fail the check. Requires the "regex" engine, which is selected
+            automatically when engine is "re".
+
+    Returns:
+        RegexScannerOutput: Structured output with result, matches and optional sanitized text.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unsupported regex engine: {engine}")
+    if timeout is not None and engine == "re":
+        engine = "regex"
+    if timeout is not None and engine != "regex":
+        raise ValueError(f"Match timeout is not supported by the '{engine}' engine")
+
+    compiled = _compile_patterns(tuple(patterns), engine)
+
+    try:
+        matches = sorted(
+            (start, end, index) for index, start, end in compiled.finditer(text, timeout)
+        )
+        sanitized_text = redact_spans(text, [(start, end) for start, end, _ in matches]) if redact else text
+    except TimeoutError:
+        return RegexScannerOutput(
+            result=False,
+            details=f"Pattern matching timed out after {timeout}s",
+            sanitized_text=None,
+        )
+
+    matched_indexes = {index for _, _, index in matches}
+    matched_patterns = [p for i, p in enumerate(patterns) if i in matched_indexes]
+    match_models = [
+        RegexMatch(pattern=patterns[index], start=start, end=end)
+        for start, end, index in matches
+    ]
+
+    if matched_patterns:
+        details = f"Pattern matched: {', '.join(matched_patterns)}"
+        result = redact or not is_blocked
+    else:
+        details = "No patterns matched"
+        result = is_blocked
+
     return RegexScannerOutput(
-        result=False,
-        details="No patterns matched",
-        sanitized_text=sanitized_text if redact else None
+        result=result,
+        details=details,
+        sanitized_text=sanitized_text if redact else None,
+        matched_patterns=matched_patterns,
+        matches=match_models,
     )
-
-print(run_logic_based_scan(
-    "This is a test text with a badword.",
-    ["badword", "anotherbadword"],
-    is_blocked=True
-))
@@ -1,7 +1,7 @@
-from detect_secrets.core.secrets_collection import SecretsCollection
-from detect_secrets.settings import transient_settings
-import tempfile
-import os
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Optional
+import re
 from pydantic import BaseModel
 
 
@@ -12,18 +12,150 @@ class DetectSecretsResult(BaseModel):
 
 
 SCANNER_NAME = "secrets_detection"
-SCANNER_TYPE = ["input"]
+SCANNER_TYPE = ["input", "output"]
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
+# Can run incrementally over a sliding window of a streamed response (see streaming.py)
+STREAMABLE = True
+# Pure-Python CPU work: run in the process pool when it is enabled (see process_pool.py)
+DEFAULT_EXECUTION = "process"
 OUTPUT_MODEL = DetectSecretsResult
 
 
-def run_logic_based_scan(text: str) -> DetectSecretsResult:
+# Default plugin config, in detect-secrets' "plugins_used" format
+DEFAULT_PLUGINS = [
+    {"name": "AWSKeyDetector"},
+    {"name": "SlackDetector"},
+    {"name": "PrivateKeyDetector"},
+    {"name": "BasicAuthDetector"},
+    {"name": "JwtTokenDetector"},
+    {"name": "StripeDetector"},
+    {"name": "NpmDetector"},
+    {"name": "ArtifactoryDetector"},
+    {"name": "GitHubTokenDetector"},
+    {"name": "GitLabTokenDetector"},
+    {"name": "Base64HighEntropyString", "limit": 4.5},
+    {"name": "HexHighEntropyString", "limit": 3.0},
+    {"name": "DiscordBotTokenDetector"},
+    {"name": "CloudantDetector"},
+    {"name": "IbmCloudIamDetector"},
+    {"name": "IbmCosHmacDetector"},
+    {"name": "MailchimpDetector"},
+    {"name": "SquareOAuthDetector"},
+    {"name": "SoftlayerDetector"},
+    {"name": "TelegramBotTokenDetector"},
+    {"name": "TwilioKeyDetector"},
+]
+
+# Name reported to the plugins in place of a real file
+_ADHOC_FILENAME = "adhoc-string-scan"
+
+_LINE_SPLIT = re.compile(r"\r\n?|\n")
+
+
+@lru_cache(maxsize=None)
+def _detect_secrets():
+    """
+    Import the parts of detect-secrets the scanner uses, on first use.
+    Importing them loads every plugin module, which is too slow for import time.
+    """
+    from detect_secrets.core.plugins.util import get_mapping_from_secret_type_to_class
+    from detect_secrets.filters import heuristic
+    from detect_secrets.filters.allowlist import is_line_allowlisted
+    from detect_secrets.util.code_snippet import get_code_snippet
+
+    return SimpleNamespace(
+        get_mapping_from_secret_type_to_class=get_mapping_from_secret_type_to_class,
+        heuristic=heuristic,
+        is_line_allowlisted=is_line_allowlisted,
+        get_code_snippet=get_code_snippet,
+    )
+
+
+def _plugin_key(plugins):
+    """
+    Normalize a plugin list (names or {"name": ..., **kwargs} dicts) into a hashable key.
+    """
+    key = []
+    for plugin in plugins:
+        if isinstance(plugin, str):
+            plugin = {"name": plugin}
+        options = tuple(sorted((k, v) for k, v in plugin.items() if k != "name"))
+        key.append((plugin["name"], options))
+    return tuple(key)
+
+
+@lru_cache(maxsize=32)
+def _build_plugins(plugin_key):
+    """
+    Instantiate detect-secrets plugins once per plugin configuration.
+    """
+    classes = {cls.__name__: cls for cls in _detect_secrets().get_mapping_from_secret_type_to_class().values()}
+    plugins = []
+    for name, options in plugin_key:
+        if name not in classes:
+            raise ValueError(f"Unknown detect-secrets plugin: {name}")
+        plugins.append(classes[name](**dict(options)))
+    return tuple(plugins)
+
+
+def _is_filtered_secret(secret, line, plugin):
+    """
+    Apply detect-secrets' default false-positive heuristics to one finding.
+    """
+    heuristic = _detect_secrets().heuristic
+    return (
+        heuristic.is_sequential_string(secret)
+        or heuristic.is_likely_id_string(secret, line, plugin)
+        or heuristic.is_not_alphanumeric_string(secret)
+        or heuristic.is_potential_uuid(secret)
+        or heuristic.is_prefixed_with_dollar_sign(secret)
+        or heuristic.is_templated_secret(secret)
+    )
+
+
+def _scan_lines(text, plugins):
+    """
+    Yield (secret_type, secret_value) findings for every line of text, mirroring
+    what SecretsCollection.scan_file reports for the same content.
+    """
+    ds = _detect_secrets()
+    lines = _LINE_SPLIT.split(text)
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip()
+        if not line:
+            continue
+
+        context = ds.get_code_snippet(lines=lines, line_number=line_number)
+        if (
+            ds.is_line_allowlisted(_ADHOC_FILENAME, line, context)
+            or ds.heuristic.is_indirect_reference(line)
+        ):
+            continue
+
+        for plugin in plugins:
+            for secret in plugin.analyze_line(
+                filename=_ADHOC_FILENAME,
+                line=line,
+                line_number=line_number,
+                context=context,
+            ):
+                value = secret.secret_value
+                if value and not _is_filtered_secret(value, line, plugin):
+                    yield secret.type, value
+
+
+def run_logic_based_scan(text: str, plugins: Optional[List] = None) -> DetectSecretsResult:
     """
     Scans the given text for potential secrets using detect-secrets.
 
+    The text is scanned line by line straight from memory with plugin
+    instances that are built once per plugin configuration and reused.
+
     Args:
         text (str): The text content to scan.
+        plugins (list, optional): detect-secrets plugins to use, as names or
+            {"name": ..., **options} dicts. Defaults to DEFAULT_PLUGINS.
 
     Returns:
         DetectSecretsResult: Pydantic model with scan result and details.
@@ -35,60 +167,21 @@ def run_logic_based_scan(text: str) -> DetectSecretsResult:
             secrets_found=[],
         )
 
-    # Default plugin config can be customized here if needed
-    default_detect_secrets_config = {
-        "plugins_used": [
-            {"name": "AWSKeyDetector"},
-            {"name": "SlackDetector"},
-            {"name": "PrivateKeyDetector"},
-            {"name": "BasicAuthDetector"},
-            {"name": "JwtTokenDetector"},
-            {"name": "StripeDetector"},
-            {"name": "NpmDetector"},
-            {"name": "ArtifactoryDetector"},
-            {"name": "GitHubTokenDetector"},
-            {"name": "GitLabTokenDetector"},
-            {"name": "Base64HighEntropyString", "limit": 4.5},
-            {"name": "HexHighEntropyString", "limit": 3.0},
-            {"name": "DiscordBotTokenDetector"},
-            {"name": "CloudantDetector"},
-            {"name": "IbmCloudIamDetector"},
-            {"name": "IbmCosHmacDetector"},
-            {"name": "MailchimpDetector"},
-            {"name": "SquareOAuthDetector"},
-            {"name": "SoftlayerDetector"},
-            {"name": "TelegramBotTokenDetector"},
-            {"name": "TwilioKeyDetector"},
-        ]
-    }
-
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
-    try:
-        temp_file.write(text.encode("utf-8"))
-        temp_file.close()
-
-        secrets = SecretsCollection()
-        with transient_settings(default_detect_secrets_config):
-            secrets.scan_file(temp_file.name)
-
-        all_secrets = []
-        for file in secrets.files:
-            for secret in secrets[file]:
-                if secret.secret_value:
-                    all_secrets.append(secret.secret_value)
-
-        if all_secrets:
-            return DetectSecretsResult(
-                result=False,
-                details="Potential secrets detected in the provided text.",
-                secrets_found=all_secrets,
-            )
+    plugin_instances = _build_plugins(_plugin_key(plugins if plugins is not None else DEFAULT_PLUGINS))
 
+    # Like SecretsCollection, a secret of a given type is reported once
+    findings = dict.fromkeys(_scan_lines(text, plugin_instances))
+    all_secrets = [value for _, value in findings]
+
+    if all_secrets:
         return DetectSecretsResult(
-            result=True,
-            details="No secrets detected in the provided text.",
-            secrets_found=[],
+            result=False,
+            details="Potential secrets detected in the provided text.",
+            secrets_found=all_secrets,
         )
 
-    finally:
-        os.remove(temp_file.name)
+    return DetectSecretsResult(
+        result=True,
+        details="No secrets detected in the provided text.",
+        secrets_found=[],
+    )
@@ -1,35 +1,109 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, List
+import threading
+
+if TYPE_CHECKING:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 class SentimentAanalysisOutput(BaseModel):
     result: bool = Field(..., description='Returns true if sentiment is positive, false if the sentiment is negative')
     details: Optional[str] = Field(None, description='Single line explanation')
+    compound: Optional[float] = Field(None, description='Raw VADER compound score in [-1, 1]')
 
 SCANNER_NAME = "sentiment_scanner"
 DEFAULT_MODE = "logic"
 SCANNER_TYPE = ["input", "output"]
 AVAILABLE_MODES = ["logic"]
+# Pure-Python CPU work: run in the process pool when it is enabled (see process_pool.py)
+DEFAULT_EXECUTION = "process"
 OUTPUT_MODEL = SentimentAanalysisOutput
 
-def run_logic_based_scan(
-    text: str
-) :
-    sid_object = SentimentIntensityAnalyzer()
-    sentiment_dict = sid_object.polarity_scores(text)
-    if sentiment_dict['compound'] >= 0.05:
+# Loading the VADER lexicon and emoji files costs far more than scoring, so
+# one analyzer is shared by every scan. polarity_scores() does not mutate it.
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> "SentimentIntensityAnalyzer":
+    """
+    Return the process-wide VADER analyzer, importing VADER and building it on first use.
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def warm_up() -> None:
+    """
+    Load the VADER lexicon ahead of the first scan.
+    """
+    get_analyzer()
+
+
+def _to_output(compound: float, positive_threshold: float, negative_threshold: float) -> SentimentAanalysisOutput:
+    if compound >= positive_threshold:
         return SentimentAanalysisOutput(
             result=True,
-            details="The overall sentiment of the text is positive."
+            details="The overall sentiment of the text is positive.",
+            compound=compound,
         )
 
-    elif sentiment_dict['compound'] <= -0.05:
+    elif compound <= negative_threshold:
         return SentimentAanalysisOutput(
             result=False,
-            details="The overall sentiment of the text is negative."
+            details="The overall sentiment of the text is negative.",
+            compound=compound,
         )
     else:
         return SentimentAanalysisOutput(
             result=True,
-            details="The overall sentiment of the text is neutral."
+            details="The overall sentiment of the text is neutral.",
+            compound=compound,
         )
+
+
+def run_logic_based_scan(
+    text: str,
+    positive_threshold: float = 0.05,
+    negative_threshold: float = -0.05,
+) -> SentimentAanalysisOutput:
+    """
+    Score the sentiment of a text with VADER. Only negative sentiment fails.
+
+    Args:
+        text (str): The text to analyze.
+        positive_threshold (float): Compound score at or above which the text is positive (default: 0.05).
+        negative_threshold (float): Compound score at or below which the text is negative (default: -0.05).
+
+    Returns:
+        SentimentAanalysisOutput: Result, explanation and the raw compound score.
+    """
+    compound = get_analyzer().polarity_scores(text)['compound']
+    return _to_output(compound, positive_threshold, negative_threshold)
+
+
+def run_logic_based_batch_scan(
+    texts: List[str],
+    positive_threshold: float = 0.05,
+    negative_threshold: float = -0.05,
+) -> List[SentimentAanalysisOutput]:
+    """
+    Score many texts in one pass with the shared analyzer.
+
+    Args:
+        texts (List[str]): Texts to analyze.
+        positive_threshold (float): See run_logic_based_scan.
+        negative_threshold (float): See run_logic_based_scan.
+
+    Returns:
+        List[SentimentAanalysisOutput]: One result per text, in order.
+    """
+    polarity_scores = get_analyzer().polarity_scores
+    return [
+        _to_output(polarity_scores(text)['compound'], positive_threshold, negative_threshold)
+        for text in texts
+    ]
@@ -1,7 +1,17 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
-import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, List
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit, urlunsplit
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from ai_watchdog.cache import TTLCache
+# URL_PATTERN stays importable from here
+from ai_watchdog.text_view import URL_PATTERN, extract_urls as _extract_urls
+
+if TYPE_CHECKING:
+    from ai_watchdog.text_view import TextView
 
 class UrlReachabilityOutput(BaseModel):
     result: bool = Field(..., description='Returns true if all detected URLs are reachable, false if any are broken or unreachable')
@@ -13,29 +23,141 @@ SCANNER_TYPE = ["output"]
 DEFAULT_MODE = "logic"
 AVAILABLE_MODES = ["logic"]
 OUTPUT_MODEL = UrlReachabilityOutput
+# Reads the extracted URLs from the shared TextView of the scan (see ai_watchdog.text_view)
+ACCEPTS_TEXT_VIEW = True
+
+# Threads shared by every scan for probing URLs concurrently
+MAX_WORKERS = 16
+
+# Connections kept alive per host
+POOL_SIZE = 8
+
+# Hosts whose pooled session is kept; the least recently used one is closed beyond this
+MAX_SESSIONS = 64
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Recent verdicts keyed by normalized URL: True if reachable
+_verdicts = TTLCache(max_size=4096)
+
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _sessions_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="watchdog-url")
+    return _executor
+
+
+def _get_session(host_key):
+    """
+    Return the pooled session for a scheme://host:port, creating it on first
+    use. At most MAX_SESSIONS sessions are kept; the least recently used one
+    is closed to make room.
+    """
+    evicted = []
+    with _sessions_lock:
+        session = _sessions.get(host_key)
+        if session is not None:
+            _sessions.move_to_end(host_key)
+            return session
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions[host_key] = session
+        while len(_sessions) > MAX_SESSIONS:
+            evicted.append(_sessions.popitem(last=False)[1])
+    for old_session in evicted:
+        # Closes its idle connections; one still in use by a probe is closed once released
+        old_session.close()
+    return session
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for caching: lowercase scheme and host, drop the default
+    port and the fragment.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def extract_urls(text: str, max_urls: int = 10) -> List[str]:
+    """
+    Extract up to max_urls distinct URLs from text, without trailing punctuation.
+    """
+    return _extract_urls(text, max_urls)
+
+
+def _probe(url: str, timeout: float) -> bool:
+    """
+    Send a HEAD request through the host's pooled session.
+    """
+    parts = urlsplit(url)
+    try:
+        session = _get_session(f"{parts.scheme}://{parts.netloc}".lower())
+        response = session.head(url, allow_redirects=True, timeout=timeout)
+        return response.status_code < 400
+    except Exception:
+        return False
+
+
+def clear_cache() -> None:
+    """
+    Forget every cached reachability verdict.
+    """
+    _verdicts.clear()
 
 
 def run_logic_based_scan(
     text: str,
     timeout: int = 5,
-    max_urls: int = 10
+    max_urls: int = 10,
+    deadline: Optional[float] = None,
+    cache_ttl: Optional[float] = 300,
+    text_view: Optional["TextView"] = None,
 ) -> UrlReachabilityOutput:
     """
     Logic-based scanner that checks whether URLs in the text are reachable.
     Sends HEAD requests to avoid downloading full pages.
 
+    URLs are probed concurrently over pooled per-host sessions, and recent
+    verdicts are cached by normalized URL so popular links are not re-probed
+    on every response.
+
     Args:
         text (str): Text to analyze for URLs.
         timeout (int): Timeout for each URL request in seconds (default: 5).
         max_urls (int): Max number of URLs to check to avoid excessive requests (default: 10).
+        deadline (float, optional): Overall time budget for the scanner in
+            seconds. URLs still being probed when it runs out count as unreachable.
+        cache_ttl (float, optional): Seconds to remember a verdict (default: 300).
+            None or 0 disables the cache.
+        text_view (TextView, optional): Shared view of the text, whose URLs are reused.
 
     Returns:
         UrlReachabilityOutput: Structured output with result, details, and list of unreachable URLs.
     """
     # Extract URLs from text
-    url_pattern = re.compile(r'https?://[^\s]+')
-    urls = url_pattern.findall(text)
-    urls_to_check = urls[:max_urls]
+    if text_view is not None:
+        urls_to_check = text_view.urls[:max_urls]
+    else:
+        urls_to_check = extract_urls(text, max_urls)
 
     if not urls_to_check:
         return UrlReachabilityOutput(
@@ -44,14 +166,35 @@ def run_logic_based_scan(
             unreachable_urls=[]
         )
 
-    unreachable = []
-    for url in urls_to_check:
-        try:
-            response = requests.head(url, allow_redirects=True, timeout=timeout)
-            if response.status_code >= 400:
-                unreachable.append(url)
-        except Exception:
-            unreachable.append(url)
+    # URLs that normalize to the same key (e.g. differing only in the
+    # fragment) are probed once and share the verdict
+    keys = {url: normalize_url(url) for url in urls_to_check}
+    verdicts = {}
+    pending = {}
+    executor = _get_executor()
+    for url, key in keys.items():
+        if key in verdicts or key in pending:
+            continue
+        cached = _verdicts.get(key) if cache_ttl else None
+        if cached is not None:
+            verdicts[key] = cached
+        else:
+            pending[key] = executor.submit(_probe, url, timeout)
+
+    if pending:
+        done, _ = wait(pending.values(), timeout=deadline)
+        for key, future in pending.items():
+            if future in done:
+                verdicts[key] = future.result()
+                if cache_ttl:
+                    _verdicts.set(key, verdicts[key], ttl=cache_ttl)
+            else:
+                # Out of time. Probes still queued are dropped so they do not hold up
+                # later scans; a probe already running ends within its timeout
+                future.cancel()
+                verdicts[key] = False
+
+    unreachable = [url for url in urls_to_check if not verdicts[keys[url]]]
 
     if unreachable:
         return UrlReachabilityOutput(
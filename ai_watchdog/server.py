@@ -0,0 +1,430 @@
+"""
+ASGI guardrail service.
+
+Serves InputWatchdog and OutputWatchdog over HTTP with one shared LLM client
+and warm, compiled scanner plans. Concurrent requests that use the same
+scanner config are grouped into micro-batches and scanned through the
+provider batch path (ascan_many).
+
+Run it with any ASGI server, e.g.:
+
+    AI_WATCHDOG_PROVIDER=openai AI_WATCHDOG_MODEL=gpt-4o-mini AI_WATCHDOG_API_KEY=... \\
+        uvicorn ai_watchdog.server:create_app --factory
+
+Endpoints:
+    POST /scan/input    {"text": "...", "scanners": [...]} -> unified scan result
+    POST /scan/output   same, for LLM responses
+    GET  /health        liveness: 200 while the process serves requests
+    GET  /ready         readiness: 503 while starting, draining or at the queue limit
+
+A request that would push the queue past max_queue_depth is rejected with
+429 and a Retry-After header instead of being queued.
+"""
+import asyncio
+import json
+import os
+from typing import Optional
+
+from .cache import resolve_cache
+from .core import InputWatchdog, OutputWatchdog
+from .exceptions import QueueFullError, WatchdogError
+from .scan_result import ScanResult
+
+# Seconds a micro-batch waits for more requests after its first one
+DEFAULT_BATCH_WINDOW = 0.01
+
+# Texts per micro-batch; a full batch is dispatched without waiting for the window
+DEFAULT_MAX_BATCH_SIZE = 32
+
+# Texts queued or being scanned before new requests are rejected with 429
+DEFAULT_MAX_QUEUE_DEPTH = 1024
+
+# Largest accepted request body
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+
+# Seconds clients are asked to wait after a 429
+RETRY_AFTER_SECONDS = 1
+
+
+class _Batch:
+    __slots__ = ("plan", "items", "timer")
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.items = []   # (text, future)
+        self.timer = None
+
+
+class MicroBatcher:
+    """
+    Groups concurrent scans that share a compiled plan into micro-batches.
+
+    The first text submitted for a plan opens a batch; the batch is
+    dispatched through watchdog.ascan_many once `window` seconds have passed
+    or it holds `max_batch_size` texts, whichever comes first. Every caller
+    gets its own result from the batch. Must be used from one event loop.
+
+    Args:
+        watchdog: The InputWatchdog or OutputWatchdog that scans the batches.
+        window (float): Seconds to wait for more texts after the first one.
+        max_batch_size (int): Texts per batch.
+        max_queue_depth (int): Texts queued or in flight before submit()
+            raises QueueFullError.
+        max_concurrency (int, optional): Maximum LLM calls in flight per batch.
+    """
+
+    def __init__(
+        self,
+        watchdog,
+        window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.watchdog = watchdog
+        self.window = window
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_queue_depth = max_queue_depth
+        self.max_concurrency = max_concurrency
+        self.depth = 0
+        self.batches_dispatched = 0
+        self.texts_dispatched = 0
+        self._pending = {}     # plan -> _Batch
+        self._inflight = set() # dispatch tasks
+
+    @property
+    def saturated(self):
+        return self.depth >= self.max_queue_depth
+
+    async def submit(self, text, plan):
+        """
+        Queue one text for the next batch of its plan and wait for its result.
+
+        Raises:
+            QueueFullError: If the queue is at max_queue_depth.
+        """
+        if self.saturated:
+            raise QueueFullError(self.depth, self.max_queue_depth)
+
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(plan)
+        if batch is None:
+            batch = self._pending[plan] = _Batch(plan)
+            batch.timer = loop.call_later(self.window, self._flush, plan)
+
+        future = loop.create_future()
+        batch.items.append((text, future))
+        self.depth += 1
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(plan)
+        return await future
+
+    def _flush(self, plan):
+        batch = self._pending.pop(plan, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        # Callers that went away before dispatch are not scanned
+        items = [(text, future) for text, future in batch.items if not future.done()]
+        try:
+            if items:
+                results = await self.watchdog.ascan_many(
+                    [text for text, _ in items], batch.plan, self.max_concurrency
+                )
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+                self.batches_dispatched += 1
+                self.texts_dispatched += len(items)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.depth -= len(batch.items)
+
+    async def drain(self):
+        """
+        Dispatch every open batch now and wait until all batches are done.
+        """
+        for plan in list(self._pending):
+            self._flush(plan)
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def stats(self):
+        return {
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_queue_depth,
+            "open_batches": len(self._pending),
+            "inflight_batches": len(self._inflight),
+            "batches_dispatched": self.batches_dispatched,
+            "texts_dispatched": self.texts_dispatched,
+        }
+
+
+class _BadRequest(Exception):
+    pass
+
+
+def _error_body(error_type, message):
+    return {"error": {"type": error_type, "message": message}}
+
+
+class GuardrailApp:
+    """
+    The ASGI application. See the module docstring for the endpoints.
+
+    Args:
+        input_watchdog (InputWatchdog): Scans /scan/input requests.
+        output_watchdog (OutputWatchdog): Scans /scan/output requests.
+        batch_window (float): See MicroBatcher.
+        max_batch_size (int): See MicroBatcher.
+        max_queue_depth (int): Queue limit of each endpoint.
+        max_concurrency (int, optional): See MicroBatcher.
+        warm_configs (dict, optional): {"input": [...], "output": [...]}
+            scanner configs compiled and warmed up at startup.
+        max_body_bytes (int): Largest accepted request body.
+    """
+
+    def __init__(
+        self,
+        input_watchdog,
+        output_watchdog,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        max_concurrency: Optional[int] = None,
+        warm_configs: Optional[dict] = None,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
+        self.watchdogs = {"input": input_watchdog, "output": output_watchdog}
+        self.batchers = {
+            scan_type: MicroBatcher(watchdog, batch_window, max_batch_size, max_queue_depth, max_concurrency)
+            for scan_type, watchdog in self.watchdogs.items()
+        }
+        self.warm_configs = warm_configs or {}
+        self.max_body_bytes = max_body_bytes
+        # "starting" only while the lifespan startup warms up; servers
+        # without lifespan support start out ready
+        self.state = "ready"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    # --- Lifespan ---
+
+    async def startup(self):
+        """
+        Compile and warm up the configured scanner plans.
+        """
+        self.state = "starting"
+        loop = asyncio.get_running_loop()
+        for scan_type, configs in self.warm_configs.items():
+            watchdog = self.watchdogs[scan_type]
+            for config in configs:
+                plan = await loop.run_in_executor(None, watchdog.compile, config)
+                await loop.run_in_executor(None, plan.warm_up)
+        self.state = "ready"
+
+    async def shutdown(self):
+        """
+        Stop accepting scans and finish the queued ones.
+        """
+        self.state = "draining"
+        await asyncio.gather(*(batcher.drain() for batcher in self.batchers.values()))
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # --- HTTP ---
+
+    async def _http(self, scope, receive, send):
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+
+        if path == "/health":
+            if method != "GET":
+                return await _send_json(send, 405, _error_body("MethodNotAllowed", "Use GET"))
+            return await _send_json(send, 200, {"status": "ok"})
+
+        if path == "/ready":
+            if method != "GET":
+                return await _send_json(send, 405, _error_body("MethodNotAllowed", "Use GET"))
+            return await self._ready(send)
+
+        if path in ("/scan/input", "/scan/output"):
+            if method != "POST":
+                return await _send_json(send, 405, _error_body("MethodNotAllowed", "Use POST"))
+            return await self._scan(path.rsplit("/", 1)[1], receive, send)
+
+        await _send_json(send, 404, _error_body("NotFound", f"No route for {path}"))
+
+    async def _ready(self, send):
+        saturated = [t for t, batcher in self.batchers.items() if batcher.saturated]
+        status = self.state if self.state != "ready" else ("saturated" if saturated else "ready")
+        body = {
+            "status": status,
+            "llm": self.watchdogs["input"].llm is not None,
+            "queues": {t: batcher.stats() for t, batcher in self.batchers.items()},
+        }
+        await _send_json(send, 200 if status == "ready" else 503, body)
+
+    async def _scan(self, scan_type, receive, send):
+        if self.state != "ready":
+            return await _send_json(send, 503, _error_body("Unavailable", f"Service is {self.state}"))
+
+        try:
+            text, scanners = await self._read_request(receive)
+        except _BadRequest as e:
+            status, message = e.args
+            return await _send_json(send, status, _error_body("BadRequest", message))
+
+        watchdog = self.watchdogs[scan_type]
+        try:
+            # Compiling imports scanner modules the first time a config is seen
+            plan = await asyncio.get_running_loop().run_in_executor(None, watchdog.compile, scanners)
+        except (WatchdogError, ValueError, TypeError) as e:
+            # Unknown scanners, bad or missing params, unusable execution modes
+            message = e.message if isinstance(e, WatchdogError) else str(e)
+            return await _send_json(send, 400, _error_body(type(e).__name__, message))
+
+        try:
+            result = await self.batchers[scan_type].submit(text, plan)
+        except QueueFullError as e:
+            return await _send_json(
+                send, 429, _error_body(type(e).__name__, e.message),
+                headers=[(b"retry-after", str(RETRY_AFTER_SECONDS).encode())],
+            )
+        except Exception as e:
+            message = e.message if isinstance(e, WatchdogError) else str(e)
+            return await _send_json(send, 500, _error_body(type(e).__name__, message))
+
+        await _send_json(send, 200, result)
+
+    async def _read_request(self, receive):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _BadRequest(400, "Client disconnected")
+            body += message.get("body", b"")
+            if len(body) > self.max_body_bytes:
+                raise _BadRequest(413, f"Request body is larger than {self.max_body_bytes} bytes")
+            if not message.get("more_body"):
+                break
+
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise _BadRequest(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise _BadRequest(400, "Request body must be a JSON object")
+
+        text = payload.get("text")
+        scanners = payload.get("scanners")
+        if not isinstance(text, str):
+            raise _BadRequest(400, "'text' must be a string")
+        if not isinstance(scanners, list) or not all(isinstance(c, dict) for c in scanners):
+            raise _BadRequest(400, "'scanners' must be a list of scanner configs")
+        return text, scanners
+
+
+async def _send_json(send, status, payload, headers=()):
+    if isinstance(payload, ScanResult):
+        # Serialized straight from the scanner models, see scan_result.py
+        body = payload.to_json()
+    else:
+        body = json.dumps(payload, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    cache=None,
+    fail_fast: bool = False,
+    long_text=None,
+    batch_window: float = DEFAULT_BATCH_WINDOW,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+    max_concurrency: Optional[int] = None,
+    warm_configs: Optional[dict] = None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+):
+    """
+    Build the guardrail ASGI app.
+
+    provider, model and api_key default to the AI_WATCHDOG_PROVIDER,
+    AI_WATCHDOG_MODEL and AI_WATCHDOG_API_KEY environment variables, so the
+    factory can be served as is (uvicorn --factory). Both endpoints share one
+    LLM client and one verdict cache.
+
+    Args:
+        provider (str, optional): LLM provider name.
+        model (str, optional): Model name.
+        api_key (str, optional): Provider API key.
+        cache (optional): Verdict cache, as accepted by the watchdogs.
+        fail_fast (bool): Scan in cascade mode (see core.run()).
+        long_text (LongTextMode | bool, optional): Window long texts (see core.run()).
+        batch_window (float): Seconds a micro-batch waits for more requests.
+        max_batch_size (int): Texts per micro-batch.
+        max_queue_depth (int): Texts queued per endpoint before requests get 429.
+        max_concurrency (int, optional): Maximum LLM calls in flight per batch.
+        warm_configs (dict, optional): {"input": [...], "output": [...]}
+            scanner configs to compile and warm up at startup.
+        max_body_bytes (int): Largest accepted request body.
+
+    Returns:
+        GuardrailApp: The ASGI application.
+    """
+    provider = provider or os.environ.get("AI_WATCHDOG_PROVIDER")
+    model = model or os.environ.get("AI_WATCHDOG_MODEL")
+    api_key = api_key or os.environ.get("AI_WATCHDOG_API_KEY")
+
+    cache = resolve_cache(cache)
+    input_watchdog = InputWatchdog(provider, model, api_key, cache, fail_fast, long_text, result_format="object")
+    output_watchdog = OutputWatchdog(cache=cache, fail_fast=fail_fast, long_text=long_text, result_format="object")
+    # One client for both endpoints
+    output_watchdog.llm = input_watchdog.llm
+
+    return GuardrailApp(
+        input_watchdog,
+        output_watchdog,
+        batch_window=batch_window,
+        max_batch_size=max_batch_size,
+        max_queue_depth=max_queue_depth,
+        max_concurrency=max_concurrency,
+        warm_configs=warm_configs,
+        max_body_bytes=max_body_bytes,
+    )
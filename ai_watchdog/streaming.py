@@ -0,0 +1,297 @@
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import threading
+from .text_view import TextView
+from .scan_result import ScanResult
+
+# Characters of already-scanned text re-scanned with each new window, so a
+# match that spans two chunks is still seen whole. Streamed text is held back
+# by this many characters until it has been scanned with its right context.
+STREAM_OVERLAP = 128
+
+# New characters to accumulate before the incremental scanners run again
+STREAM_SCAN_EVERY = 64
+
+# Characters between two LLM checkpoints
+STREAM_CHECKPOINT_CHARS = 2000
+
+# Threads running LLM checkpoints in the background
+MAX_CHECKPOINT_WORKERS = 8
+
+_checkpoint_executor = None
+_checkpoint_executor_lock = threading.Lock()
+
+
+def _get_checkpoint_executor():
+    global _checkpoint_executor
+    if _checkpoint_executor is None:
+        with _checkpoint_executor_lock:
+            if _checkpoint_executor is None:
+                _checkpoint_executor = ThreadPoolExecutor(
+                    max_workers=MAX_CHECKPOINT_WORKERS,
+                    thread_name_prefix="watchdog-stream",
+                )
+    return _checkpoint_executor
+
+
+def is_streamable(name, params=None):
+    """
+    Check whether a logic scanner can run incrementally over a sliding window.
+
+    A scanner opts in with a module-level STREAMABLE = True. It can refine
+    that per configuration with stream_supported(**params), e.g. a regex
+    scanner can only stream a block-list.
+    """
+    module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+    if not getattr(module, "STREAMABLE", False):
+        return False
+    supported = getattr(module, "stream_supported", None)
+    return supported(**(params or {})) if callable(supported) else True
+
+
+class OutputStream:
+    """
+    Scans an LLM response while it is being streamed.
+
+    Feed the response chunk by chunk; every call returns the text that is
+    safe to forward. Streamable logic scanners (see is_streamable) run over a
+    sliding window of the newest text plus `overlap` characters of already
+    scanned text, and text is released only once it has been scanned with
+    that much right context. LLM scanners run in the background on the text
+    so far every `checkpoint_chars` characters, at most one checkpoint at a
+    time. The stream is cut as soon as a violation is found. finish() runs
+    the full scan on the complete response.
+
+    Logic scanners that cannot stream (listed in `held_back_by`) only see
+    the complete response in finish(). When the config has any, feed()
+    forwards nothing and the whole response is released by finish() once it
+    passed; the streamable scanners still run as it arrives, so a violation
+    they find cuts the stream early. LLM scanner verdicts are not waited
+    for: text may be released before a checkpoint or finish() fails it.
+
+    Usage:
+        stream = watchdog.stream(scanner_config)
+        for chunk in response:
+            send(stream.feed(chunk))
+            if stream.blocked:
+                break
+        send(stream.finish())
+        result = stream.result
+
+    Args:
+        watchdog: The OutputWatchdog the stream belongs to.
+        scanner_config (list | ScanPlan): Scanner configurations or a compiled plan.
+        overlap (int): Characters of context shared by consecutive windows.
+        scan_every (int): New characters to collect before scanning again.
+        checkpoint_chars (int, optional): Characters between LLM checkpoints.
+            None disables checkpoints; the LLM scanners then only run at finish().
+    """
+
+    def __init__(
+        self,
+        watchdog,
+        scanner_config,
+        overlap=STREAM_OVERLAP,
+        scan_every=STREAM_SCAN_EVERY,
+        checkpoint_chars=STREAM_CHECKPOINT_CHARS,
+    ):
+        self.watchdog = watchdog
+        self.plan = watchdog.compile(scanner_config)
+        self.overlap = overlap
+        self.scan_every = max(1, scan_every)
+        self.checkpoint_chars = checkpoint_chars
+
+        self.window_steps = [
+            (config, logic_fn) for config, logic_fn in self.plan.logic_steps
+            if is_streamable(config["name"], config.get("params", {}))
+        ]
+        streamable = {config["name"] for config, _ in self.window_steps}
+        self.held_back_by = [
+            config["name"] for config, _ in self.plan.logic_steps if config["name"] not in streamable
+        ]
+        if not self.window_steps:
+            # No window scans, so no right context to hold back for
+            self.overlap = 0
+        llm_configs = self.plan.llm_scanners + self.plan.separate_llm_scanners
+        self.llm_plan = watchdog.compile(llm_configs) if llm_configs else None
+
+        self.blocked = False
+        self.violation = None
+        self.result = None
+
+        self._parts = []
+        self._length = 0
+        self._scanned = 0     # characters covered by window scans
+        self._released = 0    # characters returned to the caller
+        self._window = ""     # text from self._window_start to the end
+        self._window_start = 0
+        self._checkpoint = None
+        self._checkpoint_at = 0
+
+    @property
+    def text(self):
+        """
+        Everything fed so far.
+        """
+        return "".join(self._parts)
+
+    def feed(self, chunk):
+        """
+        Add a chunk of the response.
+
+        Returns:
+            str: Text that is now safe to forward; empty once the stream is
+            blocked, and always empty when held_back_by is not empty.
+        """
+        if self.blocked or self.result is not None:
+            return ""
+
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        self._window += chunk
+
+        self._poll_checkpoint()
+        if not self.blocked and self.checkpoint_chars and self.llm_plan is not None:
+            if self._checkpoint is None and self._length - self._checkpoint_at >= self.checkpoint_chars:
+                self._start_checkpoint()
+
+        due = not self.window_steps or self._length - self._scanned >= self.scan_every
+        if not self.blocked and due:
+            self._scan_window()
+
+        if self.blocked or self.held_back_by:
+            return ""
+        return self._release(max(self._released, self._scanned - self.overlap))
+
+    def finish(self):
+        """
+        End the stream: scan what is left, then run the full scan on the
+        complete response and store it in `result`.
+
+        Returns:
+            str: The held-back rest of the response, or "" if it was blocked.
+        """
+        if self.result is not None:
+            return ""
+
+        if self._checkpoint is not None:
+            self._checkpoint.cancel()
+            self._checkpoint = None
+
+        if not self.blocked and self._length > self._scanned:
+            self._scan_window()
+
+        if self.blocked:
+            self.result = self._blocked_result()
+            return ""
+
+        self.result = self.watchdog.scan(self.text, self.plan)
+        stream = {"blocked": False, "violation": None}
+        if isinstance(self.result, ScanResult):
+            self.result.extra["stream"] = stream
+        else:
+            self.result["stream"] = stream
+        if not self.result["overall_result"]:
+            self.blocked = True
+            self.result["stream"]["blocked"] = True
+            return ""
+        return self._release(self._length)
+
+    def iter_safe(self, chunks):
+        """
+        Wrap an iterable of chunks and yield only text that is safe to forward.
+        The stream is finished when the iterable is exhausted or a violation is found.
+        """
+        for chunk in chunks:
+            safe = self.feed(chunk)
+            if safe:
+                yield safe
+            if self.blocked:
+                break
+        tail = self.finish()
+        if tail:
+            yield tail
+
+    def _release(self, end):
+        if end <= self._released:
+            return ""
+        text = self._window[self._released - self._window_start:end - self._window_start]
+        self._released = end
+        return text
+
+    def _scan_window(self):
+        """
+        Run the streamable logic scanners over the unscanned text plus overlap.
+        """
+        start = max(self._window_start, self._scanned - self.overlap)
+        window = self._window[start - self._window_start:]
+        view = TextView(window) if self.plan.text_view_scanners else None
+        for config, logic_fn in self.window_steps:
+            name = config["name"]
+            params = config.get("params", {})
+            if name in self.plan.text_view_scanners:
+                model = logic_fn(window, text_view=view, **params)
+            else:
+                model = logic_fn(window, **params)
+            if getattr(model, "result", None) is False:
+                self._block({name: model.model_dump()}, window_start=start)
+                return
+
+        self._scanned = self._length
+        # Keep only what the next window or the next release still needs
+        keep_from = min(self._released, max(0, self._scanned - self.overlap))
+        if keep_from > self._window_start:
+            self._window = self._window[keep_from - self._window_start:]
+            self._window_start = keep_from
+
+    def _start_checkpoint(self):
+        self._checkpoint_at = self._length
+        self._checkpoint = _get_checkpoint_executor().submit(
+            self.watchdog.scan, self.text, self.llm_plan
+        )
+
+    def _poll_checkpoint(self):
+        """
+        Pick up a finished LLM checkpoint and block the stream if it failed.
+        """
+        checkpoint = self._checkpoint
+        if checkpoint is None or not checkpoint.done():
+            return
+        self._checkpoint = None
+
+        try:
+            result = checkpoint.result()
+        except Exception:
+            # Checkpoints are advisory; errors surface in the full scan at finish()
+            return
+        if not result["overall_result"]:
+            failed = result["failed_scanners"]
+            self._block({name: result[name] for name in failed}, checkpoint=self._checkpoint_at)
+
+    def _block(self, results, window_start=None, checkpoint=None):
+        """
+        Cut the stream. results maps each failed scanner to its result dict;
+        window_start (logic scanners) or checkpoint (LLM scanners) tells which
+        part of the response was being scanned.
+        """
+        self.blocked = True
+        self.violation = {
+            "failed_scanners": list(results),
+            "results": results,
+            "window_start": window_start,
+            "checkpoint": checkpoint,
+            "released_chars": self._released,
+        }
+
+    def _blocked_result(self):
+        """
+        Result reported by finish() for a stream that was cut before the end,
+        in the watchdog's result format. Offsets in window-scan results are
+        relative to violation["window_start"].
+        """
+        result = ScanResult(
+            dict(self.violation["results"]),
+            overall_result=False,
+            extra={"stream": {"blocked": True, "violation": self.violation}},
+        )
+        return result if self.watchdog.result_format == "object" else result.to_dict()
@@ -0,0 +1,141 @@
+"""
+Values derived from a scanned text, shared by the logic scanners of one scan.
+
+Several logic scanners start by re-deriving the same things from the raw
+string: a lowercased copy, its words, its URLs, whether it is pure ASCII, its
+token count. core.run() builds one TextView per scanned text and hands it to
+every logic scanner that opts in with ACCEPTS_TEXT_VIEW = True, as the
+text_view keyword argument of run_logic_based_scan. Each value is computed on
+first access and memoized, so a value no scanner asks for is never computed
+and one that several scanners ask for is computed once.
+
+A scanner must work without a view (text_view=None) as well: that is how it
+is called directly, in a process pool worker or from a batch scan function.
+"""
+from functools import cached_property
+import re
+import sys
+from typing import List, Optional, Tuple
+
+from .aho_corasick import fold_with_positions
+
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# Sentence punctuation that commonly trails a URL in prose
+URL_TRAILING_PUNCTUATION = ".,;:!?)]}'\""
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+def extract_urls(text: str, max_urls: Optional[int] = None) -> List[str]:
+    """
+    Extract distinct URLs from text in order of appearance, without trailing punctuation.
+
+    Args:
+        text (str): Text to search.
+        max_urls (int, optional): Stop after this many URLs.
+    """
+    urls = []
+    seen = set()
+    for match in URL_PATTERN.finditer(text):
+        url = match.group().rstrip(URL_TRAILING_PUNCTUATION)
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+            if max_urls is not None and len(urls) >= max_urls:
+                break
+    return urls
+
+
+class TextView:
+    """
+    Lazily computed, memoized views of one text.
+
+    Args:
+        text (str): The scanned text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._token_counts = {}
+
+    @cached_property
+    def is_ascii(self) -> bool:
+        """
+        True if the text has no non-ASCII characters.
+        """
+        return self.text.isascii()
+
+    @cached_property
+    def utf8_length(self) -> int:
+        """
+        Length of the text in bytes when encoded as UTF-8.
+        """
+        return len(self.text) if self.is_ascii else len(self.text.encode("utf-8"))
+
+    @cached_property
+    def lowered(self) -> Tuple[str, Optional[List[int]]]:
+        """
+        The text passed through str.lower(), with the map from folded offsets
+        back to the original ones (None when lowering kept the length).
+        """
+        return fold_with_positions(self.text, str.lower)
+
+    @cached_property
+    def casefolded(self) -> Tuple[str, Optional[List[int]]]:
+        """
+        The text passed through str.casefold(), with the offset map as for lowered.
+        """
+        return fold_with_positions(self.text, str.casefold)
+
+    @cached_property
+    def word_spans(self) -> List[Tuple[int, int]]:
+        """
+        (start, end) offsets of every whitespace-separated word.
+        """
+        return [match.span() for match in _WORD_PATTERN.finditer(self.text)]
+
+    @cached_property
+    def word_count(self) -> int:
+        """
+        Number of whitespace-separated words, as len(text.split()) counts them.
+        """
+        if "word_spans" in self.__dict__:
+            return len(self.word_spans)
+        return len(self.text.split())
+
+    @cached_property
+    def urls(self) -> List[str]:
+        """
+        Every distinct URL in the text, see extract_urls().
+        """
+        return extract_urls(self.text)
+
+    def token_count(self, encoding, limit: Optional[int] = None, exact: bool = False) -> Tuple[int, bool]:
+        """
+        Count the tokens of the text with a tiktoken encoding only as far as
+        needed to compare the count with limit (see
+        check_token_limit.count_tokens_bounded); without a limit, or with
+        exact, texts within the limit are counted exactly. Counts are
+        memoized per encoding, and an exact count answers every later call.
+
+        Returns:
+            tuple: (count, exact). When exact is False, count is an upper bound
+            within the limit or a lower bound that already exceeds it.
+        """
+        exact = exact or limit is None
+        bound = sys.maxsize if limit is None else limit
+        known = self._token_counts.get(encoding)
+        if known is not None:
+            count, is_exact, is_upper = known
+            if is_exact or (not is_upper and count > bound) or (is_upper and count <= bound and not exact):
+                return count, is_exact
+
+        from .scanners.check_token_limit import count_tokens_bounded
+
+        count, is_exact = count_tokens_bounded(self.text, encoding, bound, utf8_length=self.utf8_length, exact=exact)
+        self._token_counts[encoding] = (count, is_exact, not is_exact and count <= bound)
+        return count, is_exact
+
+    def __repr__(self):
+        return f"TextView(chars={len(self.text)})"
@@ -0,0 +1,103 @@
+import asyncio
+import random
+import threading
+import time
+import types
+import typing
+from typing import Literal, Union
+from pydantic import BaseModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+
+def _fake_value(annotation):
+    """
+    Return a valid placeholder for a field annotation: passing verdicts,
+    empty collections and None for optional fields.
+    """
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is Union or origin is types.UnionType:
+        if type(None) in args:
+            return None
+        return _fake_value(args[0])
+    if origin is Literal:
+        return args[0]
+    if origin in (list, set, tuple, frozenset):
+        return origin()
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return build_instance(annotation)
+    if annotation is bool:
+        return True
+    if annotation is str:
+        return "ok"
+    if annotation is int:
+        return 0
+    if annotation is float:
+        return 0.0
+    return None
+
+
+def build_instance(schema):
+    """
+    Build a valid instance of a Pydantic schema, e.g. a generated ExpectedLLMOutput.
+    """
+    return schema(**{name: _fake_value(field.annotation) for name, field in schema.model_fields.items()})
+
+
+class FakeChatModel:
+    """
+    Deterministic local stand-in for a LangChain chat model.
+
+    with_structured_output() returns a runnable that sleeps for a simulated
+    provider latency (latency ± jitter, drawn from a seeded generator) and
+    answers with a valid instance of the requested schema in which every
+    scanner passes. Token usage is estimated at four characters per token.
+
+    Args:
+        latency (float): Mean simulated round-trip in seconds.
+        jitter (float): Maximum deviation from the mean in seconds.
+        seed (int): Seed of the jitter generator.
+    """
+
+    model_name = "fake-chat-model"
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _next_delay(self):
+        with self._lock:
+            self.calls += 1
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset)
+
+    def with_structured_output(self, schema, include_raw=False):
+        def respond(prompt):
+            parsed = build_instance(schema)
+            if not include_raw:
+                return parsed
+            input_tokens = len(str(prompt)) // 4
+            output_tokens = len(parsed.model_dump_json()) // 4
+            raw = AIMessage(content="", usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            })
+            return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+        def invoke(prompt):
+            time.sleep(self._next_delay())
+            return respond(prompt)
+
+        async def ainvoke(prompt):
+            await asyncio.sleep(self._next_delay())
+            return respond(prompt)
+
+        return RunnableLambda(invoke, afunc=ainvoke)
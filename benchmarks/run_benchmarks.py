@@ -0,0 +1,374 @@
+"""
+Offline benchmarks for ai-watchdog.
+
+Measures InputWatchdog.scan, OutputWatchdog.scan and every logic scanner
+against a simulated-latency fake chat model, sweeping text sizes and
+scanner-config sizes. Reports throughput, p50/p95/p99 latency and peak
+traced memory per case as JSON. Also checks cold-import time against a
+budget and that heavy dependencies are not loaded at import time.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --max-regression 0.25
+    python -m benchmarks.run_benchmarks --only import --import-budget-ms 300
+"""
+import argparse
+import importlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.fake_llm import FakeChatModel
+
+# Parameters used to benchmark each logic scanner on its own
+LOGIC_SCANNERS = {
+    "ban_substrings": {"banned_substrings": ["forbidden", "classified", "password", "do not share"]},
+    "regex_scanner": {"patterns": [r"\b\d{3}-\d{2}-\d{4}\b", r"[\w.]+@[\w.]+\.\w+", r"\bsk-[A-Za-z0-9]{20,}\b"]},
+    "detect_invisible_text": {},
+    "secrets_detection": {},
+    "pii_detection": {},
+    "check_token_limit": {"max_tokens": 4096},
+    "sentiment_scanner": {},
+    "reading_time": {},
+    "url_reachability_check": {},
+}
+
+# Scanner configs by scan type; a config of size n uses the first n entries
+INPUT_SCANNERS = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}},
+    {"name": "detect_prompt_injection"},
+    {"name": "toxicity_detection"},
+    {"name": "detect_invisible_text"},
+    {"name": "ban_topics", "params": {"topic_list": ["violence", "politics"]}},
+    {"name": "detect_jailbreak"},
+    {"name": "gibberish_detection"},
+    {"name": "ban_code"},
+]
+
+OUTPUT_SCANNERS = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}},
+    {"name": "toxicity_detection"},
+    {"name": "relevance_detection", "params": {"prompt_text": "Summarize the quarterly report."}},
+    {"name": "bias_detection"},
+    {"name": "regex_scanner", "params": {"patterns": [r"\b\d{3}-\d{2}-\d{4}\b"]}},
+    {"name": "detect_refusals"},
+    {"name": "ban_competitors", "params": {"competitor_list": ["Acme", "Globex"]}},
+    {"name": "code_detection"},
+]
+
+# Modules timed by the cold-import check
+IMPORT_MODULES = ["ai_watchdog.core"] + [f"ai_watchdog.scanners.{name}" for name in LOGIC_SCANNERS]
+
+# Dependencies that must only be imported on first use, never by importing ai_watchdog
+LAZY_DEPENDENCIES = [
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_google_genai",
+    "langchain_huggingface",
+    "presidio_analyzer",
+    "presidio_anonymizer",
+    "detect_secrets",
+    "tiktoken",
+    "vaderSentiment",
+]
+
+# Run in a fresh interpreter: times one import and lists the top-level packages it loaded
+_IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'seconds': elapsed, 'packages': sorted({{m.split('.')[0] for m in sys.modules}})}}))\n"
+)
+
+_WORDS = (
+    "the quarterly report shows revenue growth across all regions while costs "
+    "remained stable and the team expects further improvement next year as new "
+    "products launch in several markets customers reported higher satisfaction"
+).split()
+
+
+def make_text(chars, seed=0):
+    """
+    Build deterministic English-like text of about `chars` characters.
+    """
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(_WORDS)
+        if rng.random() < 0.08:
+            word += "."
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn, iterations, warmup):
+    """
+    Time fn() and trace its peak memory in a separate run.
+
+    Returns:
+        dict: Latency percentiles in milliseconds, throughput per second and
+        peak traced memory in KiB.
+    """
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    # Tracing slows allocations down, so memory is measured outside the timed loop
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p95_ms": percentile(durations, 0.95) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "throughput_per_s": iterations / elapsed if elapsed else None,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def _run_case(results, case, fn, args):
+    record = dict(case)
+    record["id"] = "|".join(str(case[k]) for k in ("benchmark", "subject", "text_chars"))
+    try:
+        record.update(measure(fn, args.iterations, args.warmup))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    else:
+        if "llm_stages" in case:
+            # What the library adds on top of the (concurrent) simulated LLM round-trips
+            simulated = case["simulated_latency_ms"] if case["llm_stages"] else 0.0
+            record["overhead_p50_ms"] = record["p50_ms"] - simulated
+    _report(results, record)
+
+
+def _report(results, record):
+    results.append(record)
+    status = record.get("error") or f"p50={record['p50_ms']:.2f}ms p95={record['p95_ms']:.2f}ms"
+    print(f"{record['id']:<60} {status}", file=sys.stderr)
+
+
+def bench_logic_scanners(results, args):
+    for name, params in LOGIC_SCANNERS.items():
+        if args.scanners and name not in args.scanners:
+            continue
+        try:
+            module = importlib.import_module(f"ai_watchdog.scanners.{name}")
+        except Exception as e:
+            _report(results, {
+                "id": f"logic_scanner|{name}", "benchmark": "logic_scanner", "subject": name,
+                "error": f"{type(e).__name__}: {e}",
+            })
+            continue
+
+        for chars in args.text_sizes:
+            text = make_text(chars)
+            _run_case(
+                results,
+                {"benchmark": "logic_scanner", "subject": name, "text_chars": chars},
+                lambda: module.run_logic_based_scan(text, **params),
+                args,
+            )
+
+
+def bench_watchdog(results, args, watchdog_cls, scanners, benchmark):
+    for size in args.config_sizes:
+        config = scanners[:size]
+        watchdog = watchdog_cls()
+        watchdog.llm = FakeChatModel(args.latency, args.jitter, args.seed)
+        try:
+            plan = watchdog.compile(config)
+        except Exception as e:
+            _report(results, {
+                "id": f"{benchmark}|{size}_scanners", "benchmark": benchmark, "subject": f"{size}_scanners",
+                "error": f"{type(e).__name__}: {e}",
+            })
+            continue
+        llm_stages = (plan.structured_model is not None) + len(plan.separate_steps)
+
+        for chars in args.text_sizes:
+            text = make_text(chars)
+            _run_case(
+                results,
+                {
+                    "benchmark": benchmark,
+                    "subject": f"{size}_scanners",
+                    "text_chars": chars,
+                    "scanners": [c["name"] for c in config],
+                    "simulated_latency_ms": args.latency * 1000,
+                    "llm_stages": llm_stages,
+                },
+                lambda: watchdog.scan(text, plan),
+                args,
+            )
+
+
+def bench_import_time(results, args):
+    """
+    Cold-import each module in fresh interpreters. A module is over budget
+    when its median import time exceeds --import-budget-ms or when it
+    pulls in one of LAZY_DEPENDENCIES.
+    """
+    for module in IMPORT_MODULES:
+        record = {"id": f"import|{module}", "benchmark": "import", "subject": module}
+        durations = []
+        packages = set()
+        try:
+            for _ in range(args.import_runs):
+                completed = subprocess.run(
+                    [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+                    capture_output=True, text=True, check=True,
+                )
+                probe = json.loads(completed.stdout.strip().splitlines()[-1])
+                durations.append(probe["seconds"])
+                packages.update(probe["packages"])
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.strip().splitlines()
+            record["error"] = stderr[-1] if stderr else f"exit code {e.returncode}"
+            _report(results, record)
+            continue
+
+        durations.sort()
+        eager = [name for name in LAZY_DEPENDENCIES if name in packages]
+        record.update({
+            "iterations": len(durations),
+            "p50_ms": percentile(durations, 0.50) * 1000,
+            "p95_ms": percentile(durations, 0.95) * 1000,
+            "budget_ms": args.import_budget_ms,
+            "eager_dependencies": eager,
+        })
+        record["within_budget"] = record["p50_ms"] <= args.import_budget_ms and not eager
+        _report(results, record)
+
+
+def compare(results, baseline_path, max_regression):
+    """
+    Compare p50 latencies with a baseline report.
+
+    Returns:
+        list: Cases whose p50 grew by more than max_regression (a fraction).
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["id"]: r for r in json.load(f)["results"] if "p50_ms" in r}
+
+    regressions = []
+    for record in results:
+        before = baseline.get(record["id"])
+        if before is None or "p50_ms" not in record or not before["p50_ms"]:
+            continue
+        change = record["p50_ms"] / before["p50_ms"] - 1
+        if change > max_regression:
+            regressions.append({
+                "id": record["id"],
+                "baseline_p50_ms": before["p50_ms"],
+                "p50_ms": record["p50_ms"],
+                "change": change,
+            })
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ai-watchdog benchmarks")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Maximum latency jitter in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--text-sizes", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--config-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--scanners", nargs="+", help="Only benchmark these logic scanners")
+    parser.add_argument(
+        "--only", nargs="+", choices=["import", "logic", "input", "output"],
+        default=["import", "logic", "input", "output"], help="Benchmark groups to run",
+    )
+    parser.add_argument("--import-runs", type=int, default=5, help="Fresh interpreters per cold-import case")
+    parser.add_argument("--import-budget-ms", type=float, default=300.0,
+                        help="Allowed median cold-import time of each module")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare p50 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed p50 growth over the baseline, as a fraction")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Imported here so the import itself is not part of any measurement
+    from ai_watchdog.core import InputWatchdog, OutputWatchdog
+
+    results = []
+    if "import" in args.only:
+        bench_import_time(results, args)
+    if "logic" in args.only:
+        bench_logic_scanners(results, args)
+    if "input" in args.only:
+        bench_watchdog(results, args, InputWatchdog, INPUT_SCANNERS, "input_scan")
+    if "output" in args.only:
+        bench_watchdog(results, args, OutputWatchdog, OUTPUT_SCANNERS, "output_scan")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    over_budget = [r for r in results if r.get("within_budget") is False]
+    for r in over_budget:
+        eager = f", imports {', '.join(r['eager_dependencies'])}" if r["eager_dependencies"] else ""
+        print(f"IMPORT BUDGET {r['id']}: {r['p50_ms']:.1f}ms (budget {r['budget_ms']:.0f}ms){eager}", file=sys.stderr)
+    if over_budget:
+        exit_code = 1
+
+    if args.baseline:
+        report["regressions"] = compare(results, args.baseline, args.max_regression)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['id']}: {r['baseline_p50_ms']:.2f}ms -> {r['p50_ms']:.2f}ms", file=sys.stderr)
+        if report["regressions"]:
+            exit_code = 1
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Shared fixtures of the offline test suite.
+
+The tests never call a provider: LLM scanners run against FakeChatModel from
+benchmarks/fake_llm.py, the stand-in the benchmark harness uses, which
+answers every structured-output call with passing verdicts. The benchmarks
+directory is therefore part of the test setup; pytest puts the repository
+root on sys.path (see [tool.pytest.ini_options] in pyproject.toml).
+"""
+import pytest
+
+from ai_watchdog.core import InputWatchdog, OutputWatchdog
+from benchmarks.fake_llm import FakeChatModel
+
+
+@pytest.fixture
+def fake_llm():
+    return FakeChatModel(latency=0.0)
+
+
+@pytest.fixture
+def input_watchdog(fake_llm):
+    watchdog = InputWatchdog(cache=True)
+    watchdog.llm = fake_llm
+    return watchdog
+
+
+@pytest.fixture
+def output_watchdog(fake_llm):
+    watchdog = OutputWatchdog()
+    watchdog.llm = fake_llm
+    return watchdog
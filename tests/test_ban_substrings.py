@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from ai_watchdog import aho_corasick
+from ai_watchdog.aho_corasick import AhoCorasick, get_automaton
+from ai_watchdog.scanners.ban_substrings import run_logic_based_scan
+from ai_watchdog.text_view import TextView
+
+
+def _naive_matches(text, patterns):
+    lowered = text.lower()
+    found = set()
+    for index, pattern in enumerate(patterns):
+        pattern = pattern.lower()
+        start = lowered.find(pattern)
+        while pattern and start != -1:
+            found.add((index, start, start + len(pattern)))
+            start = lowered.find(pattern, start + 1)
+    return found
+
+
+@pytest.mark.parametrize("find_limit", [aho_corasick.FIND_PATTERN_LIMIT, 0])
+def test_automaton_reports_every_overlapping_occurrence(monkeypatch, find_limit):
+    # find_limit 0 forces the automaton walk instead of the str.find() pass
+    monkeypatch.setattr(aho_corasick, "FIND_PATTERN_LIMIT", find_limit)
+    patterns = ["he", "she", "his", "hers", "", "HE"]
+    text = "Ushers said she saw his HERS."
+
+    assert set(AhoCorasick(patterns).iter_matches(text)) == _naive_matches(text, patterns)
+
+
+def test_automaton_matches_naive_search_on_random_text(monkeypatch):
+    monkeypatch.setattr(aho_corasick, "FIND_PATTERN_LIMIT", 0)
+    rng = random.Random(3)
+    patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+    text = "".join(rng.choice("abcABC ") for _ in range(500))
+
+    assert set(AhoCorasick(patterns).iter_matches(text)) == _naive_matches(text, patterns)
+
+
+def test_casefold_offsets_refer_to_original_text():
+    text = "Die STRASSE und die Straße."
+    matches = sorted(AhoCorasick(["strasse"], casefold=True).iter_matches(text))
+
+    assert [text[start:end] for _, start, end in matches] == ["STRASSE", "Straße"]
+
+
+def test_automata_are_cached_per_pattern_list():
+    assert get_automaton(("a", "b")) is get_automaton(("a", "b"))
+    assert get_automaton(("a", "b")) is not get_automaton(("a", "b"), True)
+
+
+def test_scan_reports_phrases_in_config_order_and_offsets():
+    text = "This is CLASSIFIED and forbidden."
+    result = run_logic_based_scan(text, ["forbidden", "classified", "secret"])
+
+    assert result.result is False
+    assert result.banned_phrases_found == ["forbidden", "classified"]
+    assert [(m.phrase, text[m.start:m.end]) for m in result.matches] == [
+        ("classified", "CLASSIFIED"), ("forbidden", "forbidden"),
+    ]
+
+
+def test_whole_word_skips_matches_inside_words():
+    assert run_logic_based_scan("A classification.", ["classified", "class"], whole_word=True).result is True
+    assert run_logic_based_scan("A class of its own.", ["class"], whole_word=True).result is False
+
+
+def test_text_view_gives_the_same_result():
+    text = "İstanbul is forbidden STRASSE"
+    for casefold in (False, True):
+        expected = run_logic_based_scan(text, ["forbidden", "straße"], casefold=casefold)
+        viewed = run_logic_based_scan(text, ["forbidden", "straße"], casefold=casefold, text_view=TextView(text))
+        assert viewed == expected
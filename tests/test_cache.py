@@ -0,0 +1,125 @@
+import asyncio
+import sqlite3
+import time
+
+from ai_watchdog.cache import PERSISTENT_CACHE_SIZE, SQLiteCache, TTLCache, resolve_cache
+from ai_watchdog.core import InputWatchdog
+
+BAN_SUBSTRINGS = {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}}
+BAN_TOPICS = {"name": "ban_topics", "params": {"topic_list": ["violence", "politics"]}}
+
+
+def test_second_scan_is_served_from_cache(input_watchdog, fake_llm):
+    config = [BAN_SUBSTRINGS, BAN_TOPICS]
+
+    first = input_watchdog.scan("Tell me about the weather.", config)
+    assert first["cache"]["misses"] > 0
+    assert first["cache"]["hits"] == 0
+    calls = fake_llm.calls
+
+    second = input_watchdog.scan("Tell me about the weather.", config)
+    assert second["cache"]["hits"] > 0
+    assert second["cache"]["misses"] == 0
+    assert fake_llm.calls == calls
+    assert second["ban_topics"] == first["ban_topics"]
+
+
+def test_other_text_misses_cache(input_watchdog, fake_llm):
+    input_watchdog.scan("First text.", [BAN_TOPICS])
+    calls = fake_llm.calls
+
+    result = input_watchdog.scan("Second text.", [BAN_TOPICS])
+    assert result["cache"]["misses"] > 0
+    assert fake_llm.calls > calls
+
+
+def test_async_scan_uses_cache(input_watchdog, fake_llm):
+    async def scan_twice():
+        first = await input_watchdog.ascan("An async text.", [BAN_TOPICS])
+        second = await input_watchdog.ascan("An async text.", [BAN_TOPICS])
+        return first, second
+
+    first, second = asyncio.run(scan_twice())
+    assert first["cache"]["misses"] > 0
+    assert second["cache"]["hits"] > 0
+    assert fake_llm.calls == 1
+
+
+class _SlowCache(TTLCache):
+    def get(self, key, default=None):
+        time.sleep(0.2)
+        return super().get(key, default)
+
+
+def test_async_cache_access_does_not_block_the_event_loop(fake_llm):
+    watchdog = InputWatchdog(cache=_SlowCache())
+    watchdog.llm = fake_llm
+
+    async def scan_while_ticking():
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        await watchdog.ascan("Slow cache text.", [BAN_TOPICS])
+        ticker.cancel()
+        return max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+
+    assert asyncio.run(scan_while_ticking()) < 0.1
+
+
+def test_sqlite_cache_is_shared_across_watchdogs(tmp_path, fake_llm):
+    path = str(tmp_path / "verdicts.sqlite")
+    for expected in ("misses", "hits"):
+        watchdog = InputWatchdog(cache=path)
+        watchdog.llm = fake_llm
+        result = watchdog.scan("Persisted text.", [BAN_TOPICS])
+        assert result["cache"][expected] > 0
+        watchdog.cache.close()
+    assert fake_llm.calls == 1
+
+
+def test_path_cache_is_bounded_by_default(tmp_path):
+    cache = resolve_cache(str(tmp_path / "verdicts.sqlite"))
+    assert cache.max_size == PERSISTENT_CACHE_SIZE
+    cache.close()
+
+
+def test_sqlite_cache_evicts_least_recently_used_in_batches(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "lru.sqlite"), max_size=32)
+    for i in range(32):
+        cache.set(f"k{i}", i)
+    assert cache.get("k0") == 0  # refresh the oldest entry
+
+    for i in range(32, 48):
+        cache.set(f"k{i}", i)
+        # Never more than one batch over the limit
+        assert len(cache) <= 32 + cache._evict_batch
+
+    assert cache.get("k0") == 0
+    assert cache.get("k1") is None
+    assert cache.get("k47") == 47
+    cache.close()
+
+
+def test_sqlite_cache_drops_expired_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "ttl.sqlite"), ttl=0.01, max_size=16)
+    cache.set("old", 1)
+    time.sleep(0.02)
+    assert cache.get("old") is None
+    for i in range(16):
+        cache.set(f"k{i}", i, ttl=60)
+    assert len(cache) == 16
+    cache.close()
+
+
+def test_sqlite_cache_indexes_access_time(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    SQLiteCache(path).close()
+    with sqlite3.connect(path) as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT key FROM cache ORDER BY accessed_at LIMIT 5").fetchall()
+    assert "cache_accessed_at" in " ".join(str(row) for row in plan)
@@ -0,0 +1,98 @@
+import pytest
+
+tiktoken = pytest.importorskip("tiktoken")
+
+from ai_watchdog.scanners import check_token_limit
+from ai_watchdog.scanners.check_token_limit import count_tokens_bounded, run_logic_based_scan
+from ai_watchdog.text_view import TextView
+
+# The cl100k_base pre-tokenizer; a small vocabulary keeps the test offline
+PATTERN = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+"""
+    r"""|\s++$|\s*[\r\n]|\s+(?!\S)|\s"""
+)
+MERGES = [b"he", b"ll", b"hell", b"hello", b" w", b"or", b" wor", b"ld", b" world", b"  ", b" he", b" hello"]
+
+
+class CountingEncoding:
+    """
+    A toy tiktoken encoding that counts its encode_ordinary() calls.
+    """
+
+    def __init__(self):
+        ranks = {bytes([i]): i for i in range(256)}
+        for merge in MERGES:
+            ranks.setdefault(merge, len(ranks))
+        self.encoding = tiktoken.Encoding("toy", pat_str=PATTERN, mergeable_ranks=ranks, special_tokens={})
+        self.calls = 0
+
+    def encode_ordinary(self, text):
+        self.calls += 1
+        return self.encoding.encode_ordinary(text)
+
+    def token_byte_values(self):
+        return self.encoding.token_byte_values()
+
+
+@pytest.fixture
+def encoding():
+    return CountingEncoding()
+
+
+TEXT = "hello world, hello  wörld! 12345 " * 400
+
+
+def test_short_text_is_accepted_by_utf8_length_without_tokenizing(encoding):
+    assert count_tokens_bounded("hello world", encoding, limit=50) == (11, False)
+    assert encoding.calls == 0
+
+
+def test_exact_count_on_request(encoding):
+    count, exact = count_tokens_bounded("hello world", encoding, limit=50, exact=True)
+    assert (count, exact) == (2, True)
+
+
+def test_chunked_count_equals_whole_text_count(monkeypatch, encoding):
+    monkeypatch.setattr(check_token_limit, "CHUNK_CHARS", 97)
+    expected = len(encoding.encoding.encode_ordinary(TEXT))
+
+    assert count_tokens_bounded(TEXT, encoding, limit=10 ** 6, exact=True) == (expected, True)
+    assert encoding.calls > 1
+
+
+def test_counting_stops_once_limit_is_exceeded(monkeypatch, encoding):
+    monkeypatch.setattr(check_token_limit, "CHUNK_CHARS", 97)
+    count, exact = count_tokens_bounded(TEXT, encoding, limit=50)
+
+    assert count > 50 and not exact
+    assert count < len(encoding.encoding.encode_ordinary(TEXT))
+
+
+def test_huge_text_is_rejected_by_lower_bound(encoding):
+    count, exact = count_tokens_bounded("x" * 10_000, encoding, limit=100)
+    assert count > 100 and not exact
+    assert encoding.calls == 0
+
+
+def test_scanner_reports_bounds_and_exact_counts(encoding):
+    within = run_logic_based_scan("hello world", max_tokens=50, encoding=encoding)
+    assert within.result is True
+    assert "at most 11" in within.details
+
+    exact = run_logic_based_scan("hello world", max_tokens=50, encoding=encoding, exact_count=True)
+    assert exact.token_count == 2
+    assert "(2)" in exact.details
+
+    over = run_logic_based_scan(TEXT, max_tokens=50, encoding=encoding)
+    assert over.result is False
+    assert "at least" in over.details
+
+
+def test_text_view_memoizes_counts_per_encoding(encoding):
+    view = TextView(TEXT)
+    first = view.token_count(encoding, limit=10 ** 6, exact=True)
+    calls = encoding.calls
+
+    assert view.token_count(encoding, limit=100) == first
+    assert view.token_count(encoding) == first
+    assert encoding.calls == calls
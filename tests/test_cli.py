@@ -0,0 +1,86 @@
+import json
+
+from ai_watchdog.cli import completed_records, main
+
+BAN_SUBSTRINGS = {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}}
+TEXTS = ["A clean text.", "This one is forbidden.", "Another clean text.", "Classified details.", "Last text."]
+
+
+def _write_inputs(tmp_path):
+    input_path = tmp_path / "records.jsonl"
+    input_path.write_text(
+        "".join(json.dumps({"id": f"r{i}", "text": text}) + "\n" for i, text in enumerate(TEXTS)),
+        encoding="utf-8",
+    )
+    config_path = tmp_path / "scanners.json"
+    config_path.write_text(json.dumps([BAN_SUBSTRINGS]), encoding="utf-8")
+    return input_path, config_path
+
+
+def _scan(input_path, config_path, output_path, *extra):
+    return main([
+        "scan", str(input_path), "--config", str(config_path), "--output", str(output_path),
+        "--id-field", "id", "--workers", "0", "--chunk-size", "2", *extra,
+    ])
+
+
+def _read_lines(output_path):
+    return [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_scan_writes_one_line_per_record(tmp_path):
+    input_path, config_path = _write_inputs(tmp_path)
+    output_path = tmp_path / "results.jsonl"
+
+    assert _scan(input_path, config_path, output_path) == 0
+    lines = _read_lines(output_path)
+    assert [line["index"] for line in lines] == list(range(len(TEXTS)))
+    assert [line["id"] for line in lines] == [f"r{i}" for i in range(len(TEXTS))]
+    assert [line["result"]["overall_result"] for line in lines] == [True, False, True, False, True]
+
+
+def test_resume_skips_completed_records_and_drops_partial_line(tmp_path):
+    input_path, config_path = _write_inputs(tmp_path)
+    output_path = tmp_path / "results.jsonl"
+    assert _scan(input_path, config_path, output_path) == 0
+    full = output_path.read_text(encoding="utf-8").splitlines(keepends=True)
+
+    # An interrupted run: two complete lines and half of the third
+    output_path.write_text(full[0] + full[1] + full[2][:10], encoding="utf-8")
+    assert _scan(input_path, config_path, output_path, "--resume") == 0
+
+    assert output_path.read_text(encoding="utf-8").splitlines(keepends=True) == full
+
+
+def test_completed_records_of_missing_output_is_zero(tmp_path):
+    assert completed_records(str(tmp_path / "missing.jsonl")) == 0
+
+
+def test_invalid_records_are_reported_per_line(tmp_path):
+    input_path, config_path = _write_inputs(tmp_path)
+    input_path.write_text('{"id": "a", "text": "fine"}\nnot json\n{"id": "b"}\n', encoding="utf-8")
+    output_path = tmp_path / "results.jsonl"
+
+    assert _scan(input_path, config_path, output_path) == 0
+    results = [line["result"] for line in _read_lines(output_path)]
+    assert results[0]["overall_result"] is True
+    assert "Invalid JSON" in results[1]["error"]["message"]
+    assert "no text" in results[2]["error"]["message"]
+
+
+def test_csv_input(tmp_path):
+    _, config_path = _write_inputs(tmp_path)
+    input_path = tmp_path / "records.csv"
+    input_path.write_text("id,text\nr0,clean\nr1,forbidden words\n", encoding="utf-8")
+    output_path = tmp_path / "results.jsonl"
+
+    assert _scan(input_path, config_path, output_path) == 0
+    assert [line["result"]["overall_result"] for line in _read_lines(output_path)] == [True, False]
+
+
+def test_llm_scanners_without_provider_fail_with_exit_code_2(tmp_path, capsys):
+    input_path, config_path = _write_inputs(tmp_path)
+    config_path.write_text(json.dumps([{"name": "ban_topics", "params": {"topic_list": ["x"]}}]), encoding="utf-8")
+
+    assert _scan(input_path, config_path, tmp_path / "results.jsonl") == 2
+    assert "no --provider/--model" in capsys.readouterr().err
@@ -0,0 +1,55 @@
+import time
+import unicodedata
+
+import pytest
+
+from ai_watchdog.scanners.detect_invisible_text import BANNED_CATEGORIES, REPLACE_LIMIT, run_logic_based_scan
+from ai_watchdog.text_view import TextView
+
+CLEAN_NON_ASCII = "Grüße aus München, 日本語のテキスト, naïve café. " * 6000
+ZERO_WIDTH = "​"
+
+
+def _naive_strip(text):
+    return "".join(char for char in text if unicodedata.category(char) not in BANNED_CATEGORIES)
+
+
+def test_ascii_text_passes():
+    result = run_logic_based_scan("plain ascii", text_view=TextView("plain ascii"))
+    assert result.result is True
+    assert result.sanitized_text == "plain ascii"
+
+
+def test_clean_non_ascii_text_passes_quickly():
+    started = time.perf_counter()
+    result = run_logic_based_scan(CLEAN_NON_ASCII)
+    elapsed = time.perf_counter() - started
+
+    assert result.result is True
+    assert result.sanitized_text == CLEAN_NON_ASCII
+    assert result.category_counts == {}
+    # Generous bound; a per-character pass in Python takes several times longer
+    assert elapsed < 0.25
+
+
+def test_many_invisible_characters_are_stripped_and_counted():
+    text = ("a" + ZERO_WIDTH) * 200_000 + ""
+    started = time.perf_counter()
+    result = run_logic_based_scan(text)
+    elapsed = time.perf_counter() - started
+
+    assert result.result is False
+    assert result.sanitized_text == "a" * 200_000
+    assert result.category_counts == {"Cf": 200_000, "Co": 1}
+    assert elapsed < 0.25
+
+
+@pytest.mark.parametrize("distinct", [3, REPLACE_LIMIT + 10])
+def test_matches_per_character_classification(distinct):
+    # Below and above REPLACE_LIMIT distinct invisible characters
+    invisible = [chr(0xE000 + i) for i in range(distinct)] + ["⁠", "\U000e0001"]
+    text = "".join(f"Wörter {char} " for char in invisible) * 50
+
+    result = run_logic_based_scan(text)
+    assert result.sanitized_text == _naive_strip(text)
+    assert sum(result.category_counts.values()) == 50 * len(invisible)
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from ai_watchdog.core import InputWatchdog
+
+CONFIG = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden"]}},
+    {"name": "detect_invisible_text"},
+    {"name": "ban_topics", "params": {"topic_list": ["violence"]}},
+    {"name": "detect_jailbreak"},
+]
+
+
+@pytest.fixture
+def watchdog(fake_llm):
+    watchdog = InputWatchdog(fail_fast=True)
+    watchdog.llm = fake_llm
+    return watchdog
+
+
+def _assert_decided_by_logic(result):
+    assert result["overall_result"] is False
+    assert result["failed_scanners"] == ["ban_substrings"]
+    assert set(result["skipped_scanners"]) >= {"ban_topics", "detect_jailbreak"}
+    for name in result["skipped_scanners"]:
+        assert result[name]["skipped"] is True
+        assert "ban_substrings" in result[name]["details"]
+
+
+def test_logic_failure_skips_llm_stages(watchdog, fake_llm):
+    _assert_decided_by_logic(watchdog.scan("This is forbidden.", CONFIG))
+    assert fake_llm.calls == 0
+
+
+def test_async_logic_failure_skips_llm_stages(watchdog, fake_llm):
+    _assert_decided_by_logic(asyncio.run(watchdog.ascan("This is forbidden.", CONFIG)))
+    assert fake_llm.calls == 0
+
+
+def test_passing_text_runs_every_scanner(watchdog, fake_llm):
+    result = watchdog.scan("A harmless question.", CONFIG)
+
+    assert result["overall_result"] is True
+    assert result["skipped_scanners"] == []
+    assert result["ban_topics"]["result"] is True
+    assert fake_llm.calls == 1
+
+
+def test_batch_only_sends_undecided_texts_to_llm(watchdog, fake_llm):
+    results = watchdog.scan_many(["Fine.", "Forbidden!", "Also fine."], CONFIG)
+
+    assert [result["overall_result"] for result in results] == [True, False, True]
+    assert "ban_topics" in results[1]["skipped_scanners"]
+    assert fake_llm.calls == 2
+
+
+def test_without_fail_fast_everything_runs(fake_llm):
+    watchdog = InputWatchdog()
+    watchdog.llm = fake_llm
+    result = watchdog.scan("This is forbidden.", CONFIG)
+
+    assert "skipped_scanners" not in result
+    assert result["ban_topics"]["result"] is True
+    assert fake_llm.calls == 1
@@ -0,0 +1,40 @@
+import asyncio
+
+from ai_watchdog.pydantic_model_builder import build_dynamic_super_model
+from benchmarks.fake_llm import FakeChatModel
+
+
+def test_structured_output_passes_every_scanner():
+    schema = build_dynamic_super_model(["ban_topics", "detect_jailbreak"])
+    answer = FakeChatModel(latency=0.0).with_structured_output(schema).invoke("prompt")
+
+    assert isinstance(answer, schema)
+    assert answer.ban_topics.result is True
+    assert answer.detect_jailbreak.result is True
+
+
+def test_raw_output_reports_estimated_usage():
+    schema = build_dynamic_super_model(["ban_topics"])
+    answer = FakeChatModel(latency=0.0).with_structured_output(schema, include_raw=True).invoke("x" * 400)
+
+    assert answer["parsing_error"] is None
+    assert answer["raw"].usage_metadata["input_tokens"] == 100
+
+
+def test_calls_are_counted_sync_and_async():
+    model = FakeChatModel(latency=0.0)
+    runnable = model.with_structured_output(build_dynamic_super_model(["ban_topics"]))
+    runnable.invoke("a")
+    asyncio.run(runnable.ainvoke("b"))
+    runnable.batch(["c", "d"])
+
+    assert model.calls == 4
+
+
+def test_jitter_is_deterministic_per_seed():
+    first = FakeChatModel(latency=0.1, jitter=0.05, seed=7)
+    second = FakeChatModel(latency=0.1, jitter=0.05, seed=7)
+    delays = [first._next_delay() for _ in range(5)]
+
+    assert delays == [second._next_delay() for _ in range(5)]
+    assert all(0.05 <= delay <= 0.15 for delay in delays)
@@ -0,0 +1,49 @@
+import json
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import ai_watchdog.scanners
+from benchmarks.run_benchmarks import LAZY_DEPENDENCIES
+
+# Same budget as the benchmark harness default (--import-budget-ms)
+IMPORT_BUDGET_MS = 300
+
+# Cold imports are noisy; the fastest of this many runs is compared with the budget
+IMPORT_ATTEMPTS = 3
+
+MODULES = ["ai_watchdog.core"] + [
+    f"ai_watchdog.scanners.{info.name}" for info in pkgutil.iter_modules(ai_watchdog.scanners.__path__)
+]
+
+_PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def _cold_import(module):
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)], capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_cold_import_is_lazy_and_within_budget(module):
+    elapsed_ms = None
+    for _ in range(IMPORT_ATTEMPTS):
+        probe = _cold_import(module)
+        loaded = {name.split(".")[0] for name in probe["modules"]}
+        eager = [name for name in LAZY_DEPENDENCIES if name in loaded]
+        assert eager == [], f"{module} imports {', '.join(eager)} at import time"
+
+        elapsed_ms = probe["seconds"] * 1000
+        if elapsed_ms <= IMPORT_BUDGET_MS:
+            break
+    assert elapsed_ms <= IMPORT_BUDGET_MS, f"{module} took {elapsed_ms:.0f}ms to import"
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+from ai_watchdog.core import InputWatchdog
+from ai_watchdog.instrumentation import extract_token_usage
+
+CONFIG = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden"]}},
+    {"name": "ban_topics", "params": {"topic_list": ["violence"]}},
+]
+
+
+def _watchdog(fake_llm, **options):
+    watchdog = InputWatchdog(**options)
+    watchdog.llm = fake_llm
+    return watchdog
+
+
+def _assert_metrics(timings, usage):
+    assert timings["total"]["wall_ms"] >= 0
+    assert {"plan", "logic", "llm:combined"} <= set(timings["stages"])
+    assert set(timings["scanners"]) == {"ban_substrings"}
+    assert usage["llm_calls"] == 1
+    assert usage["calls"][0]["stage"] == "combined"
+    assert usage["input_tokens"] == usage["calls"][0]["input_tokens"] > 0
+    assert usage["total_tokens"] == usage["input_tokens"] + usage["output_tokens"]
+
+
+def test_scan_reports_timings_and_usage(fake_llm):
+    result = _watchdog(fake_llm, instrument=True).scan("A question.", CONFIG)
+    _assert_metrics(result["timings"], result["usage"])
+
+
+def test_async_scan_reports_timings_and_usage(fake_llm):
+    result = asyncio.run(_watchdog(fake_llm, instrument=True).ascan("A question.", CONFIG))
+    _assert_metrics(result["timings"], result["usage"])
+
+
+def test_on_metrics_receives_every_scan(fake_llm):
+    seen = []
+    watchdog = _watchdog(fake_llm, on_metrics=seen.append)
+    watchdog.scan("One.", CONFIG)
+    watchdog.scan("Two.", CONFIG)
+
+    assert len(seen) == 2
+    _assert_metrics(seen[0]["timings"], seen[0]["usage"])
+
+
+def test_results_stay_unchanged_without_instrumentation(fake_llm):
+    result = _watchdog(fake_llm).scan("A question.", CONFIG)
+    assert "timings" not in result
+    assert "usage" not in result
+
+
+def test_token_usage_from_usage_metadata_and_response_metadata():
+    standard = SimpleNamespace(usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15})
+    assert extract_token_usage(standard) == {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+
+    openai = SimpleNamespace(usage_metadata=None, response_metadata={
+        "token_usage": {"prompt_tokens": 7, "completion_tokens": 3},
+    })
+    assert extract_token_usage(openai) == {"input_tokens": 7, "output_tokens": 3, "total_tokens": 10}
+
+    unknown = SimpleNamespace()
+    assert extract_token_usage(unknown) == {"input_tokens": None, "output_tokens": None, "total_tokens": None}
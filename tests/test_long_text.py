@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+tiktoken = pytest.importorskip("tiktoken")
+
+from ai_watchdog.long_text import LongTextMode, WindowedModel, reduce_window_results
+
+# One token per byte, so window offsets are easy to predict
+BYTE_ENCODING = tiktoken.Encoding(
+    "bytes", pat_str=r"\S+|\s+", mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={}
+)
+
+
+def test_short_text_is_one_window():
+    mode = LongTextMode(window_tokens=100, overlap_tokens=10, encoding=BYTE_ENCODING)
+    assert mode.windows("short text") == [(0, 10)]
+
+
+def test_windows_cover_text_with_overlap():
+    text = "abcdefghij" * 5
+    mode = LongTextMode(window_tokens=20, overlap_tokens=5, encoding=BYTE_ENCODING)
+    windows = mode.windows(text)
+
+    assert windows == [(0, 20), (15, 35), (30, 50)]
+    for (_, end), (start, _) in zip(windows, windows[1:]):
+        assert end - start == 5
+
+
+def test_window_offsets_are_character_offsets():
+    text = "é" * 30  # two bytes, so two tokens, per character
+    windows = LongTextMode(window_tokens=20, overlap_tokens=4, encoding=BYTE_ENCODING).windows(text)
+
+    assert windows[0] == (0, 10)
+    assert windows[-1][1] == len(text)
+    assert all(text[start:end] for start, end in windows)
+
+
+def test_overlap_must_be_smaller_than_window():
+    with pytest.raises(ValueError):
+        LongTextMode(window_tokens=10, overlap_tokens=10)
+
+
+WINDOWS = [(0, 10), (8, 18), (16, 26)]
+
+
+def _outputs(*verdicts):
+    return [{"ban_topics": {"result": verdict, "details": f"window {i}"}} for i, verdict in enumerate(verdicts)]
+
+
+def test_any_fail_fails_on_one_failing_window():
+    reduced = reduce_window_results(WINDOWS, _outputs(True, False, True), {"ban_topics": "any_fail"})
+
+    assert reduced["ban_topics"]["result"] is False
+    assert reduced["ban_topics"]["details"] == "window 1"
+    assert reduced["ban_topics"]["failing_windows"] == [{"start": 8, "end": 18}]
+
+
+def test_majority_needs_more_than_half_failing():
+    policies = {"ban_topics": "majority"}
+
+    assert reduce_window_results(WINDOWS, _outputs(True, False, True), policies)["ban_topics"]["result"] is True
+    failed = reduce_window_results(WINDOWS, _outputs(False, False, True), policies)["ban_topics"]
+    assert failed["result"] is False
+    assert len(failed["failing_windows"]) == 2
+
+
+def test_all_passing_windows_keep_first_result():
+    reduced = reduce_window_results(WINDOWS, _outputs(True, True, True), {"ban_topics": "any_fail"})
+    assert reduced["ban_topics"] == {"result": True, "details": "window 0", "failing_windows": []}
+
+
+class _RecordingModel:
+    def __init__(self):
+        self.configs = []
+
+    def batch(self, prompts, config=None, return_exceptions=False):
+        self.configs.append(config)
+        return _outputs(*[True] * len(prompts))
+
+    async def abatch(self, prompts, config=None, return_exceptions=False):
+        return self.batch(prompts, config, return_exceptions)
+
+
+class _Plan:
+    llm_scanners = [{"name": "ban_topics"}]
+
+    def __init__(self):
+        self.structured_model = _RecordingModel()
+
+    def build_super_prompt(self, text):
+        return text
+
+
+@pytest.mark.parametrize("caller_limit, expected", [(None, 3), (8, 3), (2, 2)])
+def test_batch_applies_max_concurrency(caller_limit, expected):
+    mode = LongTextMode(window_tokens=20, overlap_tokens=5, encoding=BYTE_ENCODING, max_concurrency=3)
+    plan = _Plan()
+    model = WindowedModel(mode, plan)
+    config = {"max_concurrency": caller_limit} if caller_limit else None
+    texts = ["abcdefghij" * 5, "short"]
+
+    results = model.batch(texts, config)
+    asyncio.run(model.abatch(texts, config))
+
+    assert results[0]["ban_topics"]["failing_windows"] == []
+    assert results[1]["ban_topics"]["result"] is True
+    assert [c["max_concurrency"] for c in plan.structured_model.configs] == [expected, expected]
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("presidio_analyzer")
+pytest.importorskip("presidio_anonymizer")
+pytest.importorskip("en_core_web_lg")
+
+from ai_watchdog.scanners import pii_detection
+
+EMAIL = "Write to jane.doe@example.com for details."
+
+
+def test_block_and_redact_email():
+    blocked = pii_detection.run_logic_based_scan(EMAIL, entities=["EMAIL_ADDRESS"])
+    assert blocked.result is False
+    assert blocked.pii_found == ["EMAIL_ADDRESS"]
+
+    redacted = pii_detection.run_logic_based_scan(EMAIL, mode="redact", entities=["EMAIL_ADDRESS"])
+    assert redacted.result is True
+    assert "jane.doe@example.com" not in redacted.sanitized_text
+
+
+def test_clean_text_passes():
+    result = pii_detection.run_logic_based_scan("The weather is nice today.", entities=["EMAIL_ADDRESS"])
+    assert result.result is True
+    assert result.pii_found == []
+
+
+def test_recognizer_sets_share_one_nlp_engine():
+    full = pii_detection.get_analyzer()
+    restricted = pii_detection.get_analyzer(["EmailRecognizer"])
+
+    assert full is not restricted
+    assert pii_detection.get_analyzer(["EmailRecognizer"]) is restricted
+    assert full.nlp_engine is pii_detection.get_nlp_engine()
+    assert restricted.nlp_engine is pii_detection.get_nlp_engine()
+
+
+def test_restricted_registry_keeps_nlp_recognizer_for_person():
+    result = pii_detection.run_logic_based_scan(
+        "My name is John Smith.", entities=["PERSON"], recognizers=["EmailRecognizer"]
+    )
+    assert result.result is False
+    assert "PERSON" in result.pii_found
+
+
+def test_unknown_recognizer_is_rejected():
+    with pytest.raises(ValueError, match="NoSuchRecognizer"):
+        pii_detection.get_analyzer(["NoSuchRecognizer"])
@@ -0,0 +1,72 @@
+"""
+Pool workers start with forkserver or spawn and import this module again,
+so it runs nothing at import time; see the __main__ guard at the end.
+"""
+import pytest
+
+from ai_watchdog import process_pool
+from ai_watchdog.core import InputWatchdog
+
+CONFIG = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden"]}, "execution": "process"},
+    {"name": "detect_invisible_text"},
+]
+TEXTS = ["A clean text.", "This is forbidden.", "Zero​width."]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # configure() enables the pool for the whole process; restore the settings afterwards
+    monkeypatch.setattr(process_pool, "_settings", dict(process_pool._settings))
+    process_pool.configure(max_workers=1)
+    yield process_pool
+    process_pool.shutdown()
+
+
+def _worker_has_imported(module):
+    # eval is a builtin, so it pickles by name into the worker
+    return process_pool.get_pool().submit(eval, f"{module!r} in __import__('sys').modules").result(timeout=60)
+
+
+def test_process_scanner_through_scan_and_scan_many(pool):
+    watchdog = InputWatchdog()
+
+    single = watchdog.scan("This is forbidden.", CONFIG)
+    assert single["overall_result"] is False
+    assert single["ban_substrings"]["banned_phrases_found"] == ["forbidden"]
+
+    results = watchdog.scan_many(TEXTS, CONFIG)
+    assert [result["overall_result"] for result in results] == [True, False, False]
+    assert results[2]["failed_scanners"] == ["detect_invisible_text"]
+
+
+def test_workers_load_only_the_scanners_they_run(pool):
+    InputWatchdog().scan("Hello.", CONFIG)
+
+    assert _worker_has_imported("ai_watchdog.scanners.ban_substrings")
+    assert not _worker_has_imported("ai_watchdog.scanners.pii_detection")
+    assert not _worker_has_imported("ai_watchdog.scanners.secrets_detection")
+
+
+def test_warm_up_loads_the_configured_scanners(pool):
+    process_pool.configure(max_workers=1, warm_up=[{"name": "sentiment_scanner"}])
+
+    assert _worker_has_imported("vaderSentiment")
+    assert not _worker_has_imported("ai_watchdog.scanners.pii_detection")
+
+
+def test_default_context_never_forks():
+    assert process_pool._default_context().get_start_method() in ("forkserver", "spawn")
+
+
+def test_chunk_errors_are_isolated_per_text():
+    config = [{"name": "sentiment_scanner"}]
+    results = process_pool._scan_many(["Great work!", None, "Awful."], config)
+
+    assert results[0]["overall_result"] is True
+    assert "error" in results[1]
+    assert results[2]["overall_result"] is False
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
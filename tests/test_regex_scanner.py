@@ -0,0 +1,60 @@
+import pytest
+
+from ai_watchdog.scanners.regex_scanner import REDACTION, redact_spans, run_logic_based_scan
+
+SSN = r"\b\d{3}-\d{2}-\d{4}\b"
+
+
+def test_clean_text_passes_block_list():
+    result = run_logic_based_scan("Nothing to see here.", [SSN, r"secret"])
+    assert result.result is True
+    assert result.matched_patterns == []
+
+
+def test_overlapping_matches_of_different_patterns_are_all_reported():
+    text = "Call 123-45-6789 now."
+    result = run_logic_based_scan(text, [SSN, r"\d{3}-\d{2}", r"45-6789"])
+
+    assert result.result is False
+    assert result.matched_patterns == [SSN, r"\d{3}-\d{2}", r"45-6789"]
+    assert [(m.start, m.end) for m in result.matches] == [(5, 11), (5, 16), (9, 16)]
+
+
+def test_redaction_covers_union_of_overlapping_matches():
+    text = "Call 123-45-6789 now, or 987-65-4321."
+    result = run_logic_based_scan(text, [r"45-6789 now", SSN], redact=True)
+
+    assert result.result is True
+    assert result.sanitized_text == f"Call {REDACTION}, or {REDACTION}."
+
+
+def test_redact_spans_keeps_text_between_disjoint_spans():
+    assert redact_spans("abcdefgh", [(6, 8), (0, 2), (1, 3)]) == f"{REDACTION}def{REDACTION}"
+    assert redact_spans("abc", []) == "abc"
+
+
+def test_allow_list_needs_a_match():
+    assert run_logic_based_scan("order 42", [r"order \d+"], is_blocked=False).result is True
+    assert run_logic_based_scan("no order", [r"order \d+"], is_blocked=False).result is False
+
+
+def test_patterns_with_backreferences_and_group_names():
+    patterns = [r"(\w)\1", r"(?P<word>cat)", r"(?P<word>dog)"]
+    result = run_logic_based_scan("a cat and a dog, hmm", patterns)
+
+    assert result.matched_patterns == patterns
+
+
+def test_regex_engine_times_out():
+    pytest.importorskip("regex")
+    result = run_logic_based_scan("a" * 40 + "!", [r"(a|aa)+$"], timeout=0.01)
+
+    assert result.result is False
+    assert "timed out" in result.details
+
+
+def test_unsupported_engine_is_rejected():
+    with pytest.raises(ValueError):
+        run_logic_based_scan("text", ["x"], engine="pcre")
+    with pytest.raises(ValueError):
+        run_logic_based_scan("text", ["x"], engine="re2", timeout=1.0)
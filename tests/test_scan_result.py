@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from ai_watchdog.core import InputWatchdog
+from ai_watchdog.scan_result import ScanResult
+
+CONFIG = [
+    {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden"]}},
+    {"name": "ban_topics", "params": {"topic_list": ["violence"]}},
+]
+
+
+def _watchdog(fake_llm, result_format):
+    watchdog = InputWatchdog(cache=True, result_format=result_format)
+    watchdog.llm = fake_llm
+    return watchdog
+
+
+@pytest.mark.parametrize("text", ["A harmless text.", "This is forbidden."])
+def test_object_result_equals_dict_result(fake_llm, text):
+    as_dict = _watchdog(fake_llm, "dict").scan(text, CONFIG)
+    as_object = _watchdog(fake_llm, "object").scan(text, CONFIG)
+
+    assert isinstance(as_object, ScanResult)
+    assert as_object.to_dict() == as_dict
+    assert dict(as_object) == as_dict
+    assert list(as_object) == list(as_dict)
+    assert json.loads(as_object.to_json()) == json.loads(json.dumps(as_dict))
+
+
+def test_batch_and_async_scans_return_objects(fake_llm):
+    watchdog = _watchdog(fake_llm, "object")
+    results = watchdog.scan_many(["One.", "Forbidden two."], CONFIG)
+    single = asyncio.run(watchdog.ascan("Three.", CONFIG))
+
+    assert all(isinstance(result, ScanResult) for result in results + [single])
+    assert [result.overall_result for result in results] == [True, False]
+
+
+def test_scanner_results_are_dumped_lazily(fake_llm):
+    result = _watchdog(fake_llm, "object").scan("This is forbidden.", CONFIG)
+
+    model = result.scanner_result("ban_substrings")
+    assert model.result is False
+    assert result._dumped == {}
+    assert result["ban_substrings"] == model.model_dump()
+    assert result["ban_substrings"] is result["ban_substrings"]
+    assert result.failed_scanners == ["ban_substrings"]
+
+
+def test_to_json_serializes_models_and_plain_data():
+    from ai_watchdog.scanners.ban_substrings import run_logic_based_scan
+
+    result = ScanResult(
+        {"ban_substrings": run_logic_based_scan("forbidden", ["forbidden"]), "cached": {"result": True}},
+        extra={"cache": {"hits": 1, "misses": 0}},
+    )
+    assert json.loads(result.to_json()) == json.loads(json.dumps(result.to_dict()))
+    assert result.overall_result is False
+
+
+def test_unknown_result_format_is_rejected():
+    with pytest.raises(ValueError):
+        InputWatchdog(result_format="xml")
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("vaderSentiment")
+
+from ai_watchdog.scanners import sentiment_scanner
+from ai_watchdog.scanners.sentiment_scanner import run_logic_based_batch_scan, run_logic_based_scan
+
+TEXTS = ["I love this, it is wonderful!", "This is terrible and I hate it.", "The meeting is at noon.", ""]
+
+
+def test_analyzer_is_shared():
+    assert sentiment_scanner.get_analyzer() is sentiment_scanner.get_analyzer()
+
+
+def test_verdicts_by_sentiment():
+    positive, negative, neutral, empty = (run_logic_based_scan(text) for text in TEXTS)
+
+    assert positive.result is True and "positive" in positive.details
+    assert negative.result is False and negative.compound < -0.05
+    assert neutral.result is True and "neutral" in neutral.details
+    assert empty.compound == 0.0
+
+
+def test_thresholds_are_configurable():
+    assert run_logic_based_scan(TEXTS[1], negative_threshold=-1.0).result is True
+
+
+def test_batch_scan_equals_single_scans():
+    assert run_logic_based_batch_scan(TEXTS) == [run_logic_based_scan(text) for text in TEXTS]
+
+
+def test_scan_many_uses_the_batch_scan(input_watchdog, monkeypatch):
+    calls = []
+    batch_scan = sentiment_scanner.run_logic_based_batch_scan
+
+    def counting_batch_scan(texts, **params):
+        calls.append(len(texts))
+        return batch_scan(texts, **params)
+
+    monkeypatch.setattr(sentiment_scanner, "run_logic_based_batch_scan", counting_batch_scan)
+    results = input_watchdog.scan_many(TEXTS, [{"name": "sentiment_scanner"}])
+
+    assert [result["overall_result"] for result in results] == [True, False, True, True]
+    assert calls == [len(TEXTS)]
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from ai_watchdog.exceptions import QueueFullError
+from ai_watchdog.server import MicroBatcher, create_app
+
+BAN_SUBSTRINGS = {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}}
+BAN_TOPICS = {"name": "ban_topics", "params": {"topic_list": ["violence", "politics"]}}
+
+
+async def _request(app, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    method = "POST" if payload is not None else "GET"
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"]), dict(sent[0]["headers"])
+
+
+def _scan(app, payload, scan_type="input"):
+    return asyncio.run(_request(app, f"/scan/{scan_type}", payload))
+
+
+def test_batcher_groups_concurrent_texts(input_watchdog):
+    plan = input_watchdog.compile([BAN_SUBSTRINGS, BAN_TOPICS])
+
+    async def scan():
+        batcher = MicroBatcher(input_watchdog, window=0.05, max_batch_size=8)
+        texts = ["Text 0", "Text 1", "Text 2 is forbidden", "Text 3"]
+        results = await asyncio.gather(*(batcher.submit(text, plan) for text in texts))
+        return batcher, results
+
+    batcher, results = asyncio.run(scan())
+    assert batcher.batches_dispatched == 1
+    assert batcher.texts_dispatched == 4
+    assert batcher.depth == 0
+    assert [result["overall_result"] for result in results] == [True, True, False, True]
+
+
+def test_batcher_sheds_texts_when_queue_is_full(input_watchdog):
+    plan = input_watchdog.compile([BAN_SUBSTRINGS])
+
+    async def overfill():
+        batcher = MicroBatcher(input_watchdog, window=60, max_batch_size=8, max_queue_depth=2)
+        queued = [asyncio.ensure_future(batcher.submit(f"Text {i}", plan)) for i in range(2)]
+        await asyncio.sleep(0)
+        assert batcher.saturated
+        with pytest.raises(QueueFullError) as excinfo:
+            await batcher.submit("One too many", plan)
+        await batcher.drain()
+        return batcher, excinfo.value, await asyncio.gather(*queued)
+
+    batcher, error, results = asyncio.run(overfill())
+    assert error.context == {"depth": 2, "limit": 2}
+    assert all(result["overall_result"] for result in results)
+    assert not batcher.saturated
+
+
+def test_full_queue_returns_429():
+    app = create_app(batch_window=60, max_queue_depth=1)
+    payload = {"text": "Hello", "scanners": [BAN_SUBSTRINGS]}
+
+    async def overfill():
+        first = asyncio.ensure_future(_request(app, "/scan/input", payload))
+        await asyncio.sleep(0.1)
+        rejected = await _request(app, "/scan/input", payload)
+        await app.shutdown()
+        return rejected, await first
+
+    (status, body, headers), (first_status, first_body, _) = asyncio.run(overfill())
+    assert status == 429
+    assert body["error"]["type"] == "QueueFullError"
+    assert b"retry-after" in headers
+    assert first_status == 200
+    assert first_body["overall_result"] is True
+
+
+def test_scan_returns_unified_result():
+    app = create_app(batch_window=0)
+    status, body, _ = _scan(app, {"text": "This is classified.", "scanners": [BAN_SUBSTRINGS]}, "output")
+
+    assert status == 200
+    assert body["overall_result"] is False
+    assert body["ban_substrings"]["banned_phrases_found"] == ["classified"]
+
+
+@pytest.mark.parametrize("scanners, error_type", [
+    ([{"name": "no_such_scanner"}], "ScannerImportError"),
+    ([{"name": "ban_substrings"}], "ScannerConfigError"),
+    ([{"name": "detect_invisible_text", "params": {"bogus": 1}}], "ScannerConfigError"),
+    ([{"name": "ban_substrings", "params": ["forbidden"]}], "ScannerConfigError"),
+])
+def test_config_errors_return_400(scanners, error_type):
+    status, body, _ = _scan(create_app(), {"text": "Hello", "scanners": scanners})
+
+    assert status == 400
+    assert body["error"]["type"] == error_type
+
+
+def test_malformed_request_returns_400():
+    status, body, _ = _scan(create_app(), {"scanners": [BAN_SUBSTRINGS]})
+    assert status == 400
+    assert body["error"]["type"] == "BadRequest"
@@ -0,0 +1,73 @@
+from ai_watchdog.scan_result import ScanResult
+
+BAN_SUBSTRINGS = {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden", "classified"]}}
+BAN_TOPICS = {"name": "ban_topics", "params": {"topic_list": ["violence", "politics"]}}
+# Redaction needs the whole text, so this configuration cannot stream
+REDACT_NUMBERS = {"name": "regex_scanner", "params": {"patterns": [r"\d+"], "redact": True}}
+
+
+def _stream(watchdog, config, chunks):
+    stream = watchdog.stream(config, overlap=16, scan_every=8, checkpoint_chars=None)
+    forwarded = [stream.feed(chunk) for chunk in chunks]
+    if not stream.blocked:
+        forwarded.append(stream.finish())
+    else:
+        stream.finish()
+    return stream, forwarded
+
+
+def test_clean_stream_is_forwarded_completely(output_watchdog):
+    chunks = ["The quarterly ", "report shows ", "steady growth ", "in every region."]
+    stream, forwarded = _stream(output_watchdog, [BAN_SUBSTRINGS, BAN_TOPICS], chunks)
+
+    assert "".join(forwarded) == "".join(chunks)
+    # Text is released while streaming, held back only by the overlap
+    assert any(forwarded[:-1])
+    assert not stream.blocked
+    assert stream.held_back_by == []
+    assert stream.result["overall_result"] is True
+    assert stream.result["stream"] == {"blocked": False, "violation": None}
+
+
+def test_banned_substring_blocks_stream(output_watchdog):
+    chunks = ["Here is some ", "harmless text. ", "This part is ", "classi", "fied and ", "must not leak."]
+    stream, forwarded = _stream(output_watchdog, [BAN_SUBSTRINGS], chunks)
+
+    assert stream.blocked
+    assert "classified" not in "".join(forwarded)
+    assert "must not leak" not in "".join(forwarded)
+    assert stream.violation["failed_scanners"] == ["ban_substrings"]
+    assert stream.result["overall_result"] is False
+    assert stream.result["failed_scanners"] == ["ban_substrings"]
+    assert stream.result["stream"]["blocked"] is True
+    assert isinstance(stream.result, dict)
+    assert stream.feed("more text") == ""
+
+
+def test_blocked_stream_result_honours_result_format(output_watchdog):
+    output_watchdog.result_format = "object"
+    stream, _ = _stream(output_watchdog, [BAN_SUBSTRINGS], ["Some forbidden ", "words follow here."])
+
+    assert stream.blocked
+    assert isinstance(stream.result, ScanResult)
+    assert stream.result["stream"]["blocked"] is True
+    assert stream.result.to_dict()["failed_scanners"] == ["ban_substrings"]
+
+
+def test_unstreamable_logic_scanner_holds_output_until_finish(output_watchdog):
+    chunks = ["Order ", "number ", "12345 ", "ships today, ", "more text to stream."]
+    stream, forwarded = _stream(output_watchdog, [BAN_SUBSTRINGS, REDACT_NUMBERS], chunks)
+
+    assert stream.held_back_by == ["regex_scanner"]
+    assert forwarded[:-1] == [""] * len(chunks)
+    assert forwarded[-1] == "".join(chunks)
+    assert stream.result["regex_scanner"]["sanitized_text"] == "Order number [REDACTED] ships today, more text to stream."
+
+
+def test_streamable_scanner_still_cuts_held_back_stream(output_watchdog):
+    chunks = ["Order 12345 ", "is forbidden ", "to share."]
+    stream, forwarded = _stream(output_watchdog, [BAN_SUBSTRINGS, REDACT_NUMBERS], chunks)
+
+    assert stream.blocked
+    assert "".join(forwarded) == ""
+    assert stream.result["failed_scanners"] == ["ban_substrings"]
@@ -0,0 +1,71 @@
+import pytest
+
+from ai_watchdog import core
+from ai_watchdog.core import InputWatchdog
+from ai_watchdog.text_view import TextView, extract_urls
+
+
+def test_values_match_direct_computation():
+    text = "Grüße, STRASSE!  Visit https://example.com/a). and http://x.org"
+    view = TextView(text)
+
+    assert view.is_ascii is False
+    assert view.utf8_length == len(text.encode("utf-8"))
+    assert view.lowered[0] == text.lower()
+    assert view.casefolded[0] == text.casefold()
+    assert view.word_count == len(text.split())
+    assert [text[start:end] for start, end in view.word_spans] == text.split()
+    assert view.urls == ["https://example.com/a", "http://x.org"]
+
+
+def test_casefold_positions_map_back_to_original_offsets():
+    folded, positions = TextView("aß b").casefolded
+    assert folded == "ass b"
+    assert positions == [0, 1, 1, 2, 3]
+
+
+def test_values_are_computed_once():
+    view = TextView("hello world")
+    assert view.lowered is view.lowered
+    assert view.word_spans is view.word_spans
+    assert "urls" not in view.__dict__
+
+
+def test_extract_urls_deduplicates_and_limits():
+    text = "a http://a.com, b http://b.com. again http://a.com c http://c.com"
+    assert extract_urls(text) == ["http://a.com", "http://b.com", "http://c.com"]
+    assert extract_urls(text, max_urls=2) == ["http://a.com", "http://b.com"]
+
+
+def test_one_view_is_shared_by_the_scanners_of_a_scan(monkeypatch):
+    created = []
+    original = core.TextView
+
+    def recording_view(text):
+        view = original(text)
+        created.append(view)
+        return view
+
+    monkeypatch.setattr(core, "TextView", recording_view)
+    config = [
+        {"name": "ban_substrings", "params": {"banned_substrings": ["forbidden"]}},
+        {"name": "detect_invisible_text"},
+        {"name": "reading_time"},
+    ]
+    result = InputWatchdog().scan("Nothing forbidden here, élan.", config)
+
+    assert result["ban_substrings"]["result"] is False
+    assert len(created) == 1
+    assert "lowered" in created[0].__dict__
+
+
+@pytest.mark.parametrize("text", ["plain text", "Ünïcödé STRASSE​ text"])
+def test_scanners_give_the_same_result_with_and_without_a_view(text):
+    from ai_watchdog.scanners import ban_substrings, detect_invisible_text, reading_time
+
+    assert ban_substrings.run_logic_based_scan(text, ["strasse"], text_view=TextView(text)) == \
+        ban_substrings.run_logic_based_scan(text, ["strasse"])
+    assert detect_invisible_text.run_logic_based_scan(text, text_view=TextView(text)) == \
+        detect_invisible_text.run_logic_based_scan(text)
+    assert reading_time.run_logic_based_scan(text, text_view=TextView(text)) == \
+        reading_time.run_logic_based_scan(text)
@@ -0,0 +1,88 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_watchdog.scanners import url_reachability_check as url_check
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith("/slow"):
+            time.sleep(1.0)
+        self.send_response(404 if self.path.startswith("/missing") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # Keep a proxy configured in the environment out of the way
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    url_check.clear_cache()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    httpd.base = f"http://127.0.0.1:{httpd.server_port}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    url_check.clear_cache()
+
+
+def test_reachable_url_passes(server):
+    result = url_check.run_logic_based_scan(f"See {server.base}/ok.")
+    assert result.result is True
+    assert server.requests == ["/ok"]
+
+
+def test_404_is_unreachable(server):
+    result = url_check.run_logic_based_scan(f"See {server.base}/ok and {server.base}/missing")
+    assert result.result is False
+    assert result.unreachable_urls == [f"{server.base}/missing"]
+
+
+def test_deadline_cuts_off_slow_probes(server):
+    started = time.monotonic()
+    result = url_check.run_logic_based_scan(f"{server.base}/ok {server.base}/slow", deadline=0.3)
+
+    assert time.monotonic() - started < 0.9
+    assert result.unreachable_urls == [f"{server.base}/slow"]
+
+
+def test_verdicts_are_served_from_cache(server):
+    text = f"{server.base}/ok {server.base}/missing"
+    first = url_check.run_logic_based_scan(text)
+    second = url_check.run_logic_based_scan(text)
+
+    assert second == first
+    assert sorted(server.requests) == ["/missing", "/ok"]
+
+    url_check.run_logic_based_scan(text, cache_ttl=None)
+    assert len(server.requests) == 4
+
+
+def test_urls_differing_only_in_fragment_are_probed_once(server):
+    result = url_check.run_logic_based_scan(f"{server.base}/missing {server.base}/missing#part")
+
+    assert server.requests == ["/missing"]
+    assert result.unreachable_urls == [f"{server.base}/missing", f"{server.base}/missing#part"]
+
+
+def test_least_recently_used_session_is_closed(server, monkeypatch):
+    monkeypatch.setattr(url_check, "MAX_SESSIONS", 1)
+    monkeypatch.setattr(url_check, "_sessions", url_check.OrderedDict())
+    port = server.server_port
+    url_check.run_logic_based_scan(f"http://127.0.0.1:{port}/a", cache_ttl=None)
+    first = url_check._sessions[f"http://127.0.0.1:{port}"]
+    url_check.run_logic_based_scan(f"http://localhost:{port}/b", cache_ttl=None)
+
+    assert list(url_check._sessions) == [f"http://localhost:{port}"]
+    assert not first.adapters["http://"].poolmanager.pools